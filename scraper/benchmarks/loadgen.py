@@ -0,0 +1,329 @@
+"""
+Closed-loop load generator for /extract-cv
+Each of N virtual users sends a request, waits for the response and sends
+the next one. N steps up (--steps 1,2,4,8,...) and for every step we record
+throughput, latency percentiles, error rate and the server process' RSS and
+CPU. The saturation point is the last step that still scaled: past it more
+concurrency only adds latency (or errors).
+
+In-process (default): starts the fixture site and the stub LLM, imports
+the app with offline settings and drives it through httpx.ASGITransport.
+Client, app and stub servers share one process (RSS/CPU include all
+three), so absolute numbers are pessimistic; use it to compare changes.
+
+    python benchmarks/loadgen.py --steps 1,2,4,8,16 --step-seconds 20
+
+Over HTTP: point it at a running app (configured with the environment
+printed by `python benchmarks/servers.py`) and pass --pid for RSS/CPU.
+
+    python benchmarks/loadgen.py --target http://127.0.0.1:8000 --pid 12345
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+import psutil
+
+from run_benchmarks import BROWSER_PAGES, LISTING_PAGES, RESULTS_DIR, SCRAPER_DIR, git_sha
+from servers import CORPUS_DIR, offline_environment, start_corpus_server, start_stub_openrouter
+from stats import summarize
+
+SAMPLE_INTERVAL = 0.5
+
+
+class ProcessSampler:
+    """
+    Peak RSS and CPU utilisation of a server process over a step
+
+    Children are included (recursively): markdown workers, uvicorn workers
+    and browsers do most of the work. RSS is summed per process, so pages
+    shared between forked workers are counted more than once.
+    """
+
+    def __init__(self, pid: Optional[int]) -> None:
+        self.process = psutil.Process(pid) if pid else None
+        self.peak_rss = 0
+        self.peak_processes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def _tree(self) -> List[psutil.Process]:
+        try:
+            return [self.process, *self.process.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return [self.process]
+
+    def _cpu_seconds(self) -> Dict[int, float]:
+        """CPU time per live process in the tree"""
+        seconds: Dict[int, float] = {}
+        for process in self._tree():
+            try:
+                times = process.cpu_times()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            seconds[process.pid] = times.user + times.system
+            if process is self.process:
+                # Children that already exited (and were waited for)
+                seconds[process.pid] += times.children_user + times.children_system
+        return seconds
+
+    def _rss(self) -> int:
+        total = 0
+        for process in self._tree():
+            try:
+                total += process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total
+
+    def _observe(self) -> None:
+        self.peak_rss = max(self.peak_rss, self._rss())
+        self.peak_processes = max(self.peak_processes, len(self._tree()))
+
+    async def _sample(self) -> None:
+        while True:
+            self._observe()
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    def start(self) -> None:
+        if self.process is None:
+            return
+        self.peak_rss = self.peak_processes = 0
+        self._cpu_start = self._cpu_seconds()
+        self._wall_start = time.perf_counter()
+        self._task = asyncio.create_task(self._sample())
+
+    async def stop(self) -> Dict[str, float]:
+        if self.process is None:
+            return {}
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._observe()
+        wall = time.perf_counter() - self._wall_start
+        # Processes started during the step count from zero; the time of
+        # children that exited moved to their parent's children_* times
+        cpu = sum(self._cpu_seconds().values()) - sum(self._cpu_start.values())
+        return {
+            "peak_rss_mb": round(self.peak_rss / 1024 / 1024, 1),
+            # 100% = one core busy for the whole step
+            "cpu_percent": round(cpu / wall * 100, 1),
+            "processes": self.peak_processes,
+        }
+
+
+async def run_step(
+    client: httpx.AsyncClient,
+    bodies: Iterator[Dict[str, Any]],
+    concurrency: int,
+    duration: float,
+    sampler: ProcessSampler
+) -> Dict[str, Any]:
+    """Keep `concurrency` requests in flight for `duration` seconds"""
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def user() -> None:
+        while time.perf_counter() < deadline:
+            body = next(bodies)
+            started = time.perf_counter()
+            try:
+                response = await client.post("/extract-cv", json=body)
+                if response.status_code != 200:
+                    errors[f"http_{response.status_code}"] += 1
+                elif not response.json().get("success"):
+                    errors["extraction_failed"] += 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] += 1
+
+    sampler.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    process = await sampler.stop()
+
+    total = len(latencies) + sum(errors.values())
+    summary = summarize(latencies)
+    summary.pop("count", None)
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+        "errors": dict(errors),
+        **summary,
+        **process,
+    }
+
+
+def find_saturation(steps: List[Dict[str, Any]], min_gain: float, max_error_rate: float, max_p95_ms: Optional[float]):
+    """
+    Last step that still scaled, and why the next one did not
+
+    A step stops scaling when its error rate or p95 crosses the limits, or
+    when its throughput grows by less than `min_gain` over the best step so far.
+    """
+    best = None
+    for step in steps:
+        if step["error_rate"] > max_error_rate:
+            return best, f"error rate {step['error_rate']:.1%} at concurrency {step['concurrency']}"
+        if max_p95_ms and step.get("p95_ms", 0) > max_p95_ms:
+            return best, f"p95 {step['p95_ms']:.0f}ms > {max_p95_ms:.0f}ms at concurrency {step['concurrency']}"
+        if best and step["throughput_rps"] < best["throughput_rps"] * (1 + min_gain):
+            return best, f"throughput gain < {min_gain:.0%} at concurrency {step['concurrency']}"
+        best = step
+    return best, "not reached (add higher --steps)"
+
+
+def format_step(step: Dict[str, Any]) -> str:
+    line = (
+        f"c={step['concurrency']:<4} {step['throughput_rps']:>7.2f} req/s  "
+        f"p50={step.get('p50_ms', 0):>8.0f}ms p95={step.get('p95_ms', 0):>8.0f}ms "
+        f"p99={step.get('p99_ms', 0):>8.0f}ms  errors={step['error_rate']:.1%}"
+    )
+    if "peak_rss_mb" in step:
+        line += f"  rss={step['peak_rss_mb']:.0f}MB cpu={step['cpu_percent']:.0f}% procs={step['processes']}"
+    return line
+
+
+async def run_load(args, base_url: str, corpus_url: str, pid: Optional[int]) -> List[Dict[str, Any]]:
+    pages = sorted(
+        name for name in os.listdir(CORPUS_DIR)
+        if name.endswith(".html") and name not in LISTING_PAGES
+        and (args.include_browser or name not in BROWSER_PAGES)
+    )
+    counter = itertools.count()
+
+    def bodies():
+        for name in itertools.cycle(pages):
+            url = f"{corpus_url}/{name}"
+            if args.unique_urls:
+                # Distinct URLs so request coalescing does not hide the real work
+                url += f"?r={next(counter)}"
+            yield {"url": url, "extractor": args.extractor, "use_llm": args.extractor != "heuristic"}
+
+    async with AsyncExitStack() as stack:
+        if base_url:
+            transport = None
+        else:
+            import main
+            await stack.enter_async_context(main.lifespan(main.app))
+            transport = httpx.ASGITransport(app=main.app)
+            base_url = "http://loadgen"
+        client = await stack.enter_async_context(httpx.AsyncClient(
+            base_url=base_url,
+            transport=transport,
+            timeout=args.timeout,
+            limits=httpx.Limits(max_connections=max(args.steps) + 10)
+        ))
+        sampler = ProcessSampler(pid)
+        request_bodies = bodies()
+
+        if args.warmup_seconds:
+            await run_step(client, request_bodies, args.steps[0], args.warmup_seconds, ProcessSampler(None))
+
+        steps = []
+        for concurrency in args.steps:
+            step = await run_step(client, request_bodies, concurrency, args.step_seconds, sampler)
+            steps.append(step)
+            print(format_step(step), flush=True)
+            if step["error_rate"] >= args.abort_error_rate:
+                print(f"🛑 Stopping: error rate {step['error_rate']:.0%}")
+                break
+        return steps
+
+
+def main_cli() -> int:
+    parser = argparse.ArgumentParser(description="Closed-loop load generator for /extract-cv")
+    parser.add_argument("--target", help="Base URL of a running app (default: in-process)")
+    parser.add_argument("--pid", type=int, help="Server PID for RSS/CPU when using --target")
+    parser.add_argument("--corpus-url", default="http://127.0.0.1:8765", help="Fixture site reachable from --target")
+    parser.add_argument("--steps", default="1,2,4,8,16,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--step-seconds", type=float, default=15)
+    parser.add_argument("--warmup-seconds", type=float, default=3)
+    parser.add_argument("--extractor", choices=["auto", "heuristic", "llm"], default="llm")
+    parser.add_argument("--unique-urls", action=argparse.BooleanOptionalAction, default=True,
+                        help="Append a counter to every URL (--no-unique-urls measures coalescing)")
+    parser.add_argument("--include-browser", action="store_true", help="Include JavaScript pages (needs Chromium)")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request timeout (seconds)")
+    parser.add_argument("--llm-first-token-ms", type=float, default=300)
+    parser.add_argument("--llm-generation-ms", type=float, default=700)
+    parser.add_argument("--min-gain", type=float, default=0.1, help="Throughput growth that still counts as scaling")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--max-p95-ms", type=float, help="Latency objective (optional)")
+    parser.add_argument("--abort-error-rate", type=float, default=0.5, help="Stop stepping at this error rate")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/loadgen-<timestamp>-<sha>.json)")
+    args = parser.parse_args()
+    args.steps = [int(step) for step in args.steps.split(",")]
+
+    servers = []
+    corpus_url, pid = args.corpus_url, args.pid
+    if not args.target:
+        corpus_server, corpus_url = start_corpus_server()
+        llm_server, llm_url = start_stub_openrouter(
+            first_token_ms=args.llm_first_token_ms, generation_ms=args.llm_generation_ms
+        )
+        servers = [corpus_server, llm_server]
+        os.environ.update(offline_environment(llm_url))
+        if SCRAPER_DIR not in sys.path:
+            sys.path.insert(0, SCRAPER_DIR)
+        import logging
+        import main  # noqa: F401 - configures logging, quieted below
+        logging.getLogger().setLevel(logging.WARNING)
+        pid = os.getpid()
+
+    mode = args.target or "in-process"
+    print(f"🚦 Load test against {mode}: steps {args.steps}, {args.step_seconds:.0f}s each")
+    try:
+        steps = asyncio.run(run_load(args, args.target, corpus_url, pid))
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    saturation, reason = find_saturation(steps, args.min_gain, args.max_error_rate, args.max_p95_ms)
+    if saturation:
+        print(
+            f"\n📈 Saturation: concurrency {saturation['concurrency']} "
+            f"(~{saturation['throughput_rps']:.2f} req/s, p95 {saturation.get('p95_ms', 0):.0f}ms); "
+            f"next step: {reason}"
+        )
+    else:
+        print(f"\n📉 No step scaled: {reason}")
+
+    sha = git_sha()
+    result = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_sha": sha,
+        "mode": mode,
+        "cpu_count": os.cpu_count(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "steps": steps,
+        "saturation": {
+            "concurrency": saturation["concurrency"] if saturation else None,
+            "throughput_rps": saturation["throughput_rps"] if saturation else None,
+            "reason": reason,
+        },
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"loadgen-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{sha}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"📊 Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
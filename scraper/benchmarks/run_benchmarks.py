@@ -0,0 +1,254 @@
+"""
+Offline benchmark suite
+Measures each pipeline stage against a local corpus (served over HTTP) and
+a stub OpenRouter with fixed latency, so numbers are repeatable and need
+neither network access nor an API key:
+
+- crawl_fast_path:   GET + quality check + markdown (browserless path)
+- links_fast_path:   GET + internal link extraction (listing discovery)
+- markdown:          HTML → filtered markdown only
+- heuristic:         rule-based extractor
+- compaction:        prompt markdown compaction
+- llm_call:          extract_with_llm end to end; llm_overhead subtracts
+                     the stub's simulated latency (our own client cost)
+- json_parse:        json.loads and the incremental stream parser
+- validation:        CVData.model_validate
+- pipeline_*:        run_pipeline at --concurrency, with pages/sec
+
+Results go to benchmarks/results/<timestamp>-<git sha>.json. With
+--compare, p50/p95 are checked against a previous result file and the
+exit status is 1 when any stage regressed past --threshold.
+
+    python benchmarks/run_benchmarks.py --iterations 30
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+from servers import CORPUS_DIR, offline_environment, start_corpus_server, start_stub_openrouter  # noqa: E402
+from stats import format_row, summarize  # noqa: E402
+
+# Pages that need JavaScript to render: only crawled with --include-browser
+BROWSER_PAGES = {"spa_shell.html"}
+# Listing pages: only used for link discovery
+LISTING_PAGES = {"job_listing.html"}
+
+
+def git_sha() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=SCRAPER_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def timed(fn: Callable[[], Any], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def timed_async(fn: Callable[[], Any], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def run_stages(args, corpus_url: str) -> Dict[str, Dict[str, Any]]:
+    # Imported here: main reads its configuration from the environment set up in __main__
+    import fast_path
+    import main
+    from compaction import compact_markdown
+    from content import html_to_markdown
+    from heuristic_extractor import extract_heuristic
+    from llm_stream import IncrementalJSONParser
+
+    pages = sorted(name for name in os.listdir(CORPUS_DIR) if name.endswith(".html"))
+    static_pages = [name for name in pages if name not in BROWSER_PAGES | LISTING_PAGES]
+    html = {name: open(os.path.join(CORPUS_DIR, name), encoding="utf-8").read() for name in pages}
+    markdown = {name: html_to_markdown(f"{corpus_url}/{name}", html[name]) for name in static_pages}
+    llm_json = {name: json.dumps(extract_heuristic(markdown[name]).data) for name in static_pages}
+    stub_seconds = (args.llm_first_token_ms + args.llm_generation_ms) / 1000
+
+    main.fetch_client = main.create_fetch_client()
+    main.llm_client = main.create_llm_client()
+    results: Dict[str, Dict[str, Any]] = {}
+    samples: Dict[str, List[float]] = {}
+
+    def add(stage: str, values: List[float]) -> None:
+        samples.setdefault(stage, []).extend(values)
+
+    try:
+        for name in sorted(LISTING_PAGES):
+            url = f"{corpus_url}/{name}"
+            add("links_fast_path", await timed_async(
+                lambda: fast_path.fetch_links(main.fetch_client, url, main.FAST_PATH_MAX_BYTES), args.iterations
+            ))
+
+        for name in static_pages:
+            url = f"{corpus_url}/{name}"
+            add("crawl_fast_path", await timed_async(
+                lambda: fast_path.fetch_markdown(main.fetch_client, url, main.FAST_PATH_MIN_WORDS, main.FAST_PATH_MAX_BYTES),
+                args.iterations
+            ))
+            add("markdown", timed(lambda: html_to_markdown(url, html[name]), args.iterations))
+            add("heuristic", timed(lambda: extract_heuristic(markdown[name]), args.iterations))
+            add("compaction", timed(lambda: compact_markdown(markdown[name], url), args.iterations))
+            add("json_parse", timed(lambda: json.loads(llm_json[name]), args.iterations))
+
+            def parse_incremental():
+                parser = IncrementalJSONParser()
+                text = llm_json[name]
+                for i in range(0, len(text), 24):
+                    parser.feed(text[i:i + 24])
+                return parser.result()
+            add("json_parse_stream", timed(parse_incremental, args.iterations))
+
+            data = json.loads(llm_json[name])
+            add("validation", timed(lambda: main.CVData.model_validate(data), args.iterations))
+
+            llm_samples = await timed_async(
+                lambda: main.extract_with_llm(markdown[name], url), args.llm_iterations
+            )
+            add("llm_call", llm_samples)
+            add("llm_overhead", [max(sample - stub_seconds, 0.0) for sample in llm_samples])
+
+        crawl_pages = static_pages + sorted(BROWSER_PAGES) if args.include_browser else static_pages
+        for stage, options in (
+            ("pipeline_heuristic", {"extractor": "heuristic"}),
+            ("pipeline_llm", {"extractor": "llm", "bypass_llm_cache": True}),
+        ):
+            requests = [
+                main.CVExtractionRequest(url=f"{corpus_url}/{name}", **options)
+                for _ in range(args.pipeline_rounds) for name in crawl_pages
+            ]
+            limit = asyncio.Semaphore(args.concurrency)
+
+            async def one(request):
+                async with limit:
+                    started = time.perf_counter()
+                    response = await main.run_pipeline(request)
+                    if not response.success:
+                        raise RuntimeError(f"{request.url}: {response.error}")
+                    return time.perf_counter() - started
+
+            started = time.perf_counter()
+            durations = await asyncio.gather(*(one(request) for request in requests))
+            results[stage] = summarize(durations, time.perf_counter() - started, len(requests))
+    finally:
+        await main.fetch_client.aclose()
+        await main.llm_client.aclose()
+        main.fetch_client = main.llm_client = None
+
+    return {**{stage: summarize(values) for stage, values in samples.items()}, **results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, floor_ms: float) -> List[str]:
+    """Stages whose p50/p95 grew by more than `threshold` (and `floor_ms`) over the baseline"""
+    regressions = []
+    for stage, summary in current["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            old, new = previous.get(key, 0), summary.get(key, 0)
+            if old and new > old * (1 + threshold) and new - old > floor_ms:
+                regressions.append(f"{stage} {key}: {old:.2f} → {new:.2f} ({(new / old - 1) * 100:+.0f}%)")
+    return regressions
+
+
+def main_cli() -> int:
+    parser = argparse.ArgumentParser(description="Offline per-stage benchmarks for the CV scraper")
+    parser.add_argument("--iterations", type=int, default=20, help="Repetitions per page for CPU-bound stages")
+    parser.add_argument("--llm-iterations", type=int, default=3, help="Stub LLM calls per page")
+    parser.add_argument("--pipeline-rounds", type=int, default=4, help="Times each page goes through run_pipeline")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent pipelines")
+    parser.add_argument("--llm-first-token-ms", type=float, default=300)
+    parser.add_argument("--llm-generation-ms", type=float, default=700)
+    parser.add_argument("--include-browser", action="store_true", help="Also crawl JavaScript pages (needs Chromium)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>-<sha>.json)")
+    parser.add_argument("--compare", help="Previous result file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative p50/p95 growth")
+    parser.add_argument("--floor-ms", type=float, default=1.0, help="Ignore regressions smaller than this")
+    args = parser.parse_args()
+
+    corpus_server, corpus_url = start_corpus_server()
+    llm_server, llm_url = start_stub_openrouter(
+        first_token_ms=args.llm_first_token_ms, generation_ms=args.llm_generation_ms
+    )
+
+    # Everything external points at the local servers; caches and waits stay out of the numbers
+    os.environ.update(offline_environment(llm_url))
+    if SCRAPER_DIR not in sys.path:
+        sys.path.insert(0, SCRAPER_DIR)
+    import logging
+    import main  # noqa: F401 - configures logging, quieted below
+    logging.getLogger().setLevel(logging.WARNING)
+
+    started = time.perf_counter()
+    try:
+        stages = asyncio.run(run_stages(args, corpus_url))
+    finally:
+        corpus_server.shutdown()
+        llm_server.shutdown()
+
+    sha = git_sha()
+    result = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_sha": sha,
+        "duration_seconds": round(time.perf_counter() - started, 2),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "stages": stages,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{sha}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    for stage, summary in stages.items():
+        print(format_row(stage, summary))
+    print(f"\n📊 Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.threshold, args.floor_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) vs {args.compare}:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\n✅ No regressions vs {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,194 @@
+"""
+Local servers for offline benchmarks
+- Corpus server: serves the saved pages in benchmarks/corpus over HTTP
+- Stub OpenRouter: OpenAI-compatible /chat/completions with configurable
+  latency (streaming and non-streaming). The JSON it returns is built by
+  the heuristic extractor from the markdown in the prompt, so downstream
+  parsing and validation see realistic CVData (or JobData for job prompts).
+
+Both run on background threads (stdlib http.server), outside the event
+loop being measured. Run this file directly to keep them up for manual
+testing or the load generator:
+
+    python benchmarks/servers.py --corpus-port 8765 --llm-port 8766 --llm-first-token-ms 300
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRAPER_DIR not in sys.path:
+    sys.path.insert(0, SCRAPER_DIR)
+
+from heuristic_extractor import extract_heuristic  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+# Prompt markers around the page markdown (see extract_with_llm in main.py)
+PROMPT_START = "MARKDOWN CONTENT:"
+PROMPT_END = "Return only valid JSON"
+JOB_PROMPT_MARKER = "Extract job posting information"
+
+
+class _QuietCorpusHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOpenRouterHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible chat completions with simulated model latency"""
+
+    protocol_version = "HTTP/1.1"
+    first_token_ms = 500.0
+    generation_ms = 1000.0
+    error_rate = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.error_rate and random.random() < self.error_rate:
+            self._send_json(500, {"error": {"message": "stub injected error"}})
+            return
+
+        content = json.dumps(self._completion(body))
+        time.sleep(self.first_token_ms / 1000)
+
+        if not body.get("stream"):
+            time.sleep(self.generation_ms / 1000)
+            self._send_json(200, {
+                "id": "stub",
+                "model": body.get("model"),
+                "choices": [{"message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        pieces = [content[i:i + 24] for i in range(0, len(content), 24)]
+        delay = self.generation_ms / 1000 / max(len(pieces), 1)
+        try:
+            for index, piece in enumerate(pieces):
+                event = {"choices": [{"delta": {"content": piece}, "finish_reason": None}]}
+                if index == len(pieces) - 1:
+                    event["choices"][0]["finish_reason"] = "stop"
+                self._write_chunk(f"data: {json.dumps(event)}\n\n")
+                time.sleep(delay)
+            self._write_chunk("data: [DONE]\n\n")
+            self._write_chunk("")
+        except (BrokenPipeError, ConnectionResetError):
+            # The streaming client hangs up once the JSON object is complete
+            self.close_connection = True
+
+    def _completion(self, body):
+        prompt = body.get("messages", [{}])[-1].get("content", "")
+        markdown = prompt.split(PROMPT_START, 1)[-1].split(PROMPT_END, 1)[0]
+        data = extract_heuristic(markdown).data
+        if JOB_PROMPT_MARKER in prompt:
+            # Job posting prompt: same heuristics mapped onto JobData fields
+            return {
+                "title": data.get("full_name"),
+                "description": data.get("summary"),
+                "requirements": data.get("experience_details", []),
+                "technologies": data.get("technical_skills", []),
+            }
+        return data
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def _serve(server: ThreadingHTTPServer) -> str:
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def start_corpus_server(port: int = 0, directory: str = CORPUS_DIR) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve the corpus; returns (server, base_url). Port 0 picks a free port."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), partial(_QuietCorpusHandler, directory=directory))
+    return server, _serve(server)
+
+
+def start_stub_openrouter(
+    port: int = 0,
+    first_token_ms: float = 500.0,
+    generation_ms: float = 1000.0,
+    error_rate: float = 0.0,
+) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub; returns (server, base_url for OPENROUTER_BASE_URL)"""
+    handler = type("ConfiguredStubHandler", (StubOpenRouterHandler,), {
+        "first_token_ms": first_token_ms,
+        "generation_ms": generation_ms,
+        "error_rate": error_rate,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    return server, _serve(server) + "/api/v1"
+
+
+def offline_environment(llm_url: str) -> Dict[str, str]:
+    """
+    Settings that point the app at the stub and keep results comparable:
+    no LLM cache, no recrawl shortcut, no politeness waits, throwaway CACHE_DIR. Must be applied
+    before main is imported (it reads the environment at import time).
+    """
+    return {
+        "OPENROUTER_BASE_URL": llm_url,
+        "OPENROUTER_API_KEY": "benchmark-stub",
+        "CACHE_DIR": tempfile.mkdtemp(prefix="resumate-bench-"),
+        "LLM_CACHE_ENABLED": "false",
+        "RECRAWL_STATE_ENABLED": "false",
+        "POLITENESS_ENABLED": "false",
+        "LLM_HTTP2": "false",
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the benchmark corpus server and stub OpenRouter")
+    parser.add_argument("--corpus-port", type=int, default=8765)
+    parser.add_argument("--llm-port", type=int, default=8766)
+    parser.add_argument("--llm-first-token-ms", type=float, default=500)
+    parser.add_argument("--llm-generation-ms", type=float, default=1000)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    _, corpus_url = start_corpus_server(args.corpus_port)
+    _, llm_url = start_stub_openrouter(
+        args.llm_port, args.llm_first_token_ms, args.llm_generation_ms, args.llm_error_rate
+    )
+    print(f"📚 Corpus:          {corpus_url}/ ({', '.join(sorted(os.listdir(CORPUS_DIR)))})")
+    print(f"🤖 Stub OpenRouter: OPENROUTER_BASE_URL={llm_url}")
+    print("   Start the app with:")
+    print("   " + " ".join(f"{key}={value}" for key, value in offline_environment(llm_url).items()) + " python run.py")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
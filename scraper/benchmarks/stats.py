@@ -0,0 +1,50 @@
+"""
+Latency summaries shared by the benchmark runner and the load generator
+"""
+
+import math
+from typing import Dict, Sequence
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(seconds: Sequence[float], wall_seconds: float = 0.0, items: int = 0) -> Dict[str, float]:
+    """
+    Milliseconds summary of per-iteration durations
+
+    With `wall_seconds` and `items` (pages processed in that wall time) the
+    summary also carries throughput as pages_per_sec.
+    """
+    values = sorted(seconds)
+    summary: Dict[str, float] = {"count": len(values)}
+    if values:
+        summary.update({
+            "mean_ms": round(sum(values) / len(values) * 1000, 3),
+            "min_ms": round(values[0] * 1000, 3),
+            **{f"p{pct}_ms": round(percentile(values, pct) * 1000, 3) for pct in PERCENTILES},
+            "max_ms": round(values[-1] * 1000, 3),
+        })
+    if wall_seconds > 0 and items:
+        summary["pages_per_sec"] = round(items / wall_seconds, 2)
+    return summary
+
+
+def format_row(name: str, summary: Dict[str, float]) -> str:
+    """One aligned console line per stage"""
+    line = (
+        f"{name:<22} n={summary.get('count', 0):<5} "
+        f"p50={summary.get('p50_ms', 0):>9.2f}ms "
+        f"p95={summary.get('p95_ms', 0):>9.2f}ms "
+        f"p99={summary.get('p99_ms', 0):>9.2f}ms"
+    )
+    if "pages_per_sec" in summary:
+        line += f"  {summary['pages_per_sec']:.2f} pages/s"
+    return line
@@ -0,0 +1,191 @@
+"""
+Browser Pool - long-lived warm crawlers shared across requests
+Launching Chromium costs seconds, so crawlers are started once in the
+FastAPI lifespan, leased to requests, and recycled after N pages or on crash.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, Any, Optional
+
+if TYPE_CHECKING:
+    # Imported on first launch (slow import, see content.py)
+    from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+logger = logging.getLogger(__name__)
+
+# Error fragments Playwright/Crawl4AI report when the browser process is gone
+BROWSER_CRASH_MARKERS = (
+    "target page, context or browser has been closed",
+    "browser has been closed",
+    "browser closed",
+    "connection closed",
+    "target closed",
+    "page crashed",
+)
+
+
+class BrowserCrashError(RuntimeError):
+    """Raised inside a lease when the leased browser is no longer usable"""
+
+
+def is_browser_crash(message: Optional[str]) -> bool:
+    """Check whether a crawl error message means the browser itself died"""
+    if not message:
+        return False
+    lowered = message.lower()
+    return any(marker in lowered for marker in BROWSER_CRASH_MARKERS)
+
+
+def _default_browser_config() -> BrowserConfig:
+    from crawl4ai import BrowserConfig
+
+    return BrowserConfig(headless=True, verbose=False)
+
+
+class _PooledCrawler:
+    """One pool slot: a crawler plus how many pages it has served"""
+
+    def __init__(self, slot_id: int):
+        self.slot_id = slot_id
+        self.crawler: Optional[AsyncWebCrawler] = None
+        self.pages_served = 0
+
+
+class BrowserPool:
+    """
+    Fixed-size pool of warm AsyncWebCrawler instances.
+
+    Each lease gives exclusive use of one crawler. Crawlers are recycled
+    (closed and relaunched in the background) after `max_pages` pages or
+    when the lease body raises, so a crashed or bloated Chromium never
+    serves another request.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages: int = 50,
+        lease_timeout: float = 60.0,
+        browser_config_factory: Optional[Callable[[], BrowserConfig]] = None,
+        crawler_setup: Optional[Callable[[AsyncWebCrawler], None]] = None,
+    ):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.lease_timeout = lease_timeout
+        self._browser_config_factory = browser_config_factory or _default_browser_config
+        # Called on every new crawler before it starts (e.g. to install hooks)
+        self._crawler_setup = crawler_setup
+        self._slots = [_PooledCrawler(i) for i in range(self.size)]
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._background: set[asyncio.Task] = set()
+        self._closed = False
+        self._recycled = 0
+        self._crashes = 0
+
+    async def start(self) -> None:
+        """Launch all crawlers concurrently; failed launches retry on first lease"""
+        await asyncio.gather(*(self._launch(slot) for slot in self._slots))
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+        warm = sum(1 for slot in self._slots if slot.crawler is not None)
+        logger.info(f"🧭 Browser pool ready: {warm}/{self.size} warm crawlers")
+
+    async def close(self) -> None:
+        """Close every crawler; pending recycles are awaited first"""
+        self._closed = True
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        await asyncio.gather(
+            *(self._shutdown(slot) for slot in self._slots),
+            return_exceptions=True,
+        )
+        logger.info("🧭 Browser pool closed")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[AsyncWebCrawler]:
+        """Borrow a warm crawler for the duration of one page crawl"""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+
+        try:
+            slot: _PooledCrawler = await asyncio.wait_for(
+                self._idle.get(), timeout=self.lease_timeout
+            )
+        except asyncio.TimeoutError:
+            raise RuntimeError(
+                f"No browser available after {self.lease_timeout:.0f}s (pool size {self.size})"
+            ) from None
+        healthy = True
+        try:
+            if slot.crawler is None:
+                await self._launch(slot, raise_on_error=True)
+            yield slot.crawler
+        except Exception:
+            healthy = False
+            self._crashes += 1
+            raise
+        finally:
+            slot.pages_served += 1
+            if not healthy or slot.pages_served >= self.max_pages:
+                self._schedule_recycle(slot)
+            else:
+                self._idle.put_nowait(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "warm": sum(1 for slot in self._slots if slot.crawler is not None),
+            "max_pages": self.max_pages,
+            "recycled": self._recycled,
+            "crashes": self._crashes,
+        }
+
+    # ------------------------------------------
+    # Internals
+    # ------------------------------------------
+
+    async def _launch(self, slot: _PooledCrawler, raise_on_error: bool = False) -> None:
+        from crawl4ai import AsyncWebCrawler
+
+        try:
+            crawler = AsyncWebCrawler(config=self._browser_config_factory())
+            if self._crawler_setup is not None:
+                self._crawler_setup(crawler)
+            await crawler.start()
+            slot.crawler = crawler
+            slot.pages_served = 0
+        except Exception as e:
+            slot.crawler = None
+            logger.error(f"Browser launch failed (slot {slot.slot_id}): {e}")
+            if raise_on_error:
+                raise
+
+    async def _shutdown(self, slot: _PooledCrawler) -> None:
+        crawler, slot.crawler = slot.crawler, None
+        if crawler is None:
+            return
+        try:
+            await crawler.close()
+        except Exception as e:
+            logger.warning(f"Browser close failed (slot {slot.slot_id}): {e}")
+
+    def _schedule_recycle(self, slot: _PooledCrawler) -> None:
+        task = asyncio.create_task(self._recycle(slot))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _recycle(self, slot: _PooledCrawler) -> None:
+        """Close a used-up crawler and relaunch it before returning the slot"""
+        self._recycled += 1
+        logger.info(
+            f"♻️ Recycling browser slot {slot.slot_id} after {slot.pages_served} pages"
+        )
+        await self._shutdown(slot)
+        if not self._closed:
+            await self._launch(slot)
+        self._idle.put_nowait(slot)
@@ -0,0 +1,227 @@
+"""
+Chunking - section-aware packing of markdown into token-budgeted prompts
+Instead of sending markdown[:N], sections are ranked (CV sections first,
+link-heavy navigation junk last), packed into one or more prompts in
+document order, extracted concurrently and merged back into one CVData.
+Incremental extraction uses stable per-section units instead, so unchanged
+sections can keep the fields they produced last time.
+"""
+
+import math
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+from markdown_sections import Section, classify_section, split_sections
+
+# Rough token estimate used for budgeting (≈4 chars per token for English/Spanish)
+CHARS_PER_TOKEN = 4
+
+MD_LINK_RE = re.compile(r"!?\[[^\]]*\]\([^)]*\)")
+
+SECTION_KIND_SCORES = {
+    "experience": 1.0,
+    "education": 0.9,
+    "skills": 0.9,
+    "summary": 0.8,
+    "contact": 0.6,
+}
+
+# Sections scoring below this are dropped when the content does not fit
+MIN_SECTION_SCORE = 0.15
+
+SCALAR_FIELDS = ("full_name", "summary", "contact_info")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def score_section(section: Section, index: int) -> float:
+    """0-1 relevance of a section for CV extraction"""
+    kind = classify_section(section)
+    if kind:
+        return SECTION_KIND_SCORES[kind]
+
+    text = section.text
+    if not text.strip():
+        return 0.0
+    # Link lists (navigation, footers, badges) carry almost no CV content
+    link_chars = sum(len(m) for m in MD_LINK_RE.findall(text))
+    link_ratio = link_chars / max(len(text), 1)
+    score = 0.5 * (1 - link_ratio)
+    if index == 0:
+        # Text before/at the first heading usually holds the name and headline
+        score += 0.3
+    if section.words < 5:
+        score *= 0.5
+    return round(min(score, 1.0), 3)
+
+
+def _split_oversized(section: Section, budget_tokens: int) -> List[Section]:
+    """Break a section larger than the budget at paragraph boundaries"""
+    if estimate_tokens(section.text) <= budget_tokens:
+        return [section]
+
+    parts: List[Section] = []
+    current: List[str] = []
+    budget_chars = budget_tokens * CHARS_PER_TOKEN - len(section.title) - 16
+    for paragraph in re.split(r"\n\s*\n", section.body):
+        while len(paragraph) > budget_chars:
+            # A single huge paragraph: hard split on a line boundary if possible
+            cut = paragraph.rfind("\n", 0, budget_chars)
+            cut = cut if cut > budget_chars // 2 else budget_chars
+            parts.append(Section(section.title, section.level, paragraph[:cut]))
+            paragraph = paragraph[cut:].lstrip("\n")
+        if current and len("\n\n".join(current + [paragraph])) > budget_chars:
+            parts.append(Section(section.title, section.level, "\n\n".join(current)))
+            current = []
+        current.append(paragraph)
+    if current:
+        parts.append(Section(section.title, section.level, "\n\n".join(current)))
+    return parts
+
+
+def pack_chunks(markdown: str, budget_tokens: int, max_chunks: int) -> List[str]:
+    """
+    Rank sections, keep the best ones that fit `max_chunks` prompts of
+    `budget_tokens` each, and pack them in document order.
+
+    A section is only kept if the document-order packing of everything
+    kept so far still fits `max_chunks` (packing in document order wastes
+    room at chunk boundaries, so the token total alone is not enough).
+    """
+    sections = split_sections(markdown)
+    pieces = []
+    for index, section in enumerate(sections):
+        score = score_section(section, index)
+        for part in _split_oversized(section, budget_tokens):
+            pieces.append((index, score, part))
+
+    capacity = budget_tokens * max_chunks
+    selected: List[Tuple[int, int, str]] = []
+    used = 0
+    for order, (index, score, part) in sorted(enumerate(pieces), key=lambda p: (-p[1][1], p[0])):
+        cost = estimate_tokens(part.text)
+        if used + cost > capacity or (score < MIN_SECTION_SCORE and selected):
+            continue
+        candidate = sorted(selected + [(order, cost, part.text)])
+        if len(_pack_in_order(candidate, budget_tokens)) > max_chunks:
+            continue
+        selected = candidate
+        used += cost
+    return _pack_in_order(selected, budget_tokens)
+
+
+def _pack_in_order(parts: List[Tuple[int, int, str]], budget_tokens: int) -> List[str]:
+    """Greedily pack (order, tokens, text) parts, already in document order"""
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for _, cost, text in parts:
+        if current and current_tokens + cost > budget_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += cost
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _top_level(sections: List[Section]) -> int:
+    """Shallowest heading level that repeats (a lone h1 is the page title)"""
+    levels = [section.level for section in sections if section.title]
+    for level in sorted(set(levels)):
+        if levels.count(level) > 1:
+            return level
+    return min(levels) if levels else 0
+
+
+def section_units(markdown: str, budget_tokens: int, max_tokens: int) -> List[str]:
+    """
+    Incremental extraction units in document order: one per top-level
+    section, subsections included (a new job entry only changes the
+    Experience unit). Unlike pack_chunks, boundaries never depend on
+    neighbouring sections, so an unchanged section always yields the same
+    unit. Low-scoring sections are dropped and units beyond `max_tokens`
+    (lowest ranked first) are left out; oversized units are split at
+    paragraphs.
+    """
+    sections = split_sections(markdown)
+    top = _top_level(sections)
+    groups: List[List[Section]] = []
+    for section in sections:
+        if not groups or not section.title or section.level <= top:
+            groups.append([section])
+        else:
+            groups[-1].append(section)
+
+    pieces = []
+    for index, group in enumerate(groups):
+        head = group[0]
+        score = score_section(head, index)
+        if not classify_section(head):
+            # Untitled or generic heading: let the subsections speak for the group
+            score = max([score] + [score_section(section, index) for section in group[1:]])
+        body = "\n\n".join([head.body] + [section.text for section in group[1:]]).strip("\n")
+        for part in _split_oversized(Section(head.title, head.level, body), budget_tokens):
+            pieces.append((index, score, part.text))
+
+    selected = []
+    used = 0
+    for index, score, text in sorted(pieces, key=lambda p: (-p[1], p[0])):
+        cost = estimate_tokens(text)
+        if used + cost > max_tokens or (score < MIN_SECTION_SCORE and selected):
+            continue
+        selected.append((index, text))
+        used += cost
+    return [text for _, text in sorted(selected, key=lambda p: p[0])]
+
+
+def pack_units(units: List[str], budget_tokens: int) -> List[List[int]]:
+    """
+    Group consecutive units into prompts of up to `budget_tokens` (as
+    pack_chunks does with sections); returns the unit indexes of each group
+    """
+    packs: List[List[int]] = []
+    used = 0
+    for index, unit in enumerate(units):
+        cost = estimate_tokens(unit)
+        if not packs or used + cost > budget_tokens:
+            packs.append([])
+            used = 0
+        packs[-1].append(index)
+        used += cost
+    return packs
+
+
+def _unique(values: Iterable[str]) -> List[str]:
+    seen, result = set(), []
+    for value in values:
+        key = " ".join(str(value).lower().split())
+        if key and key not in seen:
+            seen.add(key)
+            result.append(value)
+    return result
+
+
+def merge_cv_data(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-chunk CVData dicts (in document order)
+
+    Scalars keep the first non-empty value (summary keeps the longest);
+    lists are concatenated and deduplicated case-insensitively.
+    """
+    merged: Dict[str, Any] = {}
+    for partial in partials:
+        for name, value in partial.items():
+            if isinstance(value, list):
+                merged[name] = _unique(merged.get(name, []) + value)
+            elif name == "summary" and value:
+                if len(str(value)) > len(str(merged.get(name) or "")):
+                    merged[name] = value
+            elif value and not merged.get(name):
+                merged[name] = value
+            else:
+                merged.setdefault(name, value)
+    return merged
@@ -0,0 +1,147 @@
+"""
+Compaction - token-aware cleanup of the markdown sent to the LLM
+The crawl markdown returned to clients is left untouched; only the prompt
+copy is compacted. Each rule drops characters that carry no CV content:
+- images and badges
+- link targets (internal links keep their text, external ones a short URL)
+- exact and near-duplicate lines (navigation repeated in header and footer,
+  a heading repeated right below itself), compared case/punctuation/markup-
+  insensitively; section headings repeated further down (the same
+  "Responsibilities" under two jobs) are kept
+- whitespace runs, list indentation and table padding
+Fenced code blocks are kept verbatim.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from chunking import estimate_tokens
+
+# Badges first: [![build](badge.svg)](ci-link)
+LINKED_IMAGE_RE = re.compile(r"\[\s*!\[[^\]]*\]\([^)]*\)\s*\]\([^)]*\)")
+IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+LINK_RE = re.compile(r"\[([^\]]*)\]\(\s*<?([^)\s>]*)>?(?:\s+\"[^\"]*\")?\s*\)")
+BARE_URL_RE = re.compile(r"(?<![(<\w])https?://[^\s)>\]]+")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+HEADING_RE = re.compile(r"^#{1,6}\s")
+LIST_ITEM_RE = re.compile(r"^(\s*)([*+-]|\d+\.)\s+")
+TABLE_SEPARATOR_RE = re.compile(r"^:?-+:?$")
+SPACE_RUN_RE = re.compile(r"[ \t]{2,}")
+NON_WORD_RE = re.compile(r"[\W_]+")
+
+# Shortened URLs keep host + path up to this many characters
+MAX_URL_CHARS = 60
+# Shorter non-heading lines (dates, single skills) may legitimately repeat
+MIN_DUPLICATE_CHARS = 20
+
+
+def shorten_url(url: str) -> str:
+    """Host + path without scheme, www., query string or fragment"""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    short = host + parts.path.rstrip("/")
+    if len(short) > MAX_URL_CHARS:
+        short = short[:MAX_URL_CHARS - 1] + "…"
+    return short
+
+
+def _rewrite_links(line: str, page_host: str) -> Tuple[str, int]:
+    """Rewrite markdown links and bare URLs; returns (line, links rewritten)"""
+    def replace_link(match: re.Match) -> str:
+        text, target = match.group(1).strip(), match.group(2)
+        if target.startswith("mailto:"):
+            address = target[len("mailto:"):].split("?")[0]
+            return text if address in text else f"{text} ({address})".strip()
+        parts = urlsplit(target)
+        if parts.scheme not in ("http", "https") or parts.netloc.lower() == page_host:
+            # Anchors, relative and same-site links: navigation, the text is enough
+            return text
+        short = shorten_url(target)
+        if not text or NON_WORD_RE.sub("", text.lower()) in NON_WORD_RE.sub("", target.lower()):
+            return short
+        return f"{text} ({short})"
+
+    line, links = LINK_RE.subn(replace_link, line)
+    line, bare = BARE_URL_RE.subn(lambda match: shorten_url(match.group(0)), line)
+    return line, links + bare
+
+
+def _compact_table_row(line: str) -> str:
+    cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+    cells = ["---" if TABLE_SEPARATOR_RE.match(cell) else cell for cell in cells]
+    return "| " + " | ".join(cells) + " |"
+
+
+def compact_markdown(markdown: str, page_url: Optional[str] = None) -> Tuple[str, Dict[str, int]]:
+    """
+    Compact markdown for the LLM prompt
+
+    Returns:
+        (compacted_markdown, stats) - stats has tokens/chars before and
+        after plus how many images, links and duplicate lines were rewritten
+    """
+    page_host = urlsplit(page_url).netloc.lower() if page_url else ""
+    counts = {"images": 0, "links": 0, "duplicate_lines": 0}
+    seen = set()
+    previous_key = ""
+    lines: List[str] = []
+    in_fence = False
+
+    list_indents = [len(m.group(1)) for m in map(LIST_ITEM_RE.match, markdown.splitlines()) if m]
+    base_indent = min(list_indents) if list_indents else 0
+
+    for raw in markdown.splitlines():
+        if FENCE_RE.match(raw):
+            in_fence = not in_fence
+            lines.append(raw.rstrip())
+            continue
+        if in_fence:
+            lines.append(raw.rstrip())
+            continue
+
+        line, badges = LINKED_IMAGE_RE.subn("", raw)
+        line, images = IMAGE_RE.subn("", line)
+        counts["images"] += badges + images
+        line, links = _rewrite_links(line, page_host)
+        counts["links"] += links
+
+        indent = ""
+        if LIST_ITEM_RE.match(line):
+            leading = len(line) - len(line.lstrip())
+            indent = " " * max(leading - base_indent, 0)
+        line = indent + SPACE_RUN_RE.sub(" ", line.strip())
+        if line.startswith("|") and line.endswith("|"):
+            line = _compact_table_row(line)
+
+        key = NON_WORD_RE.sub(" ", line.lower()).strip()
+        if key and links < 2 and HEADING_RE.match(line.lstrip()):
+            # Headings only repeat legitimately in different sections: drop back-to-back copies
+            if key == previous_key:
+                counts["duplicate_lines"] += 1
+                continue
+        # Link lists (navigation) are deduplicated at any length
+        elif key and (links >= 2 or len(key) >= MIN_DUPLICATE_CHARS):
+            if key in seen:
+                counts["duplicate_lines"] += 1
+                continue
+            seen.add(key)
+        elif not key and not line.startswith("|"):
+            # Nothing left but punctuation (rules, emptied badge lists); table separators stay
+            line = ""
+
+        if key:
+            previous_key = key
+        if line or (lines and lines[-1]):
+            lines.append(line)
+
+    compacted = "\n".join(lines).strip()
+    return compacted, {
+        "tokens_before": estimate_tokens(markdown),
+        "tokens_after": estimate_tokens(compacted),
+        "chars_before": len(markdown),
+        "chars_after": len(compacted),
+        **counts,
+    }
@@ -0,0 +1,126 @@
+"""
+Content rules shared by every crawl path
+The browser path (Crawl4AI) and the browserless fast path must produce the
+same markdown, so the run configuration and HTML → markdown conversion live here.
+Crawl4AI is imported on first use: loading it (Playwright, aiohttp, bs4...)
+takes about a second, which the app pays in its background warm-up instead
+of at import time.
+Conversion is plain CPU-bound Python, so callers may run html_to_markdown in
+worker processes (see markdown_pool.py) and render browser pages with
+`generate_markdown=False`.
+"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from crawl4ai import CrawlerRunConfig
+
+EXCLUDED_TAGS = ["nav", "footer", "header", "aside"]
+PAGE_TIMEOUT_MS = 30000
+
+
+class _DeferredScraping:
+    """
+    Scraping strategy that leaves the rendered HTML untouched
+
+    Used when the markdown is generated later from `result.html` (outside
+    the event loop), so the crawler does not filter the page a second time.
+    """
+
+    logger = None
+
+    def scrap(self, url: str, html: str, **kwargs) -> Dict[str, Any]:
+        return {"cleaned_html": "", "media": {}, "links": {}, "metadata": {}}
+
+    async def ascrap(self, url: str, html: str, **kwargs) -> Dict[str, Any]:
+        return self.scrap(url, html, **kwargs)
+
+
+def build_run_config(bypass_cache: bool = False, generate_markdown: bool = True) -> "CrawlerRunConfig":
+    """
+    Crawl4AI run configuration: pruning filter, excluded tags, link rules
+
+    With `generate_markdown=False` the crawler only renders the page; the
+    caller converts `result.html` with html_to_markdown.
+    """
+    from crawl4ai import CrawlerRunConfig, CacheMode
+    from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+    from crawl4ai.content_filter_strategy import PruningContentFilter
+
+    if generate_markdown:
+        # Content filter for clean markdown
+        content_filter = PruningContentFilter(
+            threshold=0.48,
+            threshold_type="dynamic",
+            min_word_threshold=5
+        )
+        markdown_generator = DefaultMarkdownGenerator(
+            content_filter=content_filter
+        )
+        scraping = {}
+    else:
+        markdown_generator = DefaultMarkdownGenerator()
+        scraping = {"scraping_strategy": _DeferredScraping()}
+
+    return CrawlerRunConfig(
+        markdown_generator=markdown_generator,
+        **scraping,
+        cache_mode=CacheMode.BYPASS if bypass_cache else CacheMode.ENABLED,
+        word_count_threshold=10,
+        excluded_tags=EXCLUDED_TAGS,
+        exclude_external_links=True,
+        exclude_social_media_links=True,
+        process_iframes=False,
+        remove_overlay_elements=True,
+        page_timeout=PAGE_TIMEOUT_MS
+    )
+
+
+def build_links_config(bypass_cache: bool = False) -> "CrawlerRunConfig":
+    """
+    Run configuration for link discovery: no content filter and no excluded
+    tags (listing links often live in nav/aside), only the rendered anchors matter
+    """
+    from crawl4ai import CrawlerRunConfig, CacheMode
+
+    return CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS if bypass_cache else CacheMode.ENABLED,
+        exclude_social_media_links=True,
+        process_iframes=False,
+        remove_overlay_elements=True,
+        page_timeout=PAGE_TIMEOUT_MS
+    )
+
+
+def markdown_from_result(markdown: Any) -> str:
+    """Pick the markdown text out of a Crawl4AI markdown result"""
+    if hasattr(markdown, 'raw_markdown'):
+        return markdown.raw_markdown
+    elif hasattr(markdown, 'fit_markdown'):
+        return markdown.fit_markdown
+    return str(markdown or "")
+
+
+@lru_cache(maxsize=1)
+def _conversion_config() -> "CrawlerRunConfig":
+    # Building a CrawlerRunConfig costs ~20ms (it inspects its own signature
+    # on every attribute set); conversion never mutates it, so build it once
+    return build_run_config()
+
+
+def html_to_markdown(url: str, html: str) -> str:
+    """
+    Convert already-fetched HTML with the same scraping and markdown rules
+    Crawl4AI applies after a browser render (excluded tags, pruning filter).
+    """
+    run_config = _conversion_config()
+    params = run_config.__dict__.copy()
+    params.pop("url", None)
+
+    scraped = run_config.scraping_strategy.scrap(url, html, **params)
+    result = run_config.markdown_generator.generate_markdown(
+        input_html=scraped.cleaned_html,
+        base_url=url
+    )
+    return markdown_from_result(result)
@@ -0,0 +1,196 @@
+"""
+Fast Path - browserless crawling for static pages
+Most CV/portfolio pages are plain HTML. A single HTTP GET plus the shared
+markdown conversion takes milliseconds; the browser is only needed when the
+result looks like an unrendered JavaScript shell or too thin to be useful.
+Link discovery (listing pages) skips markdown entirely and only parses anchors.
+Refreshes send the stored validators, so unchanged pages cost a 304.
+"""
+
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import httpx
+
+from content import html_to_markdown
+from recrawl import conditional_headers, validators_from_headers
+from url_utils import internal_links
+
+logger = logging.getLogger(__name__)
+
+# Raw HTML fragments that mean "content is rendered client-side" or "bot wall"
+JS_SHELL_MARKERS = (
+    re.compile(r'<div[^>]+id=["\'](root|app|__next|__nuxt|svelte)["\'][^>]*>\s*</div>', re.I),
+    re.compile(r'enable javascript|javascript is (required|disabled)|requires javascript', re.I),
+    re.compile(r'cf-browser-verification|challenge-platform|just a moment\.\.\.', re.I),
+)
+
+HEADING_RE = re.compile(r'^#{1,6}\s+\S', re.M)
+LIST_ITEM_RE = re.compile(r'^\s*(?:[*+-]|\d+\.)\s+\S', re.M)
+
+
+def assess_markdown(html: str, markdown: str, min_words: int) -> Tuple[bool, str, Dict[str, Any]]:
+    """
+    Decide whether fast-path markdown is good enough to skip the browser
+
+    Returns:
+        (acceptable, reason, stats)
+    """
+    words = len(markdown.split())
+    headings = len(HEADING_RE.findall(markdown))
+    list_items = len(LIST_ITEM_RE.findall(markdown))
+    stats = {"words": words, "headings": headings, "list_items": list_items}
+
+    for marker in JS_SHELL_MARKERS:
+        # A shell marker only matters when the page has little real text
+        if marker.search(html) and words < min_words * 3:
+            return False, "js_shell", stats
+    if words < min_words:
+        return False, "too_few_words", stats
+    if headings == 0 and list_items < 3:
+        return False, "no_structure", stats
+    return True, "ok", stats
+
+
+class _HrefCollector(HTMLParser):
+    """Collects <a href> values (and the <base href>, if any)"""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.hrefs: List[str] = []
+        self.base: Optional[str] = None
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag == "a" or (tag == "base" and self.base is None):
+            href = dict(attrs).get("href")
+            if href:
+                if tag == "a":
+                    self.hrefs.append(href)
+                else:
+                    self.base = href
+
+
+def extract_hrefs(html: str) -> Tuple[List[str], Optional[str]]:
+    """All <a href> values in document order, plus the <base href>"""
+    collector = _HrefCollector()
+    collector.feed(html)
+    collector.close()
+    return collector.hrefs, collector.base
+
+
+def _decode(body: bytes, charset: Optional[str]) -> str:
+    """Body text as httpx's Response.text decodes it (declared charset, else UTF-8)"""
+    try:
+        return body.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        # Unknown charset name in the Content-Type header
+        return body.decode("utf-8", errors="replace")
+
+
+async def fetch_html(
+    client: httpx.AsyncClient,
+    url: str,
+    max_bytes: int = 5 * 1024 * 1024,
+    validators: Optional[Dict[str, str]] = None
+) -> Tuple[Optional[str], str, Dict[str, Any]]:
+    """
+    Plain GET of an HTML page (conditional when `validators` are given)
+
+    The body is streamed: a Content-Length above `max_bytes` is rejected
+    before reading, and the download stops as soon as the limit is crossed.
+
+    Returns:
+        (html or None, reason, stats) - stats["url"] is the final URL after
+        redirects, stats["validators"] the page's ETag / Last-Modified;
+        reason is "not_modified" when the site answered 304
+    """
+    try:
+        async with client.stream("GET", url, headers=conditional_headers(validators)) as response:
+            stats: Dict[str, Any] = {"status_code": response.status_code}
+            if response.status_code == 304 and validators:
+                return None, "not_modified", stats
+            if response.status_code != 200:
+                if response.headers.get("retry-after"):
+                    stats["retry_after"] = response.headers["retry-after"]
+                return None, f"http_{response.status_code}", stats
+            content_type = response.headers.get("content-type", "")
+            if "html" not in content_type.lower():
+                return None, "not_html", stats
+            declared = response.headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > max_bytes:
+                stats["bytes"] = int(declared)
+                return None, "too_large", stats
+
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) > max_bytes:
+                    stats["bytes"] = len(body)
+                    return None, "too_large", stats
+    except httpx.HTTPError as e:
+        return None, f"fetch_error: {type(e).__name__}", {}
+
+    stats["bytes"] = len(body)
+    stats["url"] = str(response.url)
+    stats["validators"] = validators_from_headers(response.headers)
+    return _decode(bytes(body), response.charset_encoding), "ok", stats
+
+
+async def fetch_markdown(
+    client: httpx.AsyncClient,
+    url: str,
+    min_words: int = 80,
+    max_bytes: int = 5 * 1024 * 1024,
+    validators: Optional[Dict[str, str]] = None,
+    convert: Optional[Callable[[str, str], Awaitable[str]]] = None
+) -> Tuple[Optional[str], str, Dict[str, Any]]:
+    """
+    Plain GET + markdown conversion
+
+    `convert(url, html)` replaces the inline html_to_markdown call (e.g. to
+    run the conversion in a worker process).
+
+    Returns:
+        (markdown or None if the browser is needed or the page is not
+        modified, reason, stats)
+    """
+    html, reason, stats = await fetch_html(client, url, max_bytes, validators)
+    if html is None:
+        return None, reason, stats
+
+    page_url = stats.pop("url")
+    markdown = await convert(page_url, html) if convert else html_to_markdown(page_url, html)
+    acceptable, reason, quality = assess_markdown(html, markdown, min_words)
+    stats.update(quality)
+    if not acceptable:
+        return None, reason, stats
+    return markdown, reason, stats
+
+
+async def fetch_links(
+    client: httpx.AsyncClient,
+    url: str,
+    max_bytes: int = 5 * 1024 * 1024
+) -> Tuple[Optional[List[str]], str, Dict[str, Any]]:
+    """
+    Plain GET + internal link extraction (no markdown, no content filter)
+
+    Returns:
+        (internal links or None if the browser is needed, reason, stats)
+    """
+    html, reason, stats = await fetch_html(client, url, max_bytes)
+    if html is None:
+        return None, reason, stats
+
+    page_url = stats.pop("url")
+    hrefs, base = extract_hrefs(html)
+    links = internal_links(hrefs, urljoin(page_url, base) if base else page_url)
+    stats.update({"hrefs": len(hrefs), "internal_links": len(links)})
+    if not links:
+        # Listings rendered client-side (or behind a bot wall) have no anchors yet
+        shell = any(marker.search(html) for marker in JS_SHELL_MARKERS)
+        return None, "js_shell" if shell else "no_links", stats
+    return links, "ok", stats
@@ -0,0 +1,316 @@
+"""
+Heuristic Extractor - deterministic CVData extraction without an LLM
+Reads section headings, bullet lists, contact regexes and a skills
+dictionary. Every field gets a confidence score so the caller can decide
+whether the result is good enough or the LLM is still needed.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from markdown_sections import Section, classify_section, split_sections
+
+# ==========================================
+# Vocabulary
+# ==========================================
+
+# Canonical spelling -> category; keys are matched case-insensitively on word boundaries
+SKILLS_DICTIONARY = {
+    "languages": [
+        "Python", "JavaScript", "TypeScript", "Java", "Go", "Golang", "Rust", "C", "C++", "C#",
+        "Ruby", "PHP", "Kotlin", "Swift", "Scala", "R", "SQL", "Bash", "Dart", "Elixir",
+        "Haskell", "Lua", "Perl", "Objective-C", "HTML", "CSS",
+    ],
+    "frameworks": [
+        "React", "Next.js", "Vue", "Nuxt", "Angular", "Svelte", "Node.js", "Express", "NestJS",
+        "Django", "Flask", "FastAPI", "Spring", "Spring Boot", "Rails", "Laravel", ".NET",
+        "ASP.NET", "Flutter", "React Native", "TensorFlow", "PyTorch", "Pandas", "NumPy",
+        "scikit-learn", "Tailwind", "Bootstrap", "jQuery", "GraphQL", "Redux", "Celery",
+    ],
+    "tools": [
+        "Docker", "Kubernetes", "Terraform", "Ansible", "AWS", "GCP", "Azure", "Git", "GitHub",
+        "GitLab", "Jenkins", "CircleCI", "Linux", "PostgreSQL", "MySQL", "MongoDB", "Redis",
+        "Kafka", "RabbitMQ", "Elasticsearch", "Nginx", "Jira", "Figma", "Webpack", "Vite",
+        "Grafana", "Prometheus", "Airflow", "Spark", "Snowflake", "BigQuery", "Firebase",
+        "Supabase", "Vercel", "Heroku", "Playwright", "Selenium", "Postman",
+    ],
+}
+
+DEGREE_RE = re.compile(
+    r"\b(B\.?Sc?|B\.?A|M\.?Sc?|M\.?A|MBA|Ph\.?D|Bachelor|Master|Doctor(?:ate)?|Associate|Diploma|"
+    r"Licenciatura|Licenciad[oa]|Ingenier[oa]|Ingeniería|Técnic[oa]|Tecnicatura|Maestría|Doctorado|"
+    r"Certificat(?:e|ion)|Certified)\b",
+    re.I,
+)
+INSTITUTION_RE = re.compile(
+    r"([A-ZÁÉÍÓÚ][\w.&'’-]*(?:\s+(?:of|de|del|la|for|and|y|[A-ZÁÉÍÓÚ][\w.&'’-]*))*\s+"
+    r"(?:University|College|Institute|School|Academy|Polytechnic)"
+    r"(?:\s+(?:of|de)\s+[A-ZÁÉÍÓÚ][\w.&'’-]*(?:\s+[A-ZÁÉÍÓÚ][\w.&'’-]*)*)?|"
+    r"(?:University|Universidad|Universitat|Instituto|Institute|College|Escuela|Facultad)"
+    r"\s+(?:of|de|del|la|for)?\s*[A-ZÁÉÍÓÚ][\w.&'’-]*(?:\s+(?:de|del|la|of|[A-ZÁÉÍÓÚ][\w.&'’-]*))*)"
+)
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"(?<![\w/])\+?\d[\d\s().-]{7,}\d(?![\w/])")
+PROFILE_URL_RE = re.compile(r"https?://(?:www\.)?(?:linkedin\.com|github\.com|gitlab\.com)/[\w./-]+", re.I)
+MD_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+BULLET_RE = re.compile(r"^\s*(?:[*+-]|\d+\.)\s+(.*\S)")
+DATE_RANGE_RE = re.compile(
+    r"\(?\b(?:(?:19|20)\d{2}|[A-Z][a-z]{2,8}\.?\s+(?:19|20)\d{2})\s*[-–—]+\s*"
+    r"(?:(?:19|20)\d{2}|[A-Z][a-z]{2,8}\.?\s+(?:19|20)\d{2}|present|current|now|actual(?:idad)?|presente)\b\)?,?",
+    re.I,
+)
+ROLE_AT_COMPANY_RE = re.compile(r"^(?P<title>[^,|@–—]{3,80}?)\s+(?:at|@|en)\s+(?P<company>[^,|(–—]{2,80})", re.I)
+ROLE_SEP_COMPANY_RE = re.compile(r"^(?P<title>[^,|–—]{3,80}?)\s*(?:\||–|—|,| - )\s*(?P<company>[^,|(–—]{2,80})")
+NAME_RE = re.compile(r"^[A-ZÁÉÍÓÚÑ][a-záéíóúñ'’-]+(?:\s+(?:de|del|la|van|von|da|[A-ZÁÉÍÓÚÑ][a-záéíóúñ'’.-]*)){1,4}$")
+# Titles and credentials around a name: "Dr. Ana Gil", "Carolina Rodríguez, Ph.D."
+NAME_PREFIX_RE = re.compile(r"^(?:(?:Dr|Dra|Prof|Mr|Mrs|Ms|Ing|Lic)\.?\s+)+")
+NAME_SUFFIX_RE = re.compile(
+    r"(?:,?\s+(?:Ph\.?\s?D|M\.?Sc|M\.?S|M\.?A|MBA|M\.?D|B\.?Sc|B\.?A|P\.?Eng|CPA|PMP|Jr|Sr|II|III|IV)\.?)+$"
+)
+# Words that make a capitalized heading a section or a job title, not a person
+NOT_NAME_WORDS = {
+    "awards", "blog", "careers", "courses", "curriculum", "grants", "hello", "home", "honors",
+    "interests", "jobs", "languages", "open", "portfolio", "positions", "projects", "publications",
+    "references", "research", "resume", "selected", "talks", "teaching", "volunteering", "welcome",
+    "analyst", "architect", "consultant", "designer", "developer", "director", "engineer", "intern",
+    "junior", "lead", "manager", "principal", "scientist", "senior", "specialist", "staff",
+    "desarrollador", "diseñador", "ingeniero", "proyectos",
+}
+
+# Field weights for the overall confidence score
+FIELD_WEIGHTS = {
+    "full_name": 1.0,
+    "summary": 0.5,
+    "contact_info": 0.5,
+    "job_titles": 1.0,
+    "companies": 1.0,
+    "experience_details": 0.5,
+    "technical_skills": 1.0,
+    "degrees": 0.5,
+    "institutions": 0.5,
+}
+
+
+@dataclass
+class HeuristicResult:
+    """Extracted CVData fields plus a 0-1 confidence per field"""
+    data: Dict[str, Any] = field(default_factory=dict)
+    confidence: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def overall(self) -> float:
+        total = sum(FIELD_WEIGHTS.values())
+        score = sum(self.confidence.get(name, 0.0) * weight for name, weight in FIELD_WEIGHTS.items())
+        return round(score / total, 3)
+
+
+# ==========================================
+# Helpers
+# ==========================================
+
+def _plain(text: str) -> str:
+    """Strip markdown links/images/emphasis down to their visible text"""
+    text = MD_LINK_RE.sub(lambda m: m.group(1), text)
+    return re.sub(r"[*_`]+", "", text).strip()
+
+
+def _bullets(text: str) -> List[str]:
+    return [_plain(m.group(1)) for m in map(BULLET_RE.match, text.splitlines()) if m]
+
+
+def _paragraphs(text: str) -> List[str]:
+    # Contact lines are not prose; drop them before grouping paragraphs
+    text = "\n".join(
+        "" if EMAIL_RE.search(line) or PROFILE_URL_RE.search(line) else line
+        for line in text.splitlines()
+    )
+    blocks = re.split(r"\n\s*\n", text)
+    return [
+        _plain(" ".join(line.strip() for line in block.splitlines()))
+        for block in blocks
+        if block.strip() and not BULLET_RE.match(block.strip().splitlines()[0])
+    ]
+
+
+def _unique(values: Iterable[str]) -> List[str]:
+    seen, result = set(), []
+    for value in values:
+        value = value.strip(" .,;:-–—|")
+        if value and value.lower() not in seen:
+            seen.add(value.lower())
+            result.append(value)
+    return result
+
+
+def _name_candidate(section: Section) -> Optional[str]:
+    """The person's name in a heading, without titles or credentials, else None"""
+    if classify_section(section):
+        return None
+    candidate = NAME_SUFFIX_RE.sub("", NAME_PREFIX_RE.sub("", _plain(section.title))).strip(" ,")
+    if not NAME_RE.match(candidate):
+        return None
+    if any(word.lower().strip(".") in NOT_NAME_WORDS for word in candidate.split()):
+        return None
+    return candidate
+
+
+def _count_confidence(count: int, solid: int) -> float:
+    """0 for nothing found, rising to 1.0 once `solid` items were found"""
+    return round(min(1.0, count / solid), 3) if count else 0.0
+
+
+def _skill_patterns():
+    for category, skills in SKILLS_DICTIONARY.items():
+        for skill in skills:
+            pattern = re.compile(r"(?<![\w.+#-])" + re.escape(skill) + r"(?![\w+#]|\.\w)", re.I)
+            yield category, skill, pattern
+
+
+SKILL_PATTERNS = list(_skill_patterns())
+
+# Single letters/very common words only count when case matches exactly
+CASE_SENSITIVE_SKILLS = {"C", "R", "Go", "Spring", "Express", "Swift", "Rust", "Git"}
+
+
+def _find_skills(text: str) -> Dict[str, List[str]]:
+    found: Dict[str, List[str]] = {category: [] for category in SKILLS_DICTIONARY}
+    for category, skill, pattern in SKILL_PATTERNS:
+        matches = pattern.findall(text)
+        if skill in CASE_SENSITIVE_SKILLS:
+            matches = [m for m in matches if m == skill]
+        if matches:
+            found[category].append(skill)
+    return found
+
+
+def _parse_role_line(line: str):
+    """'Staff Engineer at Acme, 2020 - Present' -> ('Staff Engineer', 'Acme')"""
+    line = DATE_RANGE_RE.sub("", _plain(line)).strip(" ,.-–—|")
+    for pattern in (ROLE_AT_COMPANY_RE, ROLE_SEP_COMPANY_RE):
+        match = pattern.match(line)
+        if match:
+            title = match.group("title").strip(" ,.-")
+            company = match.group("company").strip(" ,.-")
+            if len(title.split()) <= 8 and len(company.split()) <= 8:
+                return title, company
+    return None
+
+
+# ==========================================
+# Extraction
+# ==========================================
+
+def extract_heuristic(markdown: str) -> HeuristicResult:
+    """Fill CVData fields from markdown structure; never raises on odd input"""
+    sections = split_sections(markdown)
+    by_kind: Dict[str, List[Section]] = {}
+    for section in sections:
+        kind = classify_section(section)
+        if kind:
+            by_kind.setdefault(kind, []).append(section)
+
+    result = HeuristicResult()
+    data, confidence = result.data, result.confidence
+
+    # Name: only the page's first H1 (later headings are sections: "Invited Talks")
+    title = next((section for section in sections if section.level == 1), None)
+    full_name = _name_candidate(title) if title else None
+    if full_name:
+        confidence["full_name"] = 0.9
+    data["full_name"] = full_name
+
+    # Contact: emails, phones and profile links anywhere in the page
+    emails = _unique(EMAIL_RE.findall(markdown))
+    phones = _unique(p for p in PHONE_RE.findall(markdown) if sum(c.isdigit() for c in p) >= 8 and not DATE_RANGE_RE.search(p))
+    profiles = _unique(PROFILE_URL_RE.findall(markdown))
+    contact = emails + phones[:2] + profiles[:3]
+    data["contact_info"] = " | ".join(contact) if contact else None
+    confidence["contact_info"] = 1.0 if emails else (0.6 if contact else 0.0)
+
+    # Summary: explicit About/Summary section, else the first long intro paragraph
+    summary, summary_conf = None, 0.0
+    for section in by_kind.get("summary", []):
+        paragraphs = [p for p in _paragraphs(section.body) if len(p.split()) >= 8]
+        if paragraphs:
+            summary, summary_conf = paragraphs[0], 0.9
+            break
+    if summary is None:
+        for section in sections[:3]:
+            if classify_section(section):
+                continue
+            paragraphs = [p for p in _paragraphs(section.body) if len(p.split()) >= 15]
+            if paragraphs:
+                summary, summary_conf = paragraphs[0], 0.5
+                break
+    data["summary"] = summary
+    confidence["summary"] = summary_conf
+
+    # Experience: sub-headings and bullet lines shaped like "Role at Company"
+    job_titles: List[str] = []
+    companies: List[str] = []
+    details: List[str] = []
+    for section in by_kind.get("experience", []):
+        candidates = [section.title] if section.level >= 3 and classify_section(section) is None else []
+        candidates += [
+            line for line in section.body.splitlines()
+            if line.strip() and not BULLET_RE.match(line)
+        ]
+        bullets = _bullets(section.body)
+        for line in candidates + bullets:
+            role = _parse_role_line(line)
+            if role:
+                job_titles.append(role[0])
+                companies.append(role[1])
+        details.extend(b for b in bullets if len(b.split()) >= 4)
+    # Roles often sit under their own sub-headings right after "Experience"
+    for index, section in enumerate(sections):
+        if classify_section(section) == "experience":
+            for sub in sections[index + 1:]:
+                if sub.level <= section.level:
+                    break
+                role = _parse_role_line(sub.title)
+                if role:
+                    job_titles.append(role[0])
+                    companies.append(role[1])
+                details.extend(b for b in _bullets(sub.body) if len(b.split()) >= 4)
+    data["job_titles"] = _unique(job_titles)
+    data["companies"] = _unique(companies)
+    data["experience_details"] = _unique(details)
+    has_experience_section = "experience" in by_kind
+    confidence["job_titles"] = _count_confidence(len(data["job_titles"]), 2) * (1.0 if has_experience_section else 0.6)
+    confidence["companies"] = _count_confidence(len(data["companies"]), 2) * (1.0 if has_experience_section else 0.6)
+    confidence["experience_details"] = _count_confidence(len(data["experience_details"]), 3)
+
+    # Education: degree keywords and institution names
+    education_text = "\n".join(s.text for s in by_kind.get("education", []))
+    source = education_text or markdown
+    degrees, institutions = [], []
+    for line in source.splitlines():
+        plain = _plain(BULLET_RE.sub(r"\1", line))
+        if not plain:
+            continue
+        if DEGREE_RE.search(plain):
+            degree = re.split(r"\s*,\s*|\s+(?:at|@|en|-|–|—|\|)\s+", DATE_RANGE_RE.sub("", plain))[0]
+            degrees.append(degree[:120])
+        institutions.extend(m.strip() for m in INSTITUTION_RE.findall(plain))
+    data["degrees"] = _unique(degrees)
+    data["institutions"] = _unique(institutions)
+    edu_weight = 1.0 if education_text else 0.6
+    confidence["degrees"] = _count_confidence(len(data["degrees"]), 1) * edu_weight
+    confidence["institutions"] = _count_confidence(len(data["institutions"]), 1) * edu_weight
+
+    # Skills: dictionary match, trusted more inside a Skills section
+    skills_text = "\n".join(s.text for s in by_kind.get("skills", []))
+    found = _find_skills(skills_text or markdown)
+    for category in SKILLS_DICTIONARY:
+        data[category] = found[category]
+    data["technical_skills"] = _unique(s for c in SKILLS_DICTIONARY for s in found[c])
+    skills_weight = 1.0 if skills_text else 0.7
+    confidence["technical_skills"] = _count_confidence(len(data["technical_skills"]), 4) * skills_weight
+    for category in SKILLS_DICTIONARY:
+        confidence[category] = _count_confidence(len(found[category]), 2) * skills_weight
+
+    for name, value in confidence.items():
+        confidence[name] = round(value, 3)
+    return result
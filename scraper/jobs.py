@@ -0,0 +1,401 @@
+"""
+Jobs - in-process asynchronous job queue for long-running extractions
+Submitting returns a job id immediately; a fixed pool of worker tasks runs
+the pipeline and clients poll (or long-poll) for the result, so no HTTP
+connection is held open for the whole crawl + LLM run.
+
+With a `store_path` jobs are also written to SQLite, and queued or
+interrupted jobs are picked up again after a restart. Several worker
+processes can share the store: each runs the jobs submitted to it, any of
+them can answer a status lookup, and the jobs of a worker that stopped
+sending heartbeats are taken over by the others.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+class QueueFullError(RuntimeError):
+    """Raised when more than `max_queued` jobs are waiting"""
+
+
+@dataclass
+class Job:
+    id: str
+    request: Dict[str, Any]
+    status: str = "queued"
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+
+JOB_COLUMNS = "id, status, request, result, error, created_at, started_at, finished_at"
+
+
+def _job_from_row(row: tuple) -> Job:
+    job_id, status, request, result, error, created_at, started_at, finished_at = row
+    return Job(
+        id=job_id,
+        status=status,
+        request=json.loads(request),
+        result=json.loads(result) if result is not None else None,
+        error=error,
+        created_at=created_at,
+        started_at=started_at,
+        finished_at=finished_at,
+    )
+
+
+class JobQueue:
+    """
+    FIFO job queue served by `workers` asyncio tasks.
+
+    - `runner(job)` does the work for `job.request` and returns a JSON-serializable result;
+      exceptions mark the job failed
+    - Finished jobs are kept for `result_ttl` seconds, then dropped
+    - `wait()` blocks until a job finishes (long polling); jobs owned by
+      another process are read from the store
+    - With a store, this queue's owner id is refreshed every
+      `heartbeat_seconds`; unfinished jobs of owners silent for three
+      heartbeats (or shut down) are claimed and run here
+    """
+
+    POLL_SECONDS = 0.5
+
+    def __init__(
+        self,
+        runner: Callable[["Job"], Awaitable[Dict[str, Any]]],
+        workers: int = 4,
+        max_queued: int = 1000,
+        result_ttl: float = 3600,
+        store_path: Optional[str] = None,
+        heartbeat_seconds: float = 10,
+    ):
+        self.runner = runner
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self.store_path = store_path
+        self.heartbeat_seconds = heartbeat_seconds
+        self.owner = uuid.uuid4().hex
+
+        self._jobs: Dict[str, Job] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._counters = {"submitted": 0, "succeeded": 0, "failed": 0, "recovered": 0}
+
+    # ------------------------------------------
+    # Lifecycle
+    # ------------------------------------------
+
+    async def start(self) -> None:
+        if self.store_path:
+            await asyncio.to_thread(self._disk_heartbeat)
+            await self._recover()
+            self._tasks.append(asyncio.create_task(self._heartbeat(), name="job-heartbeat"))
+
+        self._tasks += [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"📋 Job queue started ({self.workers} workers)")
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.store_path:
+            # Queued jobs can be claimed right away instead of after the heartbeat timeout
+            await asyncio.to_thread(self._disk_release)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------
+    # Public API
+    # ------------------------------------------
+
+    async def submit(self, request: Dict[str, Any]) -> Job:
+        if self._queue.qsize() >= self.max_queued:
+            raise QueueFullError(f"Job queue is full ({self.max_queued} queued)")
+        job = Job(id=uuid.uuid4().hex, request=request)
+        # Store first: a job the store refused is not tracked as queued forever
+        await self._persist(job)
+        self._track(job)
+        self._queue.put_nowait(job.id)
+        self._counters["submitted"] += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        """Return the job once finished, or as-is after `timeout` seconds"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return await self._wait_stored(job_id, timeout)
+        if job.finished or timeout <= 0:
+            return job
+        try:
+            await asyncio.wait_for(self._events[job_id].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of this process (jobs run by other workers are not included)"""
+        by_status = {status: 0 for status in JOB_STATUSES}
+        for job in self._jobs.values():
+            by_status[job.status] += 1
+        return {
+            "workers": self.workers,
+            "persistent": bool(self.store_path),
+            **by_status,
+            **self._counters,
+        }
+
+    # ------------------------------------------
+    # Internals
+    # ------------------------------------------
+
+    def _track(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        self._events[job.id] = asyncio.Event()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "queued":
+                continue
+
+            job.status, job.started_at = "running", time.time()
+            await self._save(job)
+            try:
+                job.result = await self.runner(job)
+                job.status = "succeeded"
+            except asyncio.CancelledError:
+                # Shutdown: leave the job queued for the next start
+                job.status, job.started_at = "queued", None
+                await asyncio.shield(self._save(job))
+                raise
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+                job.status, job.error = "failed", str(e)
+
+            job.finished_at = time.time()
+            self._counters[job.status] += 1
+            self._events[job_id].set()
+            await self._save(job)
+            try:
+                await self._prune()
+            except sqlite3.Error as e:
+                logger.warning(f"Job store cleanup failed: {e}")
+
+    async def _save(self, job: Job) -> None:
+        """_persist for the worker loop: a store error is logged, never fatal"""
+        try:
+            await self._persist(job)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            # The job keeps running (or stays finished) in memory; only other
+            # processes and restarts miss this update
+            logger.error(f"Job {job.id} could not be stored ({job.status}): {e}")
+
+    async def _wait_stored(self, job_id: str, timeout: float) -> Optional[Job]:
+        """Poll the store for a job another process runs"""
+        if not self.store_path:
+            return None
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await asyncio.to_thread(self._disk_get, job_id)
+            if job is None or job.finished or time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(min(self.POLL_SECONDS, max(0.0, deadline - time.monotonic())))
+
+    async def _recover(self) -> None:
+        """Claim unfinished jobs whose owner is gone and queue them here"""
+        claimed = 0
+        for job in await asyncio.to_thread(self._disk_claim):
+            if job.id in self._jobs:
+                continue
+            # Jobs that were running when their process stopped start over
+            self._track(job)
+            self._queue.put_nowait(job.id)
+            claimed += 1
+        if claimed:
+            self._counters["recovered"] += claimed
+            logger.info(f"📋 Recovered {claimed} unfinished job(s)")
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await asyncio.to_thread(self._disk_heartbeat)
+                await self._recover()
+                await asyncio.to_thread(self._disk_delete_before, time.time() - self.result_ttl)
+            except sqlite3.Error as e:
+                logger.warning(f"Job store heartbeat failed: {e}")
+
+    async def _prune(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            self._jobs.pop(job_id, None)
+            self._events.pop(job_id, None)
+        if expired and self.store_path:
+            await asyncio.to_thread(self._disk_delete_before, cutoff)
+
+    async def _persist(self, job: Job) -> None:
+        if self.store_path:
+            await asyncio.to_thread(self._disk_save, job)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.store_path)), exist_ok=True)
+            conn = sqlite3.connect(self.store_path, check_same_thread=False)
+            # Shared by every worker process (see result_cache.py)
+            conn.execute("PRAGMA busy_timeout = 5000")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    owner TEXT
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                # Stores written before jobs had owners: their jobs are up for grabs
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_owners (
+                    owner TEXT PRIMARY KEY,
+                    heartbeat_at REAL NOT NULL
+                )
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _disk_save(self, job: Job) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO jobs
+                    (id, status, request, result, error, created_at, started_at, finished_at, owner)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job.id,
+                    job.status,
+                    json.dumps(job.request),
+                    json.dumps(job.result) if job.result is not None else None,
+                    job.error,
+                    job.created_at,
+                    job.started_at,
+                    job.finished_at,
+                    self.owner,
+                ),
+            )
+            conn.commit()
+
+    def _disk_heartbeat(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO job_owners (owner, heartbeat_at) VALUES (?, ?)",
+                (self.owner, time.time()),
+            )
+            conn.commit()
+
+    def _disk_release(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM job_owners WHERE owner = ?", (self.owner,))
+            conn.commit()
+
+    def _disk_claim(self) -> List[Job]:
+        """Take over unfinished jobs of owners that shut down or stopped heartbeating"""
+        stale_before = time.time() - 3 * self.heartbeat_seconds
+        with self._lock:
+            conn = self._connection()
+            # One claim at a time across processes (IMMEDIATE takes the write lock)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM job_owners WHERE heartbeat_at < ?", (stale_before,))
+                conn.execute(
+                    """
+                    UPDATE jobs SET owner = ?, status = 'queued', started_at = NULL
+                    WHERE finished_at IS NULL
+                      AND (owner IS NULL OR owner NOT IN (SELECT owner FROM job_owners))
+                    """,
+                    (self.owner,),
+                )
+                rows = conn.execute(
+                    f"SELECT {JOB_COLUMNS} FROM jobs WHERE owner = ? AND finished_at IS NULL ORDER BY created_at ASC",
+                    (self.owner,),
+                ).fetchall()
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        return [_job_from_row(row) for row in rows]
+
+    def _disk_get(self, job_id: str) -> Optional[Job]:
+        """A job as last written by whichever process runs it (None once expired)"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = _job_from_row(row)
+        if job.finished and job.finished_at < time.time() - self.result_ttl:
+            return None
+        return job
+
+    def _disk_delete_before(self, cutoff: float) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,))
+            conn.commit()
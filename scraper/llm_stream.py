@@ -0,0 +1,152 @@
+"""
+LLM Stream - incremental parsing of streamed JSON completions
+OpenRouter streams the completion as SSE chunks. The parser below consumes
+the text deltas and emits each top-level `"key": value` pair of the JSON
+object as soon as it is complete, so fields like `full_name` are usable
+before generation finishes and garbage output is detected after a few
+characters instead of after the whole completion.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class MalformedStreamError(ValueError):
+    """The streamed output cannot be the JSON object we asked for"""
+
+
+class IncrementalJSONParser:
+    """
+    Tolerant incremental parser for a single top-level JSON object.
+
+    - Skips leading whitespace and a ``` / ```json code fence
+    - Emits (key, value) for every completed top-level member
+    - Raises MalformedStreamError as soon as the text cannot be a JSON object
+    - Ignores anything after the closing brace (e.g. a closing fence)
+    """
+
+    def __init__(self, max_preamble: int = 64):
+        self.max_preamble = max_preamble
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+
+        self._preamble = ""
+        self._started = False
+        self._member: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Consume a text delta; returns the members completed by it"""
+        completed: List[Tuple[str, Any]] = []
+        for char in text:
+            if self.done:
+                break
+            if not self._started:
+                self._consume_preamble(char)
+                continue
+            member = self._consume(char)
+            if member is not None:
+                completed.append(member)
+        return completed
+
+    def result(self) -> Dict[str, Any]:
+        """Fields of a fully parsed object (raises if the object never closed)"""
+        if not self.done:
+            raise MalformedStreamError("JSON object was not closed")
+        return self.fields
+
+    # ------------------------------------------
+    # Internals
+    # ------------------------------------------
+
+    def _consume_preamble(self, char: str) -> None:
+        if char == "{":
+            self._started = True
+            self._depth = 1
+            return
+        self._preamble += char
+        stripped = self._preamble.lstrip()
+        if not stripped:
+            return
+        if stripped.startswith("```"):
+            # Fence line: ``` or ```json up to the newline
+            if "\n" in stripped:
+                label = stripped[3:stripped.index("\n")].strip().lower()
+                if label not in ("", "json"):
+                    raise MalformedStreamError(f"Unexpected code fence '{label}'")
+                self._preamble = ""
+            elif len(stripped) > 16:
+                raise MalformedStreamError("Unterminated code fence")
+            return
+        if not "```".startswith(stripped) or len(self._preamble) > self.max_preamble:
+            raise MalformedStreamError(f"Expected a JSON object, got {stripped[:40]!r}")
+
+    def _consume(self, char: str) -> Optional[Tuple[str, Any]]:
+        if self._in_string:
+            self._member.append(char)
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+            return None
+
+        if char == '"':
+            self._in_string = True
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth < 0:
+                raise MalformedStreamError("Unbalanced brackets")
+
+        if self._depth == 0 or (self._depth == 1 and char == ","):
+            # End of a top-level member
+            member = self._close_member()
+            if self._depth == 0:
+                self.done = True
+            return member
+
+        self._member.append(char)
+        return None
+
+    def _close_member(self) -> Optional[Tuple[str, Any]]:
+        text = "".join(self._member).strip()
+        self._member = []
+        if not text:
+            return None
+        try:
+            parsed = json.loads("{" + text + "}")
+        except json.JSONDecodeError as e:
+            raise MalformedStreamError(f"Invalid member {text[:40]!r}: {e.msg}") from e
+        key, value = next(iter(parsed.items()))
+        self.fields[key] = value
+        return key, value
+
+
+def parse_sse_delta(line: str) -> Tuple[Optional[str], bool]:
+    """
+    Parse one SSE line of an OpenAI-compatible chat completion stream
+
+    Returns:
+        (content_delta, finished)
+    """
+    if not line.startswith("data:"):
+        # Blank separators and ": OPENROUTER PROCESSING" keep-alive comments
+        return None, False
+    payload = line[5:].strip()
+    if payload == "[DONE]":
+        return None, True
+    try:
+        event = json.loads(payload)
+    except json.JSONDecodeError:
+        return None, False
+    if "error" in event:
+        message = event["error"].get("message", "unknown error") if isinstance(event["error"], dict) else event["error"]
+        raise MalformedStreamError(f"Stream error: {message}")
+    choices = event.get("choices") or [{}]
+    delta = choices[0].get("delta", {}).get("content")
+    return delta, choices[0].get("finish_reason") is not None
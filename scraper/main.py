@@ -6,21 +6,43 @@ FastAPI microservice with resilient two-phase CV extraction
 # Fix for Python 3.13 + Windows + Playwright
 import sys
 import asyncio
+import time
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+IMPORT_STARTED = time.perf_counter()
 
-from fastapi import FastAPI
-from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, ConfigDict, ValidationError
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Literal, Type
 import os
 import logging
 import json
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
-from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
-from crawl4ai.content_filter_strategy import PruningContentFilter
+from dataclasses import dataclass
 import httpx
+import fast_path
+from browser_pool import BrowserPool, BrowserCrashError, is_browser_crash
+from result_cache import ResultCache, content_key
+from singleflight import SingleFlight
+from url_utils import internal_links, normalize_url
+from content import build_links_config, build_run_config, html_to_markdown, markdown_from_result
+from heuristic_extractor import extract_heuristic
+from chunking import estimate_tokens, merge_cv_data, pack_chunks, pack_units, section_units
+from compaction import compact_markdown
+from model_routing import ModelRoute, parse_routes, select_route
+from llm_stream import IncrementalJSONParser, MalformedStreamError, parse_sse_delta
+from jobs import Job, JobQueue, QueueFullError
+from politeness import DomainScheduler, interleave_by_domain
+from recrawl import crawl_state, markdown_hash, validators_from_headers
+import metrics
+from timings import PHASES, PhaseTimer, server_timing
+from profiling import profile_path, profile_request
+from resource_blocking import DEFAULT_BLOCKED_DOMAINS, ResourcePolicy, parse_list, track_blocking
+from startup import Warmup
+from markdown_pool import MarkdownPool, available_cores
+from multiworker import worker_count, worker_share
 
 # ==========================================
 # Logging Configuration
@@ -35,17 +57,368 @@ logger = logging.getLogger(__name__)
 from dotenv import load_dotenv
 load_dotenv()
 
+# Crawl4AI is not imported yet (see content.py): this is the cheap part
+IMPORT_MS = round((time.perf_counter() - IMPORT_STARTED) * 1000, 1)
+
+# ==========================================
+# Worker Processes Configuration
+# ==========================================
+# uvicorn worker processes in this container (run.py / uvicorn --workers read WEB_CONCURRENCY);
+# per-container budgets below are split between them
+WEB_CONCURRENCY = worker_count()
+MULTI_WORKER = WEB_CONCURRENCY > 1
+
+# ==========================================
+# Browser Pool Configuration
+# ==========================================
+# Browsers per container; each worker process gets its share (at least one)
+BROWSER_POOL_SIZE = worker_share(int(os.getenv("BROWSER_POOL_SIZE", 2)), WEB_CONCURRENCY)
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", 50))
+BROWSER_LEASE_TIMEOUT = float(os.getenv("BROWSER_LEASE_TIMEOUT", 60))
+# true: finish the warm-up (imports, caches, browsers) before serving; false: warm up in the background
+WARMUP_BLOCKING = os.getenv("WARMUP_BLOCKING", "false").lower() == "true"
+# Retry interval for a failed warm crawl (0 = do not retry)
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", 30))
+
+# ==========================================
+# Markdown Conversion Configuration
+# ==========================================
+# Convert HTML → markdown in worker processes instead of on the event loop
+MARKDOWN_PROCESS_POOL_ENABLED = os.getenv("MARKDOWN_PROCESS_POOL_ENABLED", "true").lower() == "true"
+# Conversion processes per container (0 = one per available core), split between worker processes
+MARKDOWN_WORKERS = worker_share(int(os.getenv("MARKDOWN_WORKERS", 0)) or available_cores(), WEB_CONCURRENCY)
+# Smaller pages are converted inline (cheaper than the hand-off)
+MARKDOWN_POOL_MIN_CHARS = int(os.getenv("MARKDOWN_POOL_MIN_CHARS", 2000))
+
+# ==========================================
+# Fast Path Configuration (browserless crawling)
+# ==========================================
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+FAST_PATH_MIN_WORDS = int(os.getenv("FAST_PATH_MIN_WORDS", 80))
+FAST_PATH_TIMEOUT = float(os.getenv("FAST_PATH_TIMEOUT", 10))
+FAST_PATH_MAX_BYTES = int(os.getenv("FAST_PATH_MAX_BYTES", 5 * 1024 * 1024))
+FETCH_USER_AGENT = os.getenv(
+    "FETCH_USER_AGENT",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# ==========================================
+# LLM HTTP Client Configuration
+# ==========================================
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 20))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", 10))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", 60))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() == "true"
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", 5))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", 30))
+# Override to point at an OpenRouter-compatible server (e.g. the benchmark stub)
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1").rstrip("/")
+OPENROUTER_CHAT_URL = f"{OPENROUTER_BASE_URL}/chat/completions"
+# Stream completions and parse fields as they arrive (aborts malformed output early)
+LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() == "true"
+
+# Resources the browser never downloads (Playwright resource types + tracker hosts)
+RESOURCE_BLOCKING_ENABLED = os.getenv("RESOURCE_BLOCKING_ENABLED", "true").lower() == "true"
+BLOCK_RESOURCE_TYPES = parse_list(os.getenv("BLOCK_RESOURCE_TYPES", "image,media,font"))
+BLOCK_TRACKERS = os.getenv("BLOCK_TRACKERS", "true").lower() == "true"
+BLOCK_DOMAINS = parse_list(os.getenv("BLOCK_DOMAINS", ""))
+
+# ==========================================
+# Politeness Configuration (per registrable domain)
+# ==========================================
+POLITENESS_ENABLED = os.getenv("POLITENESS_ENABLED", "true").lower() == "true"
+DOMAIN_RATE = float(os.getenv("DOMAIN_RATE", 1.0))
+DOMAIN_BURST = int(os.getenv("DOMAIN_BURST", 2))
+DOMAIN_MAX_CONCURRENCY = int(os.getenv("DOMAIN_MAX_CONCURRENCY", 2))
+RESPECT_CRAWL_DELAY = os.getenv("RESPECT_CRAWL_DELAY", "true").lower() == "true"
+DOMAIN_BACKOFF_SECONDS = float(os.getenv("DOMAIN_BACKOFF_SECONDS", 30))
+
+# ==========================================
+# LLM Extraction Configuration
+# ==========================================
+LLM_MODEL = "google/gemini-2.5-flash"
+LLM_MAX_INPUT_CHARS = 8000
+# Small, simple pages go to a faster model with a tighter output budget (routing table: LLM_ROUTES)
+LLM_ROUTING_ENABLED = os.getenv("LLM_ROUTING_ENABLED", "true").lower() == "true"
+LLM_ROUTES = parse_routes(os.getenv("LLM_ROUTES"), LLM_MODEL) if LLM_ROUTING_ENABLED else [
+    ModelRoute(name="default", model=LLM_MODEL, max_tokens=2000)
+]
+# Bump whenever an extraction prompt changes so cached results are not reused
+PROMPT_VERSION = "cv-v1"
+JOB_PROMPT_VERSION = "job-v1"
+
+# Long pages are split into section-aware chunks instead of being truncated
+LLM_CHUNK_TOKENS = int(os.getenv("LLM_CHUNK_TOKENS", 2000))
+LLM_MAX_CHUNKS = int(os.getenv("LLM_MAX_CHUNKS", 4))
+# Long pages in llm_mode=auto: sections packed into chunks, re-extracting only changed packs on recrawl
+INCREMENTAL_EXTRACTION_ENABLED = os.getenv("INCREMENTAL_EXTRACTION_ENABLED", "true").lower() == "true"
+
+# Strip images, link targets, duplicate lines and padding from the prompt copy of the markdown
+MARKDOWN_COMPACTION_ENABLED = os.getenv("MARKDOWN_COMPACTION_ENABLED", "true").lower() == "true"
+
+# Heuristic extractor result is used without the LLM at or above this confidence
+HEURISTIC_CONFIDENCE_THRESHOLD = float(os.getenv("HEURISTIC_CONFIDENCE_THRESHOLD", 0.75))
+# ...and only when the name itself is at least this confident (a wrong name is the costliest miss)
+HEURISTIC_NAME_CONFIDENCE = float(os.getenv("HEURISTIC_NAME_CONFIDENCE", 0.8))
+
+# ==========================================
+# Cache Configuration
+# ==========================================
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 30 * 24 * 3600))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 100 * 1024 * 1024))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", 256))
+
+# ==========================================
+# Conditional Recrawl Configuration
+# ==========================================
+RECRAWL_STATE_ENABLED = os.getenv("RECRAWL_STATE_ENABLED", "true").lower() == "true"
+RECRAWL_STATE_TTL = float(os.getenv("RECRAWL_STATE_TTL", 90 * 24 * 3600))
+RECRAWL_STATE_MAX_BYTES = int(os.getenv("RECRAWL_STATE_MAX_BYTES", 200 * 1024 * 1024))
+RECRAWL_STATE_MEMORY_ENTRIES = int(os.getenv("RECRAWL_STATE_MEMORY_ENTRIES", 64))
+
+# ==========================================
+# Batch Configuration
+# ==========================================
+BATCH_MAX_URLS = int(os.getenv("BATCH_MAX_URLS", 100))
+BATCH_CRAWL_CONCURRENCY = int(os.getenv("BATCH_CRAWL_CONCURRENCY", BROWSER_POOL_SIZE))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", 8))
+STREAM_BUFFER_SIZE = int(os.getenv("STREAM_BUFFER_SIZE", 4))
+
+# ==========================================
+# Profiling Configuration
+# ==========================================
+# Allows ?profile=true / X-Profile: 1 on /extract-cv (keep off in production)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(CACHE_DIR, "profiles"))
+# Older reports are deleted once PROFILE_DIR holds more than this many
+PROFILE_MAX_REPORTS = int(os.getenv("PROFILE_MAX_REPORTS", 50))
+
+# ==========================================
+# Job Queue Configuration
+# ==========================================
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 8))
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", 1000))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", 3600))
+JOB_PERSIST = os.getenv("JOB_PERSIST", "false").lower() == "true"
+JOB_MAX_WAIT = float(os.getenv("JOB_MAX_WAIT", 30))
+
+# Shared resources (created in lifespan)
+browser_pool: Optional[BrowserPool] = None
+llm_client: Optional[httpx.AsyncClient] = None
+fetch_client: Optional[httpx.AsyncClient] = None
+llm_cache: Optional[ResultCache] = None
+recrawl_state: Optional[ResultCache] = None
+job_queue: Optional[JobQueue] = None
+warmup: Optional[Warmup] = None
+markdown_pool: Optional[MarkdownPool] = None
+inflight = SingleFlight()
+resource_policy = ResourcePolicy(
+    resource_types=BLOCK_RESOURCE_TYPES,
+    blocked_domains=(DEFAULT_BLOCKED_DOMAINS if BLOCK_TRACKERS else frozenset()) | BLOCK_DOMAINS
+) if RESOURCE_BLOCKING_ENABLED else None
+politeness: Optional[DomainScheduler] = DomainScheduler(
+    rate=DOMAIN_RATE,
+    burst=DOMAIN_BURST,
+    max_concurrency=DOMAIN_MAX_CONCURRENCY,
+    respect_crawl_delay=RESPECT_CRAWL_DELAY,
+    backoff_seconds=DOMAIN_BACKOFF_SECONDS,
+    client_factory=lambda: fetch_client,
+    processes=WEB_CONCURRENCY
+) if POLITENESS_ENABLED else None
+
+def create_llm_client() -> httpx.AsyncClient:
+    """Pooled keep-alive client for OpenRouter (reuses TLS sessions across calls)"""
+    return httpx.AsyncClient(
+        http2=LLM_HTTP2,
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            connect=LLM_CONNECT_TIMEOUT,
+            read=LLM_READ_TIMEOUT,
+            write=LLM_CONNECT_TIMEOUT,
+            pool=LLM_CONNECT_TIMEOUT
+        )
+    )
+
+def create_fetch_client() -> httpx.AsyncClient:
+    """Client for fast-path page fetches (browser-like headers, follows redirects)"""
+    return httpx.AsyncClient(
+        http2=LLM_HTTP2,
+        follow_redirects=True,
+        headers={
+            "User-Agent": FETCH_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9,es;q=0.8"
+        },
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=httpx.Timeout(FAST_PATH_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+    )
+
+async def convert_markdown(url: str, html: str) -> str:
+    """HTML → markdown, in a worker process when the pool is enabled"""
+    mode = "process" if markdown_pool is not None and markdown_pool.pooled(html) else "inline"
+    started = time.perf_counter()
+    if markdown_pool is not None:
+        markdown = await markdown_pool.convert(url, html)
+    else:
+        markdown = html_to_markdown(url, html)
+    metrics.MARKDOWN_SECONDS.labels(mode).observe(time.perf_counter() - started)
+    return markdown
+
+# Small page crawled once at startup: exercises the scraping strategy,
+# content filter and markdown generator without touching the network
+WARMUP_HTML = (
+    "<html><body><main><h1>Warm-up</h1><h2>Experience</h2>"
+    "<ul><li>Crawl4AI markdown generation and pruning filter warm-up entry.</li></ul>"
+    "</main></body></html>"
+)
+
+async def warm_crawl() -> None:
+    """
+    Prove a warm crawl is possible: open a page in a pooled browser, then
+    run WARMUP_HTML through the crawler's scraping and markdown pipeline
+    
+    Crawl4AI renders raw: URLs without a page, so the page is opened
+    explicitly; doing it with the real run config also creates the browser
+    context that later crawls reuse.
+    """
+    run_config = build_run_config(bypass_cache=True)
+    async with browser_pool.lease() as crawler:
+        page, _ = await crawler.crawler_strategy.browser_manager.get_page(crawlerRunConfig=run_config)
+        try:
+            await page.set_content(WARMUP_HTML)
+        finally:
+            await page.close()
+        result = await crawler.arun(url=f"raw:{WARMUP_HTML}", config=run_config)
+    if not result.success:
+        raise RuntimeError(result.error_message)
+
+async def warm_up(state: Warmup) -> None:
+    """
+    Background warm-up: heavy imports, cache databases and markdown workers
+    in parallel, then the browser pool and one warm crawl. Crawls arriving earlier wait for
+    the imports instead of blocking the event loop on them. A failed warm
+    crawl is retried every WARMUP_RETRY_SECONDS until one succeeds.
+    """
+    caches = [cache for cache in (llm_cache, recrawl_state) if cache is not None]
+    steps = [
+        state.step("import_crawl4ai", asyncio.to_thread(html_to_markdown, "https://warmup.invalid/", WARMUP_HTML)),
+        state.step("cache_db", asyncio.gather(*(cache.open() for cache in caches))),
+    ]
+    if markdown_pool is not None:
+        steps.append(state.step("markdown_pool", markdown_pool.start()))
+    await asyncio.gather(*steps)
+    state.imports_ready.set()
+    
+    await state.step("browser_pool", browser_pool.start())
+    warm = await state.step("warm_crawl", warm_crawl())
+    if warm:
+        state.ready.set()
+    state.finish()
+    
+    while not warm and WARMUP_RETRY_SECONDS > 0:
+        await asyncio.sleep(WARMUP_RETRY_SECONDS)
+        warm = await state.step("warm_crawl", warm_crawl())
+    if warm and not state.ready.is_set():
+        state.errors.pop("warm_crawl", None)
+        state.ready.set()
+        logger.info("🔥 Warm crawl succeeded on retry: ready")
+
 # ==========================================
 # Lifespan Event Handler
 # ==========================================
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global browser_pool, llm_client, fetch_client, llm_cache, recrawl_state, job_queue, warmup, markdown_pool
+
     # Startup
     logger.info("🚀 ResuMate CV Scraper v4.0 - Crawl-then-Extract Architecture")
     logger.info(f"   LLM Available: {'✅' if os.getenv('OPENROUTER_API_KEY') else '❌'}")
+    logger.info(f"   Module imports: {IMPORT_MS:.0f}ms (Crawl4AI deferred to warm-up)")
+    if MULTI_WORKER:
+        logger.info(
+            f"   Worker {os.getpid()} of {WEB_CONCURRENCY}: {BROWSER_POOL_SIZE} browser(s), "
+            f"{MARKDOWN_WORKERS} markdown worker(s)"
+        )
+
+    browser_pool = BrowserPool(
+        size=BROWSER_POOL_SIZE,
+        max_pages=BROWSER_MAX_PAGES,
+        lease_timeout=BROWSER_LEASE_TIMEOUT,
+        crawler_setup=resource_policy.install if resource_policy else None
+    )
+
+    llm_client = create_llm_client()
+    fetch_client = create_fetch_client()
+
+    if MARKDOWN_PROCESS_POOL_ENABLED:
+        markdown_pool = MarkdownPool(workers=MARKDOWN_WORKERS, min_chars=MARKDOWN_POOL_MIN_CHARS)
+
+    if LLM_CACHE_ENABLED:
+        llm_cache = ResultCache(
+            path=os.path.join(CACHE_DIR, "results.db"),
+            namespace="llm",
+            ttl_seconds=LLM_CACHE_TTL,
+            max_bytes=LLM_CACHE_MAX_BYTES,
+            memory_entries=LLM_CACHE_MEMORY_ENTRIES,
+            shared=MULTI_WORKER
+        )
+
+    if RECRAWL_STATE_ENABLED:
+        recrawl_state = ResultCache(
+            path=os.path.join(CACHE_DIR, "results.db"),
+            namespace="recrawl",
+            ttl_seconds=RECRAWL_STATE_TTL,
+            max_bytes=RECRAWL_STATE_MAX_BYTES,
+            memory_entries=RECRAWL_STATE_MEMORY_ENTRIES,
+            shared=MULTI_WORKER
+        )
+
+    job_queue = JobQueue(
+        runner=run_job,
+        workers=JOB_WORKERS,
+        max_queued=JOB_MAX_QUEUED,
+        result_ttl=JOB_RESULT_TTL,
+        # Worker processes share job state through the store (any worker answers GET /jobs/{id})
+        store_path=os.path.join(CACHE_DIR, "jobs.db") if JOB_PERSIST or MULTI_WORKER else None
+    )
+    await job_queue.start()
+
+    warmup = Warmup()
+    warmup_task = asyncio.create_task(warm_up(warmup))
+    if WARMUP_BLOCKING:
+        await warmup.done.wait()
+
     yield
+
     # Shutdown
     logger.info("👋 Shutting down")
+    warmup_task.cancel()
+    await asyncio.gather(warmup_task, return_exceptions=True)
+    await job_queue.close()
+    job_queue = None
+    if llm_cache is not None:
+        llm_cache.close()
+        llm_cache = None
+    if recrawl_state is not None:
+        recrawl_state.close()
+        recrawl_state = None
+    await llm_client.aclose()
+    llm_client = None
+    await fetch_client.aclose()
+    fetch_client = None
+    await browser_pool.close()
+    browser_pool = None
+    if markdown_pool is not None:
+        await markdown_pool.close()
+        markdown_pool = None
+    warmup = None
+    metrics.process_exit()
 
 # ==========================================
 # FastAPI App
@@ -65,6 +438,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """End-to-end latency per route template (e.g. /jobs/{job_id}, not the raw path)"""
+    started = time.perf_counter()
+    status = 500
+    with metrics.HTTP_IN_FLIGHT.track_inprogress():
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            metrics.HTTP_REQUEST_SECONDS.labels(
+                request.method,
+                getattr(route, "path", "unmatched"),
+                str(status)
+            ).observe(time.perf_counter() - started)
+
 # ==========================================
 # Simplified Pydantic Models (Flatter Structure)
 # ==========================================
@@ -97,14 +488,49 @@ class CVData(BaseModel):
         str_strip_whitespace=True
     )
 
+class JobData(BaseModel):
+    """Job posting structure (mirrors JobData in the Node ScraperService)"""
+    
+    title: Optional[str] = Field(None, description="Job title")
+    company: Optional[str] = Field(None, description="Hiring company")
+    location: Optional[str] = Field(None, description="Location or remote policy")
+    salary: Optional[str] = Field(None, description="Salary range as written")
+    description: Optional[str] = Field(None, description="Short summary of the role")
+    requirements: List[str] = Field(default=[], description="Required skills/experience")
+    benefits: List[str] = Field(default=[], description="Benefits")
+    employment_type: Optional[str] = Field(None, description="Full-time, part-time, contract...")
+    experience_level: Optional[str] = Field(None, description="Junior, mid, senior...")
+    posted_date: Optional[str] = Field(None, description="Posting date as written")
+    application_deadline: Optional[str] = Field(None, description="Deadline as written")
+    technologies: List[str] = Field(default=[], description="Technologies mentioned")
+    
+    model_config = ConfigDict(
+        extra="allow",
+        str_strip_whitespace=True
+    )
+
 # ==========================================
 # Request/Response Models
 # ==========================================
 
-class CVExtractionRequest(BaseModel):
-    url: str = Field(..., description="URL to extract CV from")
+class CVExtractionOptions(BaseModel):
     use_llm: bool = Field(default=True, description="Attempt LLM extraction after crawl")
     bypass_cache: bool = Field(default=False, description="Force fresh crawl")
+    bypass_llm_cache: bool = Field(default=False, description="Ignore cached LLM results (fresh result overwrites the cache)")
+    extractor: Literal["auto", "heuristic", "llm"] = Field(
+        default="auto",
+        description="auto: heuristic first, LLM only below the confidence threshold"
+    )
+    llm_mode: Literal["auto", "truncate", "chunked", "sections"] = Field(
+        default="auto",
+        description=(
+            "auto: split by section when the page exceeds one LLM chunk; truncate: first LLM_MAX_INPUT_CHARS only; "
+            "sections: sections packed like chunked, only packs with changed sections re-extracted on recrawl"
+        )
+    )
+
+class CVExtractionRequest(CVExtractionOptions):
+    url: str = Field(..., description="URL to extract CV from")
 
 class CVExtractionResponse(BaseModel):
     success: bool
@@ -114,240 +540,1381 @@ class CVExtractionResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     error: Optional[str] = None
     warnings: List[str] = Field(default=[], description="Non-fatal warnings")
+    unchanged: bool = Field(default=False, description="Page unchanged since the last crawl: previous result, no LLM call")
+
+class CVBatchExtractionRequest(CVExtractionOptions):
+    urls: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_URLS, description="URLs to extract CVs from")
+    crawl_concurrency: Optional[int] = Field(None, ge=1, description="Max concurrent crawls (default: BATCH_CRAWL_CONCURRENCY)")
+    llm_concurrency: Optional[int] = Field(None, ge=1, description="Max concurrent LLM calls (default: BATCH_LLM_CONCURRENCY)")
+    
+    def for_url(self, url: str) -> CVExtractionRequest:
+        """Single-URL request carrying this batch's extraction options"""
+        options = self.model_dump(include=set(CVExtractionOptions.model_fields))
+        return CVExtractionRequest(url=url, **options)
+
+class CVBatchExtractionResponse(BaseModel):
+    results: List[CVExtractionResponse] = Field(default=[], description="Per-URL results, in request order")
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+class ExtractRequest(BaseModel):
+    url: str = Field(..., description="URL to extract content from")
+    only_links: bool = Field(default=False, description="Return only internal links (no markdown, no content filter)")
+    bypass_cache: bool = Field(default=False, description="Force fresh crawl")
+
+class ExtractResponse(BaseModel):
+    success: bool
+    url: str
+    content: str = Field(default="", description="Clean markdown (empty with only_links)")
+    internal_links: List[str] = Field(default=[], description="Normalized, deduplicated same-site links (only_links)")
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+    error: Optional[str] = None
+
+class ExtractJobRequest(BaseModel):
+    url: str = Field(..., description="Job posting URL")
+    use_llm: bool = Field(default=True, description="Extract structured job data with the LLM")
+    bypass_cache: bool = Field(default=False, description="Force fresh crawl")
+    bypass_llm_cache: bool = Field(default=False, description="Ignore cached LLM results")
+
+class ExtractJobResponse(BaseModel):
+    url: str
+    success: bool
+    job_data: Optional[JobData] = Field(None, description="Structured data (if LLM succeeds)")
+    raw_content: Optional[str] = Field(None, description="Clean markdown of the posting")
+    error: Optional[str] = None
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+    warnings: List[str] = Field(default=[], description="Non-fatal warnings")
+
+class ExtractJobBatchRequest(BaseModel):
+    urls: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_URLS, description="Job posting URLs")
+    use_llm: bool = Field(default=True, description="Extract structured job data with the LLM")
+    bypass_cache: bool = Field(default=False, description="Force fresh crawl")
+    bypass_llm_cache: bool = Field(default=False, description="Ignore cached LLM results")
+    crawl_concurrency: Optional[int] = Field(None, ge=1, description="Max concurrent crawls (default: BATCH_CRAWL_CONCURRENCY)")
+    llm_concurrency: Optional[int] = Field(None, ge=1, description="Max concurrent LLM calls (default: BATCH_LLM_CONCURRENCY)")
+    
+    def for_url(self, url: str) -> ExtractJobRequest:
+        """Single-URL request carrying this batch's extraction options"""
+        options = self.model_dump(include={"use_llm", "bypass_cache", "bypass_llm_cache"})
+        return ExtractJobRequest(url=url, **options)
+
+class ExtractJobBatchResponse(BaseModel):
+    results: List[ExtractJobResponse] = Field(default=[], description="Per-URL results, in request order")
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    status_url: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[CVExtractionResponse] = Field(None, description="Set once the job succeeded")
+    error: Optional[str] = None
+
+    @classmethod
+    def from_job(cls, job: Job) -> "JobStatusResponse":
+        return cls(
+            job_id=job.id,
+            status=job.status,
+            status_url=f"/jobs/{job.id}",
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            result=job.result,
+            error=job.error
+        )
 
 # ==========================================
 # Helper Functions
 # ==========================================
 
-async def crawl_page(url: str, bypass_cache: bool = False) -> tuple[bool, str, str]:
+@dataclass(frozen=True)
+class ExtractionTask:
+    """What the LLM extracts: prompt instructions, output model and cache version"""
+    name: str
+    schema: Type[BaseModel]
+    instructions: str
+    prompt_version: str
+
+CV_TASK = ExtractionTask(
+    name="cv",
+    schema=CVData,
+    prompt_version=PROMPT_VERSION,
+    instructions="""Extract professional CV information from the following markdown content.
+
+Return a JSON object with these fields (return empty arrays/null if not found):
+- full_name: string (person's name)
+- summary: string (professional summary)
+- job_titles: array of strings (job positions)
+- companies: array of strings (companies worked at)
+- experience_details: array of strings (key achievements/responsibilities)
+- technical_skills: array of strings (all technical skills)
+- languages: array of strings (programming languages)
+- frameworks: array of strings (frameworks/libraries)
+- tools: array of strings (tools/technologies)
+- degrees: array of strings (education degrees)
+- institutions: array of strings (schools/universities)
+- contact_info: string (email/contact if visible)"""
+)
+
+JOB_TASK = ExtractionTask(
+    name="job",
+    schema=JobData,
+    prompt_version=JOB_PROMPT_VERSION,
+    instructions="""Extract job posting information from the following markdown content.
+
+Return a JSON object with these fields (return empty arrays/null if not found):
+- title: string (job title)
+- company: string (hiring company)
+- location: string (city/country or remote policy)
+- salary: string (salary range as written)
+- description: string (short summary of the role)
+- requirements: array of strings (required skills/experience)
+- benefits: array of strings (benefits and perks)
+- employment_type: string (full-time, part-time, contract, internship)
+- experience_level: string (junior, mid, senior, lead)
+- posted_date: string (as written on the page)
+- application_deadline: string (as written on the page)
+- technologies: array of strings (technologies/tools mentioned)"""
+)
+
+async def crawl_page(
+    url: str,
+    bypass_cache: bool = False,
+    links_only: bool = False,
+    validators: Optional[Dict[str, str]] = None
+) -> tuple[bool, Any, str, Dict[str, Any]]:
     """
     Phase 1: Pure crawling to get high-quality markdown
     
+    Static pages are served by the browserless fast path; the browser is
+    only used when that result fails the quality check.
+    
+    With `links_only` no markdown is generated: the content is the list of
+    normalized internal links (listing discovery).
+    
+    With `validators` (ETag / Last-Modified of the previous crawl) the fast
+    path GET is conditional; a 304 succeeds with empty content and
+    crawl_info["not_modified"]. crawl_info["validators"] carries the page's
+    current validators.
+    
     Returns:
-        (success, markdown_content, error_message)
+        (success, markdown_content or links, error_message, crawl_info)
     """
+    crawl_info: Dict[str, Any] = {}
+    if warmup is not None and not warmup.imports_ready.is_set():
+        # Still importing Crawl4AI in the background: wait instead of importing on the event loop
+        await warmup.imports_ready.wait()
     try:
-        logger.info(f"📄 Phase 1: Crawling {url}")
+        logger.info(f"📄 Phase 1: Crawling {url}{' (links only)' if links_only else ''}")
         
-        # Content filter for clean markdown
-        content_filter = PruningContentFilter(
-            threshold=0.48,
-            threshold_type="dynamic",
-            min_word_threshold=5
-        )
+        if FAST_PATH_ENABLED and url.lower().startswith(("http://", "https://")):
+            client = fetch_client or create_fetch_client()
+            try:
+                if links_only:
+                    content, reason, stats = await fast_path.fetch_links(client, url, FAST_PATH_MAX_BYTES)
+                else:
+                    content, reason, stats = await fast_path.fetch_markdown(
+                        client, url, FAST_PATH_MIN_WORDS, FAST_PATH_MAX_BYTES, validators, convert_markdown
+                    )
+            finally:
+                if client is not fetch_client:
+                    await client.aclose()
+            
+            page_validators = stats.pop("validators", {})
+            if reason == "not_modified":
+                logger.info("⚡ Not modified since the last crawl (HTTP 304)")
+                return True, "", "", {"crawl_path": "fast", "not_modified": True, "fast_path": stats}
+            
+            if content is not None:
+                logger.info(f"⚡ Fast path crawl: {len(content)} {'links' if links_only else 'chars'}")
+                return True, content, "", {"crawl_path": "fast", "fast_path": stats, "validators": page_validators}
+            
+            if reason in ("http_404", "http_410"):
+                # The page does not exist: a browser would only render the error page
+                crawl_info["fast_path_rejected"] = reason
+                crawl_info["crawl_error"] = "not_found"
+                return False, "", f"Page not found (HTTP {stats['status_code']})", crawl_info
+            
+            if reason == "http_429":
+                # The site is rate limiting us: opening a browser would only make it worse
+                if politeness is not None:
+                    politeness.backoff(url, stats.get("retry_after"))
+                crawl_info["fast_path_rejected"] = reason
+                crawl_info["crawl_error"] = "rate_limited"
+                return False, "", "Rate limited by site (HTTP 429)", crawl_info
+            
+            logger.info(f"↪️ Fast path rejected ({reason}), escalating to browser")
+            crawl_info["fast_path_rejected"] = reason
         
-        markdown_generator = DefaultMarkdownGenerator(
-            content_filter=content_filter
-        )
+        crawl_info["crawl_path"] = "browser"
+        # With the markdown pool the crawler only renders; result.html is converted below
+        deferred_markdown = markdown_pool is not None and not links_only
+        if links_only:
+            run_config = build_links_config(bypass_cache)
+        else:
+            run_config = build_run_config(bypass_cache, generate_markdown=not deferred_markdown)
         
-        browser_config = BrowserConfig(
-            headless=True,
-            verbose=False
-        )
+        with track_blocking() as blocking:
+            if browser_pool is not None:
+                # Warm crawler from the pool; a dead browser is recycled on raise
+                async with browser_pool.lease() as crawler:
+                    result = await crawler.arun(url=url, config=run_config)
+                    if not result.success and is_browser_crash(result.error_message):
+                        raise BrowserCrashError(result.error_message)
+            else:
+                # No pool (e.g. called outside the app lifespan): one-off browser
+                from crawl4ai import AsyncWebCrawler, BrowserConfig
+                crawler = AsyncWebCrawler(config=BrowserConfig(headless=True, verbose=False))
+                if resource_policy is not None:
+                    resource_policy.install(crawler)
+                async with crawler:
+                    result = await crawler.arun(url=url, config=run_config)
+        if resource_policy is not None:
+            crawl_info.update(blocking.as_metadata())
         
-        run_config = CrawlerRunConfig(
-            markdown_generator=markdown_generator,
-            cache_mode=CacheMode.BYPASS if bypass_cache else CacheMode.ENABLED,
-            word_count_threshold=10,
-            excluded_tags=["nav", "footer", "header", "aside"],
-            exclude_external_links=True,
-            exclude_social_media_links=True,
-            process_iframes=False,
-            remove_overlay_elements=True,
-            page_timeout=30000
-        )
+        if result.status_code == 429 and politeness is not None:
+            politeness.backoff(url, (result.response_headers or {}).get("retry-after"))
         
-        async with AsyncWebCrawler(config=browser_config) as crawler:
-            result = await crawler.arun(url=url, config=run_config)
-            
-            if not result.success:
-                return False, "", f"Crawl failed: {result.error_message}"
-            
-            # Extract markdown
-            markdown_content = ""
-            if hasattr(result.markdown, 'raw_markdown'):
-                markdown_content = result.markdown.raw_markdown
-            elif hasattr(result.markdown, 'fit_markdown'):
-                markdown_content = result.markdown.fit_markdown
-            else:
-                markdown_content = str(result.markdown)
-            
-            logger.info(f"✅ Crawl successful: {len(markdown_content)} chars")
-            return True, markdown_content, ""
+        if not result.success:
+            crawl_info["crawl_error"] = "crawl_failed"
+            return False, "", f"Crawl failed: {result.error_message}", crawl_info
+        
+        if links_only:
+            hrefs = [link.get("href", "") for link in (result.links or {}).get("internal", [])]
+            links = internal_links(hrefs, result.redirected_url or url)
+            logger.info(f"✅ Crawl successful: {len(links)} links")
+            return True, links, "", crawl_info
+        
+        # Extract markdown
+        markdown_content = "" if deferred_markdown else markdown_from_result(result.markdown)
+        if not markdown_content.strip() and result.html:
+            # Render-only crawl, or a page Crawl4AI cached from one
+            markdown_content = await convert_markdown(result.redirected_url or url, result.html)
+        crawl_info["validators"] = validators_from_headers(result.response_headers)
+        
+        logger.info(f"✅ Crawl successful: {len(markdown_content)} chars")
+        return True, markdown_content, "", crawl_info
             
     except asyncio.TimeoutError:
-        return False, "", "Page timeout (30s exceeded)"
+        crawl_info["crawl_error"] = "timeout"
+        return False, "", "Page timeout (30s exceeded)", crawl_info
+    except BrowserCrashError as e:
+        logger.error(f"Browser crashed while crawling {url}: {e}")
+        crawl_info["crawl_error"] = "browser_crash"
+        return False, "", f"Crawl failed (browser crashed): {str(e)}", crawl_info
     except Exception as e:
         logger.error(f"Crawl error: {e}", exc_info=True)
-        return False, "", f"Crawl error: {str(e)}"
+        crawl_info["crawl_error"] = "error"
+        return False, "", f"Crawl error: {str(e)}", crawl_info
 
-async def extract_with_llm(markdown: str, url: str) -> tuple[Optional[CVData], Optional[str]]:
+async def extract_with_llm(
+    markdown: str,
+    url: str,
+    on_field: Optional[Callable[[str, Any], None]] = None,
+    route: Optional[ModelRoute] = None,
+    task: ExtractionTask = CV_TASK
+) -> tuple[Optional[BaseModel], Optional[str], Dict[str, Any]]:
     """
     Phase 2: Independent LLM extraction (happens AFTER successful crawl)
     
+    With LLM_STREAMING the completion is parsed incrementally: every field
+    of the task's schema (CVData by default) is validated (and passed to
+    `on_field`) as soon as it is complete, and the request is aborted on
+    the first malformed output.
+    
+    `route` picks the model and output budget (default: the catch-all route).
+    
     Returns:
-        (cv_data, error_message)
+        (data, error_message, llm_metadata)
     """
+    route = route or LLM_ROUTES[-1]
+    info: Dict[str, Any] = {"llm_streaming": LLM_STREAMING}
+    started = time.perf_counter()
     try:
-        logger.info("🤖 Phase 2: LLM extraction")
+        logger.info(f"🤖 Phase 2: LLM extraction ({route.name}: {route.model})")
         
         api_key = os.getenv("OPENROUTER_API_KEY")
         if not api_key:
-            return None, "OPENROUTER_API_KEY not configured"
+            info["llm_error"] = "no_api_key"
+            return None, "OPENROUTER_API_KEY not configured", info
         
         # Direct API call to OpenRouter (no Crawl4AI coupling)
         prompt = f"""
-Extract professional CV information from the following markdown content.
-
-Return a JSON object with these fields (return empty arrays/null if not found):
-- full_name: string (person's name)
-- summary: string (professional summary)
-- job_titles: array of strings (job positions)
-- companies: array of strings (companies worked at)
-- experience_details: array of strings (key achievements/responsibilities)
-- technical_skills: array of strings (all technical skills)
-- languages: array of strings (programming languages)
-- frameworks: array of strings (frameworks/libraries)
-- tools: array of strings (tools/technologies)
-- degrees: array of strings (education degrees)
-- institutions: array of strings (schools/universities)
-- contact_info: string (email/contact if visible)
+{task.instructions}
 
 MARKDOWN CONTENT:
-{markdown[:8000]}
+{markdown[:LLM_MAX_INPUT_CHARS]}
 
 Return only valid JSON, no markdown formatting."""
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "google/gemini-2.5-flash",
-                    "messages": [
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.1,
-                    "max_tokens": 2000
-                }
-            )
-        
-        if response.status_code != 200:
-            return None, f"LLM API error: {response.status_code}"
-        
-        result = response.json()
-        llm_output = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-        
-        # Parse JSON from LLM output
-        # Clean markdown code blocks if present
-        if "```json" in llm_output:
-            llm_output = llm_output.split("```json")[1].split("```")[0]
-        elif "```" in llm_output:
-            llm_output = llm_output.split("```")[1].split("```")[0]
+        request_kwargs = dict(
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": route.model,
+                "messages": [
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": 0.1,
+                "max_tokens": route.max_tokens,
+                "stream": LLM_STREAMING
+            }
+        )
         
-        parsed = json.loads(llm_output.strip())
+        async with AsyncExitStack() as stack:
+            client = llm_client
+            if client is None:
+                # No shared client (e.g. called outside the app lifespan)
+                client = await stack.enter_async_context(create_llm_client())
+            
+            if LLM_STREAMING:
+                response = await stack.enter_async_context(
+                    client.stream("POST", OPENROUTER_CHAT_URL, **request_kwargs)
+                )
+                if response.status_code != 200:
+                    info["llm_error"] = f"http_{response.status_code}"
+                    return None, f"LLM API error: {response.status_code}", info
+                parsed = await read_llm_stream(response, on_field, info, started, task.schema)
+                parse_seconds = info.pop("_parse_seconds")
+            else:
+                response = await client.post(OPENROUTER_CHAT_URL, **request_kwargs)
+                if response.status_code != 200:
+                    info["llm_error"] = f"http_{response.status_code}"
+                    return None, f"LLM API error: {response.status_code}", info
+                
+                result = response.json()
+                llm_output = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                
+                # Parse JSON from LLM output
+                # Clean markdown code blocks if present
+                if "```json" in llm_output:
+                    llm_output = llm_output.split("```json")[1].split("```")[0]
+                elif "```" in llm_output:
+                    llm_output = llm_output.split("```")[1].split("```")[0]
+                
+                parse_started = time.perf_counter()
+                parsed = json.loads(llm_output.strip())
+                parse_seconds = time.perf_counter() - parse_started
         
         # Validate with Pydantic (strict=False for leniency)
-        cv_data = CVData.model_validate(parsed, strict=False)
+        validate_started = time.perf_counter()
+        data = task.schema.model_validate(parsed, strict=False)
+        parse_seconds += time.perf_counter() - validate_started
+        metrics.LLM_PARSE_SECONDS.observe(parse_seconds)
+        info["llm_parse_ms"] = round(parse_seconds * 1000, 2)
+        info["llm_total_ms"] = round((time.perf_counter() - started) * 1000)
         
-        logger.info(f"✅ LLM extraction successful: {cv_data.full_name or 'N/A'}")
-        return cv_data, None
+        label = getattr(data, "full_name", None) or getattr(data, "title", None)
+        logger.info(f"✅ LLM extraction successful: {label or 'N/A'}")
+        return data, None, info
         
+    except MalformedStreamError as e:
+        info["llm_aborted_after_chars"] = info.get("llm_output_chars", 0)
+        info["llm_error"] = "stream_aborted"
+        logger.warning(f"LLM stream aborted early: {e}")
+        return None, f"LLM output rejected early: {str(e)}", info
     except json.JSONDecodeError as e:
+        info["llm_error"] = "invalid_json"
         logger.warning(f"LLM output was not valid JSON: {e}")
-        return None, f"LLM returned invalid JSON: {str(e)}"
+        return None, f"LLM returned invalid JSON: {str(e)}", info
     except Exception as e:
+        info["llm_error"] = "validation" if isinstance(e, ValidationError) else type(e).__name__
         logger.warning(f"LLM extraction failed: {e}", exc_info=True)
-        return None, f"LLM extraction error: {str(e)}"
+        return None, f"LLM extraction error: {str(e)}", info
+
+async def read_llm_stream(
+    response: httpx.Response,
+    on_field: Optional[Callable[[str, Any], None]],
+    info: Dict[str, Any],
+    started: float,
+    schema: Type[BaseModel] = CVData
+) -> Dict[str, Any]:
+    """
+    Consume an OpenRouter SSE stream through the incremental JSON parser
+    
+    Each completed field is validated against the schema immediately; returning
+    early (or raising) closes the response, which cancels the generation.
+    """
+    parser = IncrementalJSONParser()
+    info["llm_output_chars"] = 0
+    parse_seconds = 0.0
+    
+    async for line in response.aiter_lines():
+        delta, finished = parse_sse_delta(line)
+        if delta:
+            info["llm_output_chars"] += len(delta)
+            parse_started = time.perf_counter()
+            for name, value in parser.feed(delta):
+                if "llm_first_field_ms" not in info:
+                    first_field = time.perf_counter() - started
+                    info["llm_first_field_ms"] = round(first_field * 1000)
+                    metrics.LLM_FIRST_FIELD_SECONDS.observe(first_field)
+                try:
+                    schema.model_validate({name: value}, strict=False)
+                except ValidationError as e:
+                    raise MalformedStreamError(f"Invalid value for '{name}': {e.errors()[0]['msg']}") from e
+                if on_field is not None:
+                    on_field(name, value)
+            parse_seconds += time.perf_counter() - parse_started
+        if parser.done or finished:
+            break
+    
+    # Incremental parse time, handed back to extract_with_llm for the metric
+    info["_parse_seconds"] = parse_seconds
+    return parser.result()
 
 # ==========================================
-# API Endpoints
+# Extraction Pipeline
 # ==========================================
 
-@app.get("/")
-async def root():
-    return {
-        "service": "ResuMate CV Scraper",
-        "version": "4.0.0",
-        "architecture": "Crawl-then-Extract (2-phase)",
-        "status": "running"
+async def extract_with_llm_cached(
+    markdown: str,
+    url: str,
+    bypass_llm_cache: bool = False,
+    task: ExtractionTask = CV_TASK
+) -> tuple[Optional[BaseModel], Optional[str], Dict[str, Any]]:
+    """
+    Content-addressed cache in front of the LLM
+    
+    The model is routed on the size and complexity of what the LLM sees;
+    a routed model that fails gets one retry on the catch-all route. The
+    cache key covers exactly what the LLM sees (truncated markdown), the
+    prompt version and the routed model, so identical pages never pay for
+    a second OpenRouter call. Entries record the model that produced them:
+    after an escalation that is the catch-all model, not the routed one.
+    
+    Returns:
+        (cv_data, error_message, llm_metadata)
+    """
+    route, signals = select_route(LLM_ROUTES, markdown[:LLM_MAX_INPUT_CHARS])
+    cache_key = content_key(markdown[:LLM_MAX_INPUT_CHARS], task.prompt_version, route.model)
+    info: Dict[str, Any] = {
+        "llm_model": route.model,
+        "llm_route": route.name,
+        "llm_max_tokens": route.max_tokens,
+        **signals,
+        "llm_cache_key": cache_key
+    }
+    
+    if llm_cache is None:
+        info["llm_cache"] = "disabled"
+    elif bypass_llm_cache:
+        info["llm_cache"] = "bypass"
+    else:
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            logger.info("⚡ LLM cache hit")
+            info["llm_cache"] = "hit"
+            metrics.LLM_CACHE_RESULTS.labels("hit").inc()
+            if "llm_model" not in cached:
+                # Entry written before models were recorded
+                return task.schema.model_validate(cached), None, info
+            if cached["llm_route"] != route.name:
+                info["llm_escalated_from"] = route.name
+            info.update(
+                llm_model=cached["llm_model"],
+                llm_route=cached["llm_route"],
+                llm_max_tokens=cached["llm_max_tokens"]
+            )
+            return task.schema.model_validate(cached["data"]), None, info
+        info["llm_cache"] = "miss"
+    metrics.LLM_CACHE_RESULTS.labels(info["llm_cache"]).inc()
+    
+    attempts = [route] if route is LLM_ROUTES[-1] else [route, LLM_ROUTES[-1]]
+    for attempt in attempts:
+        if attempt is not route:
+            # Truncated or malformed output from the cheaper model: retry on the catch-all route
+            info["llm_escalation_reason"] = info.pop("llm_error", "error")
+            logger.warning(
+                f"↗️ LLM route '{route.name}' failed ({info['llm_escalation_reason']}), escalating to '{attempt.name}'"
+            )
+            metrics.LLM_ESCALATIONS.labels(route.name).inc()
+            info["llm_escalated_from"] = route.name
+            info.pop("llm_aborted_after_chars", None)
+            info.update(llm_model=attempt.model, llm_route=attempt.name, llm_max_tokens=attempt.max_tokens)
+        
+        started = time.perf_counter()
+        cv_data, llm_error, stream_info = await extract_with_llm(markdown, url, route=attempt, task=task)
+        info.update(stream_info)
+        metrics.LLM_SECONDS.labels(attempt.name, "success" if cv_data is not None else "failure").observe(
+            time.perf_counter() - started
+        )
+        if cv_data is not None:
+            break
+        metrics.LLM_FAILURES.labels(stream_info.get("llm_error", "error")).inc()
+        if stream_info.get("llm_error") == "no_api_key":
+            break
+    
+    if cv_data is not None and llm_cache is not None:
+        await llm_cache.set(cache_key, {
+            "llm_model": info["llm_model"],
+            "llm_route": info["llm_route"],
+            "llm_max_tokens": info["llm_max_tokens"],
+            "data": cv_data.model_dump()
+        })
+    
+    return cv_data, llm_error, info
+
+async def extract_with_llm_chunked(
+    markdown: str,
+    url: str,
+    bypass_llm_cache: bool = False,
+    llm_limit: Optional[asyncio.Semaphore] = None
+) -> tuple[Optional[CVData], Optional[str], Dict[str, Any]]:
+    """
+    Section-aware chunked LLM extraction for long pages
+    
+    Sections are ranked (CV sections first, link-heavy junk dropped) and
+    packed into at most LLM_MAX_CHUNKS prompts of LLM_CHUNK_TOKENS each.
+    Chunks are extracted concurrently (each one counts against llm_limit
+    and is cached on its own) and merged in document order.
+    
+    Returns:
+        (cv_data, error_message, llm_metadata) - error only if every chunk failed
+    """
+    chunks = pack_chunks(markdown, LLM_CHUNK_TOKENS, LLM_MAX_CHUNKS)
+    logger.info(f"🧱 Chunked LLM extraction: {len(chunks)} chunk(s) from {len(markdown)} chars")
+    
+    async def run_chunk(chunk: str):
+        async with llm_limit or nullcontext():
+            return await extract_with_llm_cached(chunk, url, bypass_llm_cache)
+    
+    results = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+    
+    partials = [cv_data.model_dump() for cv_data, _, _ in results if cv_data is not None]
+    errors = [error for cv_data, error, _ in results if cv_data is None]
+    info: Dict[str, Any] = {
+        "llm_model": [chunk_info.get("llm_model") for _, _, chunk_info in results],
+        "llm_route": [chunk_info.get("llm_route") for _, _, chunk_info in results],
+        "llm_mode": "chunked",
+        "llm_chunks": len(chunks),
+        "llm_chunks_failed": len(errors),
+        "llm_chunk_tokens": [estimate_tokens(chunk) for chunk in chunks],
+        "llm_cache": [chunk_info.get("llm_cache") for _, _, chunk_info in results],
+        "llm_parse_ms": round(sum(chunk_info.get("llm_parse_ms", 0) for _, _, chunk_info in results), 2),
     }
+    
+    if not partials:
+        return None, errors[0] if errors else "No content to extract", info
+    return CVData.model_validate(merge_cv_data(partials)), None, info
 
-@app.get("/health")
-async def health():
-    return {
-        "status": "healthy",
-        "service": "cv-scraper",
-        "llm_configured": bool(os.getenv("OPENROUTER_API_KEY"))
+async def extract_with_llm_sections(
+    markdown: str,
+    url: str,
+    bypass_llm_cache: bool = False,
+    llm_limit: Optional[asyncio.Semaphore] = None
+) -> tuple[Optional[CVData], Optional[str], Dict[str, Any]]:
+    """
+    Incremental section-level LLM extraction
+    
+    The page is split into stable units (top-level sections with their
+    subsections), and consecutive units are packed into prompts of up to
+    LLM_CHUNK_TOKENS, so a first extraction costs as many calls as chunked
+    mode. A per-URL record keeps each pack's unit hashes and the CVData
+    fields it produced. On the next extraction a pack whose units are all
+    still on the page reuses its fields; the remaining units (new, edited,
+    or neighbours of an edited unit in the same pack) are packed again and
+    extracted. All fields are merged in document order, so removed sections
+    drop out with their fields.
+    
+    Returns:
+        (cv_data, error_message, llm_metadata) - error only if every pack failed
+    """
+    units = section_units(markdown, LLM_CHUNK_TOKENS, LLM_CHUNK_TOKENS * LLM_MAX_CHUNKS)
+    hashes = [markdown_hash(unit) for unit in units]
+    record_key = content_key("section-packs", normalize_url(url), PROMPT_VERSION)
+    recorded: List[Dict[str, Any]] = []
+    if recrawl_state is not None and not bypass_llm_cache:
+        recorded = ((await recrawl_state.get(record_key)) or {}).get("packs", [])
+    
+    positions = {unit_hash: index for index, unit_hash in enumerate(hashes)}
+    reused = [pack for pack in recorded if pack["units"] and all(h in positions for h in pack["units"])]
+    covered = {unit_hash for pack in reused for unit_hash in pack["units"]}
+    pending = [index for index, unit_hash in enumerate(hashes) if unit_hash not in covered]
+    new_packs = [
+        [pending[i] for i in group]
+        for group in pack_units([units[index] for index in pending], LLM_CHUNK_TOKENS)
+    ]
+    logger.info(
+        f"🧩 Section extraction: {len(units)} section(s), {len(units) - len(pending)} unchanged, "
+        f"{len(pending)} to extract in {len(new_packs)} call(s)"
+    )
+    
+    async def run_pack(indexes: List[int]):
+        async with llm_limit or nullcontext():
+            return await extract_with_llm_cached(
+                "\n\n".join(units[index] for index in indexes), url, bypass_llm_cache
+            )
+    
+    results = await asyncio.gather(*(run_pack(indexes) for indexes in new_packs))
+    
+    packs = list(reused)
+    for indexes, (cv_data, _, _) in zip(new_packs, results):
+        if cv_data is not None:
+            # Failed packs are not recorded: the next recrawl retries their units
+            packs.append({"units": [hashes[index] for index in indexes], "fields": cv_data.model_dump()})
+    packs.sort(key=lambda pack: positions[pack["units"][0]])
+    partials = [pack["fields"] for pack in packs]
+    
+    if recrawl_state is not None and packs and packs != recorded:
+        await recrawl_state.set(record_key, {"packs": packs})
+    
+    errors = [error for cv_data, error, _ in results if cv_data is None]
+    info: Dict[str, Any] = {
+        "llm_model": [pack_info.get("llm_model") for _, _, pack_info in results],
+        "llm_route": [pack_info.get("llm_route") for _, _, pack_info in results],
+        "llm_mode": "sections",
+        "llm_sections": len(units),
+        "llm_sections_reused": len(units) - len(pending),
+        "llm_chunks": len(reused) + len(new_packs),
+        "llm_chunks_reused": len(reused),
+        "llm_chunks_failed": len(errors),
+        "llm_chunk_tokens": [
+            sum(estimate_tokens(units[index]) for index in indexes) for indexes in new_packs
+        ],
+        "llm_cache": [pack_info.get("llm_cache") for _, _, pack_info in results],
+        "llm_parse_ms": round(sum(pack_info.get("llm_parse_ms", 0) for _, _, pack_info in results), 2),
     }
+    
+    if not partials:
+        return None, errors[0] if errors else "No content to extract", info
+    return CVData.model_validate(merge_cv_data(partials)), None, info
 
-@app.post("/extract-cv", response_model=CVExtractionResponse)
-async def extract_cv(request: CVExtractionRequest):
+async def extract_structured(
+    markdown: str,
+    url: str,
+    options: CVExtractionOptions,
+    llm_limit: Optional[asyncio.Semaphore] = None,
+    timer: Optional[PhaseTimer] = None
+) -> tuple[Optional[CVData], Optional[str], Dict[str, Any]]:
+    """
+    Phase 2 orchestration: heuristic extractor first, LLM only when needed
+    
+    - extractor="auto": use the heuristic result when its confidence reaches
+      HEURISTIC_CONFIDENCE_THRESHOLD and its full_name confidence
+      HEURISTIC_NAME_CONFIDENCE, otherwise call the LLM
+    - extractor="heuristic" (or use_llm=False): never call the LLM
+    - extractor="llm": always call the LLM
+    
+    If the LLM fails, the heuristic result (if any) is returned alongside
+    the error so the caller still gets best-effort structured data.
+    
+    Returns:
+        (cv_data, error_message, extraction_metadata)
+    """
+    info: Dict[str, Any] = {}
+    heuristic = None
+    timer = timer or PhaseTimer()
+    
+    if options.extractor != "llm":
+        with timer.phase("heuristic"):
+            heuristic = extract_heuristic(markdown)
+        info["heuristic_confidence"] = heuristic.overall
+        info["field_confidence"] = heuristic.confidence
+        
+        name_confidence = heuristic.confidence.get("full_name", 0.0)
+        confident = (
+            heuristic.overall >= HEURISTIC_CONFIDENCE_THRESHOLD
+            and name_confidence >= HEURISTIC_NAME_CONFIDENCE
+        )
+        if confident or options.extractor == "heuristic" or not options.use_llm:
+            logger.info(f"🧩 Heuristic extraction used (confidence {heuristic.overall})")
+            info["extractor"] = "heuristic"
+            return CVData.model_validate(heuristic.data), None, info
+        logger.info(
+            f"🧩 Heuristic confidence {heuristic.overall} (name {name_confidence}) below "
+            f"{HEURISTIC_CONFIDENCE_THRESHOLD} (name {HEURISTIC_NAME_CONFIDENCE}), calling LLM"
+        )
+    
+    info["extractor"] = "llm"
+    if MARKDOWN_COMPACTION_ENABLED:
+        # Only the prompt copy: the response keeps the full crawl markdown
+        with timer.phase("compact"):
+            markdown, info["compaction"] = compact_markdown(markdown, url)
+        logger.info(
+            f"🗜️ Compacted prompt markdown: {info['compaction']['tokens_before']} → "
+            f"{info['compaction']['tokens_after']} tokens"
+        )
+    llm_mode = options.llm_mode
+    if llm_mode == "auto" and estimate_tokens(markdown) > LLM_CHUNK_TOKENS:
+        llm_mode = "sections" if INCREMENTAL_EXTRACTION_ENABLED else "chunked"
+    if llm_mode == "sections":
+        with timer.phase("llm"):
+            cv_data, llm_error, llm_info = await extract_with_llm_sections(
+                markdown, url, options.bypass_llm_cache, llm_limit
+            )
+    elif llm_mode == "chunked":
+        # Chunks wait for the LLM semaphore individually; counted as llm time
+        with timer.phase("llm"):
+            cv_data, llm_error, llm_info = await extract_with_llm_chunked(
+                markdown, url, options.bypass_llm_cache, llm_limit
+            )
+    else:
+        queued = time.perf_counter()
+        async with llm_limit or nullcontext():
+            timer.add("queue", time.perf_counter() - queued)
+            with timer.phase("llm"):
+                cv_data, llm_error, llm_info = await extract_with_llm_cached(
+                    markdown, url, options.bypass_llm_cache
+                )
+        llm_info["llm_mode"] = "truncate"
+    timer.add("parse", llm_info.get("llm_parse_ms", 0) / 1000)
+    info.update(llm_info)
+    
+    if cv_data is None and heuristic is not None and heuristic.overall > 0:
+        info["extractor"] = "heuristic"
+        return CVData.model_validate(heuristic.data), llm_error, info
+    
+    return cv_data, llm_error, info
+
+async def crawl_stage(
+    url: str,
+    bypass_cache: bool,
+    timer: PhaseTimer,
+    crawl_limit: Optional[asyncio.Semaphore] = None,
+    links_only: bool = False,
+    validators: Optional[Dict[str, str]] = None
+) -> tuple[bool, Any, str, Dict[str, Any]]:
+    """
+    Phase 1 as every pipeline runs it: domain slot, crawl slot, crawl, metrics
+    
+    Returns:
+        crawl_page's (success, markdown or links, error_message, crawl_info)
+    """
+    started = time.perf_counter()
+    # Domain slot first, so requests queued behind a slow site do not hold
+    # global crawl slots that other domains could use
+    async with politeness.slot(url) if politeness else nullcontext({}) as slot_info:
+        async with crawl_limit or nullcontext():
+            timer.add("queue", time.perf_counter() - started)
+            with timer.phase("crawl"):
+                success, content, error, crawl_info = await crawl_page(url, bypass_cache, links_only, validators)
+    crawl_info.update(slot_info)
+    
+    crawl_path = crawl_info.get("crawl_path", "fast")
+    metrics.CRAWL_SECONDS.labels(crawl_path, "success" if success else "failure").observe(
+        timer.seconds["crawl"]
+    )
+    if crawl_info.get("fast_path_rejected"):
+        metrics.FAST_PATH_REJECTIONS.labels(crawl_info["fast_path_rejected"].split(":")[0]).inc()
+    if not success:
+        metrics.CRAWL_FAILURES.labels(crawl_path, crawl_info.get("crawl_error", "error")).inc()
+    elif not links_only and not crawl_info.get("not_modified"):
+        metrics.MARKDOWN_BYTES.labels(crawl_path).observe(len(content.encode("utf-8")))
+    return success, content, error, crawl_info
+
+def recrawl_key(request: CVExtractionRequest) -> str:
+    """Crawl state identity: normalized URL, prompt version and the options that shape the response"""
+    options = request.model_dump(include={"use_llm", "extractor", "llm_mode"})
+    return content_key(normalize_url(request.url), PROMPT_VERSION, json.dumps(options, sort_keys=True))
+
+def unchanged_response(previous: Dict[str, Any], crawl_info: Dict[str, Any]) -> CVExtractionResponse:
+    """The stored response of the last crawl, with this crawl's metadata"""
+    result = CVExtractionResponse.model_validate(previous["response"])
+    result.metadata.update(crawl_info)
+    result.metadata["previous_crawled_at"] = previous["crawled_at"]
+    result.unchanged = True
+    return result
+
+async def run_pipeline(
+    request: CVExtractionRequest,
+    crawl_limit: Optional[asyncio.Semaphore] = None,
+    llm_limit: Optional[asyncio.Semaphore] = None
+) -> CVExtractionResponse:
     """
     Two-phase CV extraction: Crawl → Extract
     
     Phase 1: Always crawl for markdown (reliable)
     Phase 2: Optionally extract with LLM (best-effort)
     
+    Each phase can be gated by its own semaphore so batches bound
+    browser and LLM concurrency independently.
+    
+    Pages crawled before are refreshed with a conditional GET and their
+    markdown hash compared; an unchanged page returns the previous result
+    (unchanged=True) without Phase 2.
+    
     Returns markdown even if LLM fails!
     """
-    logger.info(f"🔍 Starting extraction: {request.url}")
+    url = request.url
+    logger.info(f"🔍 Starting extraction: {url}")
     
     warnings = []
+    timer = PhaseTimer()
+    started = time.perf_counter()
+    
+    previous = None
+    state_key = recrawl_key(request) if recrawl_state is not None else None
+    if state_key and not (request.bypass_cache or request.bypass_llm_cache):
+        previous = await recrawl_state.get(state_key)
+    validators = previous["validators"] if previous and previous.get("crawl_path") == "fast" else None
     
     # ==========================================
     # PHASE 1: Pure Crawling (Always succeeds or fails clearly)
     # ==========================================
-    success, markdown, error = await crawl_page(request.url, request.bypass_cache)
+    success, markdown, error, crawl_info = await crawl_stage(
+        url, request.bypass_cache, timer, crawl_limit, validators=validators
+    )
     
     if not success:
         logger.error(f"❌ Phase 1 failed: {error}")
+        timer.add("total", time.perf_counter() - started)
         return CVExtractionResponse(
             success=False,
-            url=request.url,
+            url=url,
             markdown="",
+            metadata={**crawl_info, **timer.as_metadata()},
             error=error
         )
     
+    if state_key:
+        # Refresh: skip extraction when the page did not change
+        if previous is None:
+            recrawl = "bypass" if request.bypass_cache or request.bypass_llm_cache else "miss"
+        elif crawl_info.get("not_modified"):
+            recrawl = "not_modified"
+        elif markdown_hash(markdown) == previous["content_hash"]:
+            recrawl = "content_hash"
+        else:
+            recrawl = "changed"
+        metrics.RECRAWL_RESULTS.labels(recrawl).inc()
+        crawl_info["recrawl"] = recrawl
+        
+        if recrawl in ("not_modified", "content_hash"):
+            logger.info(f"♻️ Unchanged since last crawl ({recrawl}), skipping Phase 2")
+            result = unchanged_response(previous, crawl_info)
+            page_validators = crawl_info.get("validators")
+            if page_validators is not None and page_validators != previous["validators"]:
+                # Same content, new ETag: remember it for the next conditional GET
+                await recrawl_state.set(state_key, {
+                    **previous, "validators": page_validators, "crawl_path": crawl_info["crawl_path"]
+                })
+            timer.add("total", time.perf_counter() - started)
+            result.metadata.update(timer.as_metadata())
+            return result
+    
     # At this point we ALWAYS have markdown
     logger.info(f"✅ Phase 1 complete: {len(markdown)} chars")
     
     # ==========================================
-    # PHASE 2: LLM Extraction (Best-effort, optional)
+    # PHASE 2: Structured Extraction (Best-effort, optional)
     # ==========================================
     structured_data = None
+    extraction_info: Dict[str, Any] = {}
     
-    if request.use_llm:
-        cv_data, llm_error = await extract_with_llm(markdown, request.url)
+    if request.use_llm or request.extractor != "llm":
+        structured_data, llm_error, extraction_info = await extract_structured(
+            markdown, url, request, llm_limit, timer
+        )
         
         if llm_error:
             warnings.append(f"LLM extraction failed: {llm_error}")
-            logger.warning(f"⚠️ Phase 2 failed (non-fatal): {llm_error}")
-        else:
-            structured_data = cv_data
-            logger.info("✅ Phase 2 complete: structured data extracted")
+            logger.warning(f"⚠️ Phase 2 LLM failed (non-fatal): {llm_error}")
+        elif extraction_info.get("llm_chunks_failed"):
+            warnings.append(
+                f"LLM extraction failed for {extraction_info['llm_chunks_failed']} "
+                f"of {extraction_info['llm_chunks']} chunks (partial result)"
+            )
+        if structured_data is not None:
+            metrics.EXTRACTIONS.labels(extraction_info.get("extractor", "unknown")).inc()
+            logger.info(f"✅ Phase 2 complete: structured data extracted ({extraction_info.get('extractor')})")
     else:
         logger.info("⏭️ Phase 2 skipped (use_llm=False)")
     
     # ==========================================
     # Return Response (markdown is ALWAYS present)
     # ==========================================
-    return CVExtractionResponse(
+    timer.add("total", time.perf_counter() - started)
+    result = CVExtractionResponse(
         success=True,
-        url=request.url,
+        url=url,
         markdown=markdown,
         structured_data=structured_data,
         metadata={
             "markdown_length": len(markdown),
             "has_structured_data": structured_data is not None,
             "llm_attempted": request.use_llm,
-            "warnings_count": len(warnings)
+            "warnings_count": len(warnings),
+            **crawl_info,
+            **extraction_info,
+            **timer.as_metadata()
         },
         warnings=warnings
     )
+    
+    if state_key and not warnings:
+        # Degraded results (LLM failures) are not pinned: the next refresh retries them.
+        # Crawl details and timings belong to this run, not to the stored result.
+        stored = result.model_dump()
+        stale = set(crawl_info) | {f"{name}_ms" for name in PHASES}
+        stored["metadata"] = {key: value for key, value in stored["metadata"].items() if key not in stale}
+        await recrawl_state.set(state_key, crawl_state(
+            crawl_info.get("validators", {}), crawl_info["crawl_path"], markdown, stored, time.time()
+        ))
+    return result
+
+async def run_links_pipeline(request: ExtractRequest) -> ExtractResponse:
+    """
+    Generic extraction for /extract: page markdown, or with only_links the
+    page's internal links (no markdown generation, no content filter)
+    """
+    timer = PhaseTimer()
+    started = time.perf_counter()
+    success, content, error, crawl_info = await crawl_stage(
+        request.url, request.bypass_cache, timer, links_only=request.only_links
+    )
+    timer.add("total", time.perf_counter() - started)
+    metadata = {**crawl_info, **timer.as_metadata()}
+    
+    if not success:
+        return ExtractResponse(success=False, url=request.url, metadata=metadata, error=error)
+    if request.only_links:
+        metadata["links_count"] = len(content)
+        return ExtractResponse(success=True, url=request.url, internal_links=content, metadata=metadata)
+    metadata["markdown_length"] = len(content)
+    return ExtractResponse(success=True, url=request.url, content=content, metadata=metadata)
+
+async def run_job_posting_pipeline(
+    request: ExtractJobRequest,
+    crawl_limit: Optional[asyncio.Semaphore] = None,
+    llm_limit: Optional[asyncio.Semaphore] = None
+) -> ExtractJobResponse:
+    """
+    Job posting extraction: same crawl and LLM path as CVs (pooled browser,
+    fast path, compaction, model routing, LLM cache) with the job prompt
+    
+    Returns the markdown even if the LLM fails.
+    """
+    url = request.url
+    timer = PhaseTimer()
+    started = time.perf_counter()
+    
+    success, markdown, error, crawl_info = await crawl_stage(url, request.bypass_cache, timer, crawl_limit)
+    if not success:
+        timer.add("total", time.perf_counter() - started)
+        return ExtractJobResponse(
+            url=url,
+            success=False,
+            error=error,
+            metadata={**crawl_info, **timer.as_metadata()}
+        )
+    
+    job_data = None
+    warnings = []
+    info: Dict[str, Any] = {}
+    if request.use_llm:
+        prompt_markdown = markdown
+        if MARKDOWN_COMPACTION_ENABLED:
+            with timer.phase("compact"):
+                prompt_markdown, info["compaction"] = compact_markdown(markdown, url)
+        async with llm_limit or nullcontext():
+            with timer.phase("llm"):
+                job_data, llm_error, llm_info = await extract_with_llm_cached(
+                    prompt_markdown, url, request.bypass_llm_cache, JOB_TASK
+                )
+        timer.add("parse", llm_info.get("llm_parse_ms", 0) / 1000)
+        info.update(llm_info)
+        if llm_error:
+            warnings.append(f"LLM extraction failed: {llm_error}")
+            logger.warning(f"⚠️ Job posting LLM extraction failed (non-fatal): {llm_error}")
+    
+    timer.add("total", time.perf_counter() - started)
+    return ExtractJobResponse(
+        url=url,
+        success=True,
+        job_data=job_data,
+        raw_content=markdown,
+        metadata={
+            "markdown_length": len(markdown),
+            "has_structured_data": job_data is not None,
+            "llm_attempted": request.use_llm,
+            **crawl_info,
+            **info,
+            **timer.as_metadata()
+        },
+        warnings=warnings
+    )
+
+def coalesce_key(request: BaseModel) -> str:
+    """Identity of a request: request type, normalized URL and every option"""
+    options = request.model_dump(exclude={"url"})
+    return f"{type(request).__name__}|{normalize_url(request.url)}|{json.dumps(options, sort_keys=True)}"
+
+async def run_coalesced(request: BaseModel, pipeline: Callable[[], Any]) -> Any:
+    """
+    Run `pipeline` once per identical in-flight request
+    
+    Callers arriving while the same URL/options are already being processed
+    await that result instead of opening another page and LLM call.
+    """
+    async def tracked():
+        with metrics.PIPELINES_IN_FLIGHT.track_inprogress():
+            return await pipeline()
+    
+    result, shared = await inflight.do(coalesce_key(request), tracked)
+    # Each caller gets its own copy (batch code annotates metadata per result)
+    result = result.model_copy(deep=True)
+    result.url = request.url
+    result.metadata["coalesced"] = shared
+    return result
+
+async def run_extraction(
+    request: CVExtractionRequest,
+    crawl_limit: Optional[asyncio.Semaphore] = None,
+    llm_limit: Optional[asyncio.Semaphore] = None
+) -> CVExtractionResponse:
+    """Entry point for every CV extraction: coalesces identical in-flight requests"""
+    return await run_coalesced(request, lambda: run_pipeline(request, crawl_limit, llm_limit))
+
+async def run_job(job: Job) -> Dict[str, Any]:
+    """Job queue runner: one /extract-cv request, result stored as plain JSON"""
+    result = await run_extraction(CVExtractionRequest.model_validate(job.request))
+    # Time spent waiting for a job worker counts as queueing too
+    waited_ms = (job.started_at - job.created_at) * 1000
+    result.metadata["queue_ms"] = round(result.metadata.get("queue_ms", 0) + waited_ms, 1)
+    return result.model_dump()
+
+async def stream_extractions(
+    request: CVBatchExtractionRequest,
+    crawl_concurrency: int,
+    llm_concurrency: int,
+    buffer_size: int = STREAM_BUFFER_SIZE
+) -> AsyncIterator[CVExtractionResponse]:
+    """
+    Run a batch and yield each result as soon as it finishes (completion order)
+    
+    Workers pull the next URL only after handing off their previous result
+    to a bounded queue, so a slow consumer pauses new crawls instead of
+    piling up finished results in memory.
+    """
+    crawl_limit = asyncio.Semaphore(crawl_concurrency)
+    llm_limit = asyncio.Semaphore(llm_concurrency)
+    results: asyncio.Queue = asyncio.Queue(maxsize=max(1, buffer_size))
+    # Round-robin across domains so one site cannot occupy every worker
+    pending = iter(interleave_by_domain(enumerate(request.urls), key=lambda item: item[1]))
+    done = object()
+    
+    async def worker():
+        for index, url in pending:
+            try:
+                result = await run_extraction(request.for_url(url), crawl_limit, llm_limit)
+            except Exception as e:
+                logger.error(f"Extraction error for {url}: {e}", exc_info=True)
+                result = CVExtractionResponse(success=False, url=url, error=f"Extraction error: {str(e)}")
+            result.metadata["batch_index"] = index
+            await results.put(result)
+        await results.put(done)
+    
+    worker_count = min(len(request.urls), crawl_concurrency + llm_concurrency)
+    workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
+    try:
+        finished = 0
+        while finished < worker_count:
+            item = await results.get()
+            if item is done:
+                finished += 1
+            else:
+                yield item
+    finally:
+        # Client went away or batch finished: stop the workers. Cancelling a
+        # worker cancels its pipeline too, unless another request shares it
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+# ==========================================
+# API Endpoints
+# ==========================================
+
+@app.get("/")
+async def root():
+    return {
+        "service": "ResuMate CV Scraper",
+        "version": "4.0.0",
+        "architecture": "Crawl-then-Extract (2-phase)",
+        "status": "running"
+    }
+
+@app.get("/health")
+async def health():
+    return {
+        "status": "healthy",
+        "service": "cv-scraper",
+        "ready": bool(warmup and warmup.ready.is_set()),
+        "worker": {"pid": os.getpid(), "workers": WEB_CONCURRENCY},
+        "llm_configured": bool(os.getenv("OPENROUTER_API_KEY")),
+        "browser_pool": browser_pool.stats() if browser_pool else None,
+        "markdown_pool": markdown_pool.stats() if markdown_pool else None,
+        "coalescing": inflight.stats(),
+        "politeness": politeness.stats() if politeness else None,
+        "jobs": job_queue.stats() if job_queue else None
+    }
+
+@app.get("/ready")
+async def ready(response: Response):
+    """
+    Readiness: 200 once the warm-up finished and a warm browser crawl is
+    possible, 503 before (or if the browser could not be started)
+    """
+    if warmup is None or not warmup.ready.is_set():
+        response.status_code = 503
+    return {
+        "import_ms": IMPORT_MS,
+        **(warmup.as_dict() if warmup else {"ready": False, "warming_up": False})
+    }
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Counters of the worker process that serves the request (see /metrics for the container)"""
+    return {
+        "worker_pid": os.getpid(),
+        "llm": llm_cache.stats() if llm_cache else None,
+        "recrawl": recrawl_state.stats() if recrawl_state else None
+    }
+
+@app.delete("/cache/llm")
+async def invalidate_llm_cache(key: Optional[str] = Query(None, description="Single cache key to drop (default: all)")):
+    """Invalidate cached LLM extraction results"""
+    if llm_cache is None:
+        return {"invalidated": 0, "enabled": False}
+    removed = await llm_cache.invalidate(key)
+    logger.info(f"🧹 LLM cache invalidated: {removed} entries")
+    return {"invalidated": removed, "enabled": True}
+
+@app.post("/extract-cv", response_model=CVExtractionResponse)
+async def extract_cv(
+    request: CVExtractionRequest,
+    response: Response,
+    profile: bool = Query(False, description="Run under the sampling profiler (requires PROFILING_ENABLED)"),
+    x_profile: Optional[str] = Header(None)
+):
+    """
+    Two-phase CV extraction: Crawl → Extract
+    
+    Returns markdown even if LLM fails!
+    Phase timings are returned in metadata and in the Server-Timing header.
+    """
+    if profile or (x_profile or "").lower() in ("1", "true"):
+        if not PROFILING_ENABLED:
+            raise HTTPException(status_code=403, detail="Profiling is disabled (set PROFILING_ENABLED=true)")
+        async with profile_request(PROFILE_DIR, request.url, max_reports=PROFILE_MAX_REPORTS) as profile_info:
+            # Not coalesced: the profile must show this request's own work
+            result = await run_pipeline(request)
+        result.metadata.update(profile_info)
+    else:
+        result = await run_extraction(request)
+    
+    response.headers["Server-Timing"] = server_timing(result.metadata)
+    return result
+
+@app.get("/debug/profiles/{name}")
+async def get_profile(name: str):
+    """Download a saved profile report (HTML)"""
+    path = profile_path(PROFILE_DIR, name) if PROFILING_ENABLED else None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/html")
+
+@app.post("/extract-cv/batch", response_model=CVBatchExtractionResponse)
+async def extract_cv_batch(request: CVBatchExtractionRequest):
+    """
+    Batch CV extraction with bounded concurrency
+    
+    Crawling and LLM extraction are separate stages with their own limits,
+    so slow LLM calls never hold a browser and vice versa. Results keep
+    the order of the submitted URLs.
+    """
+    crawl_concurrency = request.crawl_concurrency or BATCH_CRAWL_CONCURRENCY
+    llm_concurrency = request.llm_concurrency or BATCH_LLM_CONCURRENCY
+    crawl_limit = asyncio.Semaphore(crawl_concurrency)
+    llm_limit = asyncio.Semaphore(llm_concurrency)
+    
+    logger.info(
+        f"📦 Batch extraction: {len(request.urls)} URLs "
+        f"(crawl={crawl_concurrency}, llm={llm_concurrency})"
+    )
+    started = time.perf_counter()
+    
+    async def extract(url: str) -> CVExtractionResponse:
+        # One failing URL must not turn the whole batch into a 500
+        try:
+            return await run_extraction(request.for_url(url), crawl_limit, llm_limit)
+        except Exception as e:
+            logger.error(f"Extraction error for {url}: {e}", exc_info=True)
+            return CVExtractionResponse(success=False, url=url, error=f"Extraction error: {str(e)}")
+    
+    results = await asyncio.gather(*(extract(url) for url in request.urls))
+    
+    succeeded = sum(1 for result in results if result.success)
+    return CVBatchExtractionResponse(
+        results=results,
+        metadata={
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "with_structured_data": sum(1 for result in results if result.structured_data),
+            "crawl_concurrency": crawl_concurrency,
+            "llm_concurrency": llm_concurrency,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000)
+        }
+    )
+
+@app.post("/extract-cv/batch/stream")
+async def extract_cv_batch_stream(
+    request: CVBatchExtractionRequest,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson lines or SSE events")
+):
+    """
+    Streaming batch extraction
+    
+    Sends each URL's CVExtractionResponse as soon as it completes, either as
+    one NDJSON line or one SSE `result` event (followed by a `done` event).
+    `metadata.batch_index` maps each result back to its position in `urls`.
+    """
+    crawl_concurrency = request.crawl_concurrency or BATCH_CRAWL_CONCURRENCY
+    llm_concurrency = request.llm_concurrency or BATCH_LLM_CONCURRENCY
+    
+    logger.info(
+        f"📡 Streaming batch extraction: {len(request.urls)} URLs "
+        f"(crawl={crawl_concurrency}, llm={llm_concurrency}, format={format})"
+    )
+    
+    async def ndjson_lines():
+        async for result in stream_extractions(request, crawl_concurrency, llm_concurrency):
+            yield result.model_dump_json() + "\n"
+    
+    async def sse_events():
+        started = time.perf_counter()
+        total = succeeded = 0
+        async for result in stream_extractions(request, crawl_concurrency, llm_concurrency):
+            total += 1
+            succeeded += int(result.success)
+            yield f"event: result\ndata: {result.model_dump_json()}\n\n"
+        summary = {
+            "total": total,
+            "succeeded": succeeded,
+            "failed": total - succeeded,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000)
+        }
+        yield f"event: done\ndata: {json.dumps(summary)}\n\n"
+    
+    if format == "sse":
+        return StreamingResponse(
+            sse_events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}
+    )
+
+@app.post("/extract", response_model=ExtractResponse)
+async def extract(request: ExtractRequest, response: Response):
+    """
+    Generic page extraction
+    
+    - Default: clean markdown in `content`
+    - only_links=true: normalized, deduplicated internal links in
+      `internal_links` (listing discovery); served from a plain GET when
+      the page has anchors in its HTML, the browser only for JS-rendered listings
+    """
+    result = await run_coalesced(request, lambda: run_links_pipeline(request))
+    response.headers["Server-Timing"] = server_timing(result.metadata)
+    return result
+
+@app.post("/extract-job", response_model=ExtractJobResponse)
+async def extract_job(request: ExtractJobRequest, response: Response):
+    """
+    Job posting extraction: Crawl → Extract (JobData)
+    
+    Returns raw_content (markdown) even if the LLM fails!
+    """
+    result = await run_coalesced(request, lambda: run_job_posting_pipeline(request))
+    response.headers["Server-Timing"] = server_timing(result.metadata)
+    return result
+
+@app.post("/extract-job/batch", response_model=ExtractJobBatchResponse)
+async def extract_job_batch(request: ExtractJobBatchRequest):
+    """
+    Batch job posting extraction with bounded concurrency
+    
+    Same stages and limits as /extract-cv/batch, with the job prompt.
+    Results keep the order of the submitted URLs.
+    """
+    crawl_concurrency = request.crawl_concurrency or BATCH_CRAWL_CONCURRENCY
+    llm_concurrency = request.llm_concurrency or BATCH_LLM_CONCURRENCY
+    crawl_limit = asyncio.Semaphore(crawl_concurrency)
+    llm_limit = asyncio.Semaphore(llm_concurrency)
+    
+    logger.info(
+        f"📦 Job batch extraction: {len(request.urls)} URLs "
+        f"(crawl={crawl_concurrency}, llm={llm_concurrency})"
+    )
+    started = time.perf_counter()
+    
+    async def extract(url: str) -> ExtractJobResponse:
+        job_request = request.for_url(url)
+        # One failing URL must not turn the whole batch into a 500
+        try:
+            return await run_coalesced(
+                job_request, lambda: run_job_posting_pipeline(job_request, crawl_limit, llm_limit)
+            )
+        except Exception as e:
+            logger.error(f"Job extraction error for {url}: {e}", exc_info=True)
+            return ExtractJobResponse(success=False, url=url, error=f"Extraction error: {str(e)}")
+    
+    results = await asyncio.gather(*(extract(url) for url in request.urls))
+    
+    succeeded = sum(1 for result in results if result.success)
+    return ExtractJobBatchResponse(
+        results=results,
+        metadata={
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "with_structured_data": sum(1 for result in results if result.job_data),
+            "crawl_concurrency": crawl_concurrency,
+            "llm_concurrency": llm_concurrency,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000)
+        }
+    )
+
+@app.post("/jobs", response_model=JobStatusResponse, status_code=202)
+async def submit_job(request: CVExtractionRequest):
+    """
+    Asynchronous CV extraction
+    
+    Returns a job id immediately; poll GET /jobs/{job_id} (optionally with
+    ?wait=N to long-poll) for the CVExtractionResponse.
+    """
+    try:
+        job = await job_queue.submit(request.model_dump())
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    logger.info(f"📋 Job {job.id} queued: {request.url}")
+    return JobStatusResponse.from_job(job)
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to wait for the job to finish (long polling)")
+):
+    """Job status, plus the result once it has finished"""
+    job = await job_queue.wait(job_id, min(wait, JOB_MAX_WAIT))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found (unknown or expired)")
+    return JobStatusResponse.from_job(job)
 
 # ==========================================
 # Run Server
@@ -0,0 +1,162 @@
+"""
+Markdown Pool - HTML → markdown conversion in worker processes
+Pruning and markdown generation are CPU-bound Python: a typical profile
+page takes tens of milliseconds, a 500 KB page about two seconds. Run inline,
+that time blocks the event loop for every other request (and /health).
+Pages of at least `min_chars` are converted in a process pool sized to the
+available cores; smaller pages stay inline, where the conversion costs less
+than the hand-off. Only the URL and the HTML string go to a worker and only
+the markdown string comes back; each worker imports Crawl4AI and builds its
+run configuration once, at startup.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from content import html_to_markdown
+
+logger = logging.getLogger(__name__)
+
+# forkserver children start from a clean interpreter (no copied event loop
+# or browser threads); Windows only has spawn
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+WARMUP_HTML = "<html><body><main><h1>Warm-up</h1><p>Markdown worker warm-up.</p></main></body></html>"
+
+
+def available_cores() -> int:
+    """CPUs this process may run on (respects taskset / container cpusets)"""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def _init_worker() -> None:
+    # Ctrl+C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Pay the Crawl4AI import and config build before the first real page
+    html_to_markdown("https://warmup.invalid/", WARMUP_HTML)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+class MarkdownPool:
+    """
+    Process pool for html_to_markdown.
+
+    Before start() (or after close()) every page is converted inline. A
+    worker that dies (e.g. killed for memory on a huge page) breaks the
+    executor: it is replaced and that page is converted in a thread instead.
+    If worker processes cannot be started at all (start() or a later
+    submit fails), the pool is shut down for good and pages of at least
+    `min_chars` are converted in a thread.
+    """
+
+    def __init__(self, workers: int = 0, min_chars: int = 2000):
+        self.workers = workers if workers > 0 else available_cores()
+        self.min_chars = max(0, min_chars)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._error: Optional[str] = None
+        self._counters = {"pooled": 0, "inline": 0, "threaded": 0, "restarts": 0}
+
+    async def start(self) -> None:
+        """Start every worker and wait until each has warmed up"""
+        executor = self._create_executor()
+        loop = asyncio.get_running_loop()
+        try:
+            # Workers are spawned on demand: one call per worker starts them all
+            pids = await asyncio.gather(
+                *(loop.run_in_executor(executor, _worker_pid) for _ in range(self.workers))
+            )
+        except (RuntimeError, OSError) as e:
+            # BrokenProcessPool included; e.g. forkserver refusing to start from an
+            # unguarded __main__, or the process limit reached
+            self._disable(executor, e)
+            return
+        self._executor = executor
+        self._error = None
+        logger.info(
+            f"🧮 Markdown pool ready: {len(set(pids))}/{self.workers} workers ({START_METHOD})"
+        )
+
+    async def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+            logger.info("🧮 Markdown pool closed")
+
+    def pooled(self, html: str) -> bool:
+        """Whether convert() hands this page to a worker process"""
+        return self._executor is not None and len(html) >= self.min_chars
+
+    async def convert(self, url: str, html: str) -> str:
+        """Markdown for `html` (same rules as content.html_to_markdown)"""
+        if not self.pooled(html):
+            if self._error is not None and len(html) >= self.min_chars:
+                # No worker processes: keep big pages off the event loop at least
+                self._counters["threaded"] += 1
+                return await asyncio.to_thread(html_to_markdown, url, html)
+            self._counters["inline"] += 1
+            return html_to_markdown(url, html)
+
+        executor = self._executor
+        loop = asyncio.get_running_loop()
+        try:
+            # Submitting starts missing workers: failures here are the pool's, not the page's
+            pending = loop.run_in_executor(executor, html_to_markdown, url, html)
+        except (RuntimeError, OSError) as e:
+            self._disable(executor, e)
+            self._counters["threaded"] += 1
+            return await asyncio.to_thread(html_to_markdown, url, html)
+        try:
+            markdown = await pending
+        except BrokenProcessPool:
+            logger.error("Markdown worker died, restarting the pool")
+            self._restart(executor)
+            return await asyncio.to_thread(html_to_markdown, url, html)
+        self._counters["pooled"] += 1
+        return markdown
+
+    def stats(self) -> Dict[str, Any]:
+        if self._executor is not None:
+            mode = "process"
+        else:
+            mode = "thread" if self._error is not None else "inline"
+        return {
+            "mode": mode,
+            "workers": self.workers,
+            "min_chars": self.min_chars,
+            **self._counters,
+            **({"error": self._error} if self._error is not None else {}),
+        }
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(START_METHOD),
+            initializer=_init_worker,
+        )
+
+    def _disable(self, executor: ProcessPoolExecutor, error: BaseException) -> None:
+        """Give up on worker processes (conversions fall back to threads)"""
+        logger.error(f"Markdown pool unavailable, converting in threads: {error}")
+        executor.shutdown(wait=False, cancel_futures=True)
+        if self._executor is executor:
+            self._executor = None
+        self._error = f"{type(error).__name__}: {error}"
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        # Concurrent failures of the same executor restart it only once
+        if self._executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._create_executor()
+        self._counters["restarts"] += 1
@@ -0,0 +1,73 @@
+"""
+Markdown Sections - split crawled markdown on its heading structure
+Shared by the heuristic extractor, chunked LLM extraction and incremental
+re-extraction, which all reason about a CV section by section.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+ATX_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+# A line that is only bold text (common for headings in converted HTML)
+BOLD_HEADING_RE = re.compile(r'^\*\*([^*]{2,60})\*\*:?\s*$')
+
+# Heading keywords (English/Spanish) that identify standard CV sections
+SECTION_KEYWORDS = {
+    "summary": ("about", "summary", "profile", "objective", "resumen", "perfil", "sobre mí", "sobre mi", "acerca de"),
+    "experience": ("experience", "employment", "work history", "career", "positions", "experiencia", "trayectoria", "empleo"),
+    "education": ("education", "academic", "studies", "qualifications", "certification", "educación", "educacion", "formación", "formacion", "estudios", "certificacion"),
+    "skills": ("skills", "technologies", "tech stack", "stack", "tools", "competencies", "expertise", "habilidades", "tecnologías", "tecnologias", "conocimientos", "competencias"),
+    "contact": ("contact", "contacto", "get in touch"),
+}
+
+
+@dataclass
+class Section:
+    """One heading and the markdown under it (level 0 = text before any heading)"""
+    title: str
+    level: int
+    body: str
+
+    @property
+    def text(self) -> str:
+        if not self.title:
+            return self.body
+        return f"{'#' * max(self.level, 1)} {self.title}\n{self.body}"
+
+    @property
+    def words(self) -> int:
+        return len(self.body.split())
+
+
+def split_sections(markdown: str) -> List[Section]:
+    """Split markdown into sections at every ATX heading or bold-only line"""
+    sections: List[Section] = []
+    title, level, lines = "", 0, []
+
+    for line in markdown.splitlines():
+        heading = ATX_HEADING_RE.match(line)
+        bold = None if heading else BOLD_HEADING_RE.match(line.strip())
+        if heading or bold:
+            if title or any(l.strip() for l in lines):
+                sections.append(Section(title, level, "\n".join(lines).strip("\n")))
+            if heading:
+                title, level = heading.group(2).strip(), len(heading.group(1))
+            else:
+                title, level = bold.group(1).strip(), 3
+            lines = []
+        else:
+            lines.append(line)
+
+    if title or any(l.strip() for l in lines):
+        sections.append(Section(title, level, "\n".join(lines).strip("\n")))
+    return sections
+
+
+def classify_section(section: Section) -> Optional[str]:
+    """Map a section to summary/experience/education/skills/contact by its heading"""
+    title = section.title.lower()
+    for kind, keywords in SECTION_KEYWORDS.items():
+        if any(keyword in title for keyword in keywords):
+            return kind
+    return None
@@ -0,0 +1,125 @@
+"""
+Metrics - Prometheus instruments for the scraper
+Latency histograms per phase (crawl, LLM, parsing, whole request) and
+counters for failures and cache results, exposed at GET /metrics.
+Labels stay low-cardinality: crawl path, outcome, reason codes and route
+templates, never URLs.
+With several worker processes (PROMETHEUS_MULTIPROC_DIR set, see run.py)
+every worker writes its values to that directory and /metrics aggregates
+all of them, whichever worker serves the scrape.
+"""
+
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+# Seconds: fast paths are sub-second, browser renders and LLM calls take many
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 45, 60, 90)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+SIZE_BUCKETS = (500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "scraper_http_request_seconds",
+    "End-to-end HTTP request time (until the response starts for streams)",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "scraper_http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+PIPELINES_IN_FLIGHT = Gauge(
+    "scraper_pipelines_in_flight",
+    "Crawl + extract pipelines currently running (after coalescing)",
+    multiprocess_mode="livesum",
+)
+
+CRAWL_SECONDS = Histogram(
+    "scraper_crawl_seconds",
+    "Time to obtain markdown for a page",
+    ["path", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+CRAWL_FAILURES = Counter(
+    "scraper_crawl_failures_total",
+    "Crawls that produced no markdown",
+    ["path", "reason"],
+)
+FAST_PATH_REJECTIONS = Counter(
+    "scraper_fast_path_rejections_total",
+    "Pages the browserless fast path handed to the browser",
+    ["reason"],
+)
+MARKDOWN_BYTES = Histogram(
+    "scraper_markdown_bytes",
+    "Size of the markdown produced per page",
+    ["path"],
+    buckets=SIZE_BUCKETS,
+)
+MARKDOWN_SECONDS = Histogram(
+    "scraper_markdown_seconds",
+    "HTML to markdown conversion time (inline or in a worker process)",
+    ["mode"],
+    buckets=PARSE_BUCKETS + (2.5, 5),
+)
+
+LLM_SECONDS = Histogram(
+    "scraper_llm_seconds",
+    "OpenRouter extraction call time",
+    ["route", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_FIRST_FIELD_SECONDS = Histogram(
+    "scraper_llm_first_field_seconds",
+    "Time until the first structured field arrived on a streamed completion",
+    buckets=LATENCY_BUCKETS,
+)
+LLM_PARSE_SECONDS = Histogram(
+    "scraper_llm_parse_seconds",
+    "Time spent parsing and validating LLM output",
+    buckets=PARSE_BUCKETS,
+)
+LLM_FAILURES = Counter(
+    "scraper_llm_failures_total",
+    "LLM extractions that returned no data",
+    ["reason"],
+)
+LLM_ESCALATIONS = Counter(
+    "scraper_llm_escalations_total",
+    "Routed LLM calls that failed and were retried on the catch-all route",
+    ["route"],
+)
+LLM_CACHE_RESULTS = Counter(
+    "scraper_llm_cache_total",
+    "LLM result cache lookups",
+    ["result"],
+)
+RECRAWL_RESULTS = Counter(
+    "scraper_recrawl_total",
+    "Change detection on refreshed pages",
+    ["result"],
+)
+EXTRACTIONS = Counter(
+    "scraper_extractions_total",
+    "Structured extractions by the extractor that produced them",
+    ["extractor"],
+)
+
+
+def render() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, plus its content type"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def process_exit() -> None:
+    """Drop this worker's live gauges from the aggregate (multiprocess mode)"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,105 @@
+"""
+Model routing - pick the LLM per page from its size and complexity
+A 300-character bio does not need the same model (or a 2000-token output
+budget) as a 20-page CV. Routes are tried in order and the first one whose
+limits fit the prompt wins; the last route is the catch-all.
+
+Routes come from LLM_ROUTES (JSON list), e.g.:
+
+    [{"name": "small", "model": "google/gemini-2.5-flash-lite",
+      "max_input_tokens": 1500, "max_complexity": 0.5, "max_tokens": 1000},
+     {"name": "default", "model": "google/gemini-2.5-flash", "max_tokens": 2000}]
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from chunking import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+HEADING_RE = re.compile(r"^#{1,6}\s+\S", re.M)
+LIST_ITEM_RE = re.compile(r"^\s*(?:[*+-]|\d+\.)\s+\S", re.M)
+TABLE_ROW_RE = re.compile(r"^\s*\|.*\|\s*$", re.M)
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    name: str
+    model: str
+    # Output budget sent as max_tokens
+    max_tokens: int = 2000
+    # Limits for taking this route (None = no limit)
+    max_input_tokens: Optional[int] = None
+    max_complexity: Optional[float] = None
+
+    def accepts(self, input_tokens: int, complexity: float) -> bool:
+        if self.max_input_tokens is not None and input_tokens > self.max_input_tokens:
+            return False
+        if self.max_complexity is not None and complexity > self.max_complexity:
+            return False
+        return True
+
+
+def complexity(markdown: str) -> float:
+    """
+    0-1 structural complexity: many sections, entries and tables mean many
+    fields to fill (and more ways for a small model to mix them up)
+    """
+    headings = len(HEADING_RE.findall(markdown))
+    list_items = len(LIST_ITEM_RE.findall(markdown))
+    table_rows = len(TABLE_ROW_RE.findall(markdown))
+    score = (
+        0.45 * min(headings / 12, 1.0)
+        + 0.4 * min(list_items / 40, 1.0)
+        + 0.15 * min(table_rows / 10, 1.0)
+    )
+    return round(score, 3)
+
+
+def default_routes(default_model: str) -> List[ModelRoute]:
+    return [
+        ModelRoute(
+            name="small",
+            model="google/gemini-2.5-flash-lite",
+            max_tokens=1000,
+            max_input_tokens=1500,
+            max_complexity=0.5,
+        ),
+        ModelRoute(name="default", model=default_model, max_tokens=2000),
+    ]
+
+
+def parse_routes(raw: Optional[str], default_model: str) -> List[ModelRoute]:
+    """
+    Routing table from LLM_ROUTES; the built-in table when unset or invalid
+    """
+    if not raw or not raw.strip():
+        return default_routes(default_model)
+    try:
+        routes = [ModelRoute(**entry) for entry in json.loads(raw)]
+    except (TypeError, ValueError) as e:
+        logger.error(f"Invalid LLM_ROUTES ({e}), using the built-in routing table")
+        return default_routes(default_model)
+    if not routes:
+        return default_routes(default_model)
+    return routes
+
+
+def select_route(routes: List[ModelRoute], markdown: str) -> Tuple[ModelRoute, Dict[str, Any]]:
+    """
+    First route that accepts the prompt (the last route if none does)
+
+    Returns:
+        (route, signals) - signals hold the estimated input tokens and complexity
+    """
+    input_tokens = estimate_tokens(markdown)
+    score = complexity(markdown)
+    signals = {"llm_input_tokens": input_tokens, "llm_complexity": score}
+    for route in routes:
+        if route.accepts(input_tokens, score):
+            return route, signals
+    return routes[-1], signals
@@ -0,0 +1,39 @@
+"""
+Multi-worker - several uvicorn worker processes in one container
+A single process keeps all Python work (routing, parsing, heuristics,
+streaming) on one core. With WEB_CONCURRENCY > 1, run.py starts that many
+workers: budgets configured per container (browsers, markdown workers,
+per-domain politeness) are split between them, caches and jobs live in
+shared SQLite files (WAL), and Prometheus metrics are aggregated through a
+multiprocess directory.
+"""
+
+import glob
+import os
+import tempfile
+from typing import Optional
+
+
+def worker_count() -> int:
+    """Worker processes in this container (WEB_CONCURRENCY, as uvicorn reads it)"""
+    return max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+
+
+def worker_share(total: int, workers: int) -> int:
+    """One worker's part of a per-container budget (at least 1)"""
+    return max(1, total // max(1, workers))
+
+
+def prepare_metrics_dir(path: Optional[str] = None) -> str:
+    """
+    Directory for prometheus_client multiprocess mode
+
+    Emptied first so counters of a previous run are not added to this one.
+    Must be in the environment (PROMETHEUS_MULTIPROC_DIR) before the workers
+    import prometheus_client.
+    """
+    path = path or tempfile.mkdtemp(prefix="resumate-metrics-")
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    return path
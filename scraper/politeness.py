@@ -0,0 +1,254 @@
+"""
+Politeness - per-domain crawl scheduling
+Every crawl takes a slot from its registrable domain before touching the
+network: a token bucket caps the request rate, a semaphore caps parallel
+pages, robots.txt Crawl-delay can slow a site down further, and a 429 answer
+pauses the domain. Different domains never wait on each other.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from url_utils import registrable_domain
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def interleave_by_domain(items: Iterable[T], key: Callable[[T], str]) -> List[T]:
+    """Round-robin items across domains so one site cannot fill every worker"""
+    queues: "OrderedDict[Optional[str], deque]" = OrderedDict()
+    for item in items:
+        queues.setdefault(registrable_domain(key(item)), deque()).append(item)
+    ordered: List[T] = []
+    while queues:
+        for domain in list(queues):
+            ordered.append(queues[domain].popleft())
+            if not queues[domain]:
+                del queues[domain]
+    return ordered
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `burst` saved"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns seconds waited"""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                delay = max(self.paused_until - now, 0.0)
+                if not delay and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                if not delay:
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class _DomainState:
+    def __init__(self, rate: float, burst: int, max_concurrency: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.crawl_delay: Optional[float] = None
+        self.robots_checked = False
+        self.robots_lock = asyncio.Lock()
+
+
+class DomainScheduler:
+    """
+    Per-domain rate limiting for crawls.
+
+    - `rate`/`burst`: token bucket per registrable domain (requests/second)
+    - `max_concurrency`: pages open at once against one domain
+    - `respect_crawl_delay`: honour robots.txt `Crawl-delay` (fetched once per host)
+    - `backoff()`: pause a domain after a 429, honouring Retry-After
+    - `processes`: worker processes crawling with the same budget; each
+      takes its share of the rate (Crawl-delay included), burst and
+      concurrency. The shares are rounded down but never below one, so
+      with more processes than burst or concurrency the per-site totals
+      grow to one per process (container_limits() reports the real ones)
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 2,
+        max_concurrency: int = 2,
+        respect_crawl_delay: bool = True,
+        backoff_seconds: float = 30.0,
+        client_factory: Optional[Callable[[], Optional[httpx.AsyncClient]]] = None,
+        max_domains: int = 4096,
+        processes: int = 1,
+    ):
+        self.processes = max(1, processes)
+        self.rate = rate / self.processes
+        self.burst = max(1, burst // self.processes)
+        self.max_concurrency = max(1, max_concurrency // self.processes)
+        limits = self.container_limits()
+        exceeded = [
+            f"{name} {configured} -> {limits[name]}"
+            for name, configured in (("burst", burst), ("max_concurrency", max_concurrency))
+            if limits[name] > configured
+        ]
+        if exceeded:
+            logger.warning(
+                f"⚠️ Per-domain limits exceed the configured budget with {self.processes} "
+                f"processes (each keeps at least 1): {', '.join(exceeded)}"
+            )
+        self.respect_crawl_delay = respect_crawl_delay
+        self.backoff_seconds = backoff_seconds
+        self.client_factory = client_factory
+        self.max_domains = max_domains
+
+        self._domains: "OrderedDict[str, _DomainState]" = OrderedDict()
+        self._counters: Dict[str, float] = defaultdict(float)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[Dict[str, Any]]:
+        """Hold a crawl slot for the URL's domain; yields wait timings"""
+        domain = registrable_domain(url)
+        if domain is None:
+            yield {}
+            return
+
+        state = self._state(domain)
+        started = time.monotonic()
+        state.waiting += 1
+        try:
+            if self.respect_crawl_delay and not state.robots_checked:
+                await self._load_crawl_delay(url, state)
+            await state.slots.acquire()
+        finally:
+            state.waiting -= 1
+        try:
+            await state.bucket.acquire()
+        except BaseException:
+            state.slots.release()
+            raise
+
+        waited = time.monotonic() - started
+        self._counters["scheduled"] += 1
+        self._counters["wait_seconds"] += waited
+        state.active += 1
+        try:
+            yield {"politeness_wait_ms": round(waited * 1000), "domain": domain}
+        finally:
+            state.active -= 1
+            state.slots.release()
+
+    def backoff(self, url: str, retry_after: Optional[str] = None) -> None:
+        """Pause a domain after it answered 429 Too Many Requests"""
+        domain = registrable_domain(url)
+        if domain is None:
+            return
+        seconds = self.backoff_seconds
+        if retry_after and retry_after.strip().isdigit():
+            seconds = min(float(retry_after), 10 * self.backoff_seconds)
+        self._state(domain).bucket.pause(seconds)
+        self._counters["backoffs"] += 1
+        logger.warning(f"🐢 {domain} asked us to slow down, pausing {seconds:.0f}s")
+
+    def container_limits(self) -> Dict[str, float]:
+        """Per-domain limits summed over every process (what a site actually sees)"""
+        return {
+            "rate": self.rate * self.processes,
+            "burst": self.burst * self.processes,
+            "max_concurrency": self.max_concurrency * self.processes,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        busiest: List[Tuple[str, int, int]] = sorted(
+            ((d, s.active, s.waiting) for d, s in self._domains.items() if s.active or s.waiting),
+            key=lambda item: -(item[1] + item[2]),
+        )[:10]
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_concurrency": self.max_concurrency,
+            "processes": self.processes,
+            "container": self.container_limits(),
+            "domains": len(self._domains),
+            "scheduled": int(self._counters["scheduled"]),
+            "backoffs": int(self._counters["backoffs"]),
+            "avg_wait_ms": round(
+                self._counters["wait_seconds"] * 1000 / self._counters["scheduled"]
+            ) if self._counters["scheduled"] else 0,
+            "busy": [{"domain": d, "active": a, "waiting": w} for d, a, w in busiest],
+        }
+
+    # ------------------------------------------
+    # Internals
+    # ------------------------------------------
+
+    def _state(self, domain: str) -> _DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            state = _DomainState(self.rate, self.burst, self.max_concurrency)
+            self._domains[domain] = state
+            self._prune()
+        self._domains.move_to_end(domain)
+        return state
+
+    def _prune(self) -> None:
+        """Forget the least recently used idle domains"""
+        for domain in list(self._domains):
+            if len(self._domains) <= self.max_domains:
+                break
+            state = self._domains[domain]
+            if not state.active and not state.waiting:
+                del self._domains[domain]
+
+    async def _load_crawl_delay(self, url: str, state: _DomainState) -> None:
+        async with state.robots_lock:
+            if state.robots_checked:
+                return
+            state.robots_checked = True
+            client = self.client_factory() if self.client_factory else None
+            if client is None:
+                return
+            parts = urlsplit(url)
+            try:
+                response = await client.get(f"{parts.scheme}://{parts.netloc}/robots.txt")
+            except httpx.HTTPError:
+                return
+            if response.status_code != 200:
+                return
+            parser = RobotFileParser()
+            parser.parse(response.text.splitlines())
+            delay = parser.crawl_delay("*")
+            if delay:
+                state.crawl_delay = float(delay)
+                delay_rate = 1 / (state.crawl_delay * self.processes)
+                if delay_rate < state.bucket.rate:
+                    state.bucket.rate = delay_rate
+                    state.bucket.burst = 1
+                    state.bucket.tokens = min(state.bucket.tokens, 1.0)
+                logger.info(f"🤖 {parts.hostname}: robots.txt Crawl-delay {state.crawl_delay}s")
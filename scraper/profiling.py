@@ -0,0 +1,98 @@
+"""
+Profiling - opt-in sampling profiles of single requests
+A request flagged for profiling runs under pyinstrument (statistical, low
+overhead, async-aware). The HTML report is saved under PROFILE_DIR and can
+be downloaded from GET /debug/profiles/{name}, so a slow URL can be
+inspected without reproducing it locally. Only the newest `max_reports`
+reports are kept.
+
+pyinstrument is imported lazily; without it profiling is reported as
+unavailable and the request runs normally.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_NAME_RE = re.compile(r"^[\w.-]+\.html$")
+
+
+@asynccontextmanager
+async def profile_request(
+    profile_dir: str,
+    label: str,
+    interval: float = 0.001,
+    max_reports: int = 50
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Profile the awaited work inside the block; yields a dict that is filled
+    with the report location once the block exits
+    """
+    info: Dict[str, Any] = {}
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        info["profile_error"] = "pyinstrument is not installed"
+        yield info
+        return
+
+    # async_mode="enabled": only this request's context, not other requests
+    # sharing the event loop
+    profiler = Profiler(interval=interval, async_mode="enabled")
+    profiler.start()
+    try:
+        yield info
+    finally:
+        session = profiler.stop()
+        slug = re.sub(r"[^\w.-]+", "-", label)[:60].strip("-") or "request"
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{uuid.uuid4().hex[:6]}.html"
+        # Rendering and writing the report takes a while for long requests:
+        # keep it off the event loop
+        await asyncio.to_thread(_save_report, profiler, profile_dir, name, max_reports)
+        info["profile"] = {
+            "name": name,
+            "url": f"/debug/profiles/{name}",
+            "sampled_ms": round(session.duration * 1000),
+            "cpu_ms": round(session.cpu_time * 1000),
+        }
+        logger.info(f"🔬 Profile saved: {name}")
+
+
+def _save_report(profiler: Any, profile_dir: str, name: str, max_reports: int) -> None:
+    os.makedirs(profile_dir, exist_ok=True)
+    with open(os.path.join(profile_dir, name), "w", encoding="utf-8") as f:
+        f.write(profiler.output_html())
+    prune_profiles(profile_dir, max_reports)
+
+
+def prune_profiles(profile_dir: str, max_reports: int) -> List[str]:
+    """Delete all but the newest `max_reports` reports; returns the deleted names"""
+    reports = []
+    for entry in os.scandir(profile_dir):
+        if entry.is_file() and PROFILE_NAME_RE.match(entry.name):
+            reports.append((entry.stat().st_mtime, entry.name))
+    reports.sort(reverse=True)
+    deleted = []
+    for _, name in reports[max(0, max_reports):]:
+        try:
+            os.remove(os.path.join(profile_dir, name))
+        except FileNotFoundError:
+            # Pruned concurrently by another request or worker
+            continue
+        deleted.append(name)
+    return deleted
+
+
+def profile_path(profile_dir: str, name: str) -> Optional[str]:
+    """Absolute path of a saved report, or None for unknown/unsafe names"""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    path = os.path.join(profile_dir, name)
+    return path if os.path.isfile(path) else None
@@ -0,0 +1,62 @@
+"""
+Recrawl - change detection for pages crawled before
+Per URL (and extraction options) we keep the HTTP validators (ETag,
+Last-Modified) and a hash of the filtered markdown from the last successful
+crawl, plus the response it produced. A refresh first sends a conditional
+GET; a 304, or new markdown with the same hash, means the page did not change
+and the stored response can be returned without another LLM call.
+"""
+
+import hashlib
+from typing import Any, Dict, Mapping, Optional
+
+# Response header → request header for a conditional GET
+VALIDATOR_HEADERS = {
+    "etag": "If-None-Match",
+    "last-modified": "If-Modified-Since",
+}
+
+
+def validators_from_headers(headers: Optional[Mapping[str, str]]) -> Dict[str, str]:
+    """ETag / Last-Modified from response headers (any key case)"""
+    if not headers:
+        return {}
+    lowered = {key.lower(): value for key, value in headers.items()}
+    return {name: lowered[name] for name in VALIDATOR_HEADERS if lowered.get(name)}
+
+
+def conditional_headers(validators: Optional[Mapping[str, str]]) -> Dict[str, str]:
+    """Request headers that let the site answer 304 Not Modified"""
+    return {
+        VALIDATOR_HEADERS[name]: value
+        for name, value in (validators or {}).items()
+        if name in VALIDATOR_HEADERS
+    }
+
+
+def markdown_hash(markdown: str) -> str:
+    """Hash of the filtered markdown, ignoring trailing whitespace per line"""
+    normalized = "\n".join(line.rstrip() for line in markdown.strip().splitlines())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def crawl_state(
+    validators: Dict[str, str],
+    crawl_path: str,
+    markdown: str,
+    response: Dict[str, Any],
+    crawled_at: float
+) -> Dict[str, Any]:
+    """
+    What is remembered about one successful crawl
+
+    Validators are only sent again for pages the fast path served: a 304
+    for a JavaScript shell says nothing about the content rendered into it.
+    """
+    return {
+        "validators": validators,
+        "crawl_path": crawl_path,
+        "content_hash": markdown_hash(markdown),
+        "crawled_at": crawled_at,
+        "response": response,
+    }
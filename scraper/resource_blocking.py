@@ -0,0 +1,158 @@
+"""
+Resource Blocking - keep the headless browser from downloading what we never read
+Only the DOM text ends up in markdown, so images, fonts, media and
+third-party analytics are aborted at the network layer of every page the
+pooled crawlers open. Blocked requests are counted per crawl.
+"""
+
+import contextvars
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCKED_TYPES = frozenset({"image", "media", "font"})
+
+# Analytics, ads and session-recording hosts (subdomains are matched too)
+DEFAULT_BLOCKED_DOMAINS = frozenset({
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.com",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+    "fullstory.com",
+    "mouseflow.com",
+    "crazyegg.com",
+    "newrelic.com",
+    "nr-data.net",
+    "intercom.io",
+    "intercomcdn.com",
+    "hs-analytics.net",
+    "hs-scripts.com",
+    "ads-twitter.com",
+    "snap.licdn.com",
+    "quantserve.com",
+    "scorecardresearch.com",
+    "taboola.com",
+    "outbrain.com",
+})
+
+# Typical transfer sizes (bytes) per resource type, used to estimate savings:
+# aborted requests never report a real size
+ESTIMATED_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 35_000,
+    "stylesheet": 25_000,
+    "script": 40_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+
+@dataclass
+class BlockingStats:
+    """Blocked requests of one crawl"""
+    blocked: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+    by_domain: int = 0
+    bytes_saved_estimate: int = 0
+
+    def record(self, resource_type: str, reason: str) -> None:
+        self.blocked += 1
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+        if reason == "domain":
+            self.by_domain += 1
+        self.bytes_saved_estimate += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+
+    def as_metadata(self) -> Dict[str, Any]:
+        return {
+            "blocked_requests": self.blocked,
+            "blocked_by_type": dict(self.by_type),
+            "blocked_tracker_requests": self.by_domain,
+            "blocked_bytes_estimate": self.bytes_saved_estimate,
+        }
+
+
+# Stats of the crawl running in the current task (set by track_blocking)
+_current_stats: contextvars.ContextVar[Optional[BlockingStats]] = contextvars.ContextVar(
+    "resource_blocking_stats", default=None
+)
+
+
+def parse_list(value: str) -> FrozenSet[str]:
+    """Comma-separated env value -> set of lowercase entries"""
+    return frozenset(item.strip().lower() for item in value.split(",") if item.strip())
+
+
+class ResourcePolicy:
+    """What to abort: Playwright resource types plus a host blocklist"""
+
+    def __init__(
+        self,
+        resource_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+        blocked_domains: Iterable[str] = DEFAULT_BLOCKED_DOMAINS,
+    ):
+        self.resource_types = frozenset(resource_types)
+        self.blocked_domains = frozenset(d.lower().lstrip(".") for d in blocked_domains)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.resource_types or self.blocked_domains)
+
+    def match(self, resource_type: str, url: str) -> Optional[str]:
+        """Return why a request should be blocked ("type"/"domain"), or None"""
+        if resource_type == "document":
+            # Never block the page itself (or iframes)
+            return None
+        if resource_type in self.resource_types:
+            return "type"
+        host = (urlsplit(url).hostname or "").lower()
+        while host:
+            if host in self.blocked_domains:
+                return "domain"
+            _, _, host = host.partition(".")
+        return None
+
+    def install(self, crawler: Any) -> None:
+        """Route every page the crawler opens through this policy"""
+        if self.enabled:
+            crawler.crawler_strategy.set_hook("on_page_context_created", self._on_page_created)
+
+    async def _on_page_created(self, page: Any, **kwargs: Any) -> Any:
+        # Captured here: route callbacks run outside the crawl's task context
+        stats = _current_stats.get()
+
+        async def handle(route: Any) -> None:
+            request = route.request
+            reason = self.match(request.resource_type, request.url)
+            if reason is None:
+                # Let other handlers (e.g. Crawl4AI's own context routes) decide
+                await route.fallback()
+                return
+            if stats is not None:
+                stats.record(request.resource_type, reason)
+            await route.abort()
+
+        await page.route("**/*", handle)
+        return page
+
+
+@contextmanager
+def track_blocking() -> Iterator[BlockingStats]:
+    """Collect blocked-request stats for the crawl awaited inside this block"""
+    stats = BlockingStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
@@ -0,0 +1,443 @@
+"""
+Result Cache - two-tier (memory LRU + SQLite) cache for JSON-serializable results
+Used to skip repeated work whose output depends only on its input, e.g.
+LLM extraction keyed by a hash of the prompt input and model.
+The database runs in WAL mode, so several worker processes can share one
+file: a value written by one worker is a disk hit in the others.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(*parts: str) -> str:
+    """Stable SHA-256 key over several string parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent key/value cache with an in-memory LRU in front of SQLite.
+
+    - TTL: entries older than `ttl_seconds` are treated as misses and dropped
+    - Size-based eviction: least recently used rows are deleted once the
+      namespace grows past `max_bytes` (the byte total per namespace is kept
+      by triggers in `cache_sizes`, so a write never sums the table)
+    - Memory hits refresh the row's disk `accessed_at` in batches, at most
+      every `TOUCH_SECONDS`, so entries served from memory are not evicted
+      as if unused
+    - Counters: memory/disk hits, misses, writes, evictions
+
+    Several namespaces, and several processes, can share one database file.
+    With `shared=True` invalidations and overwrites are logged in the
+    database and replayed on the other processes' memory tiers (checked at
+    most every `SYNC_SECONDS` on lookup), so a recrawl or bypass_llm_cache
+    result written by one worker replaces the stale copy in the others.
+    """
+
+    SYNC_SECONDS = 1.0
+    TOUCH_SECONDS = 10.0
+    PURGE_SECONDS = 60.0
+    BUSY_TIMEOUT_MS = 5000
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        ttl_seconds: float = 30 * 24 * 3600,
+        max_bytes: int = 100 * 1024 * 1024,
+        memory_entries: int = 256,
+        shared: bool = False,
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.shared = shared
+
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Last invalidation log row applied to the memory tier, and when we looked
+        self._invalidation_id = 0
+        self._synced_at = 0.0
+        # Log rows written by this process (its memory tier is already current)
+        self._own_invalidations: Set[int] = set()
+        # Memory hits not yet written to disk (key -> accessed_at)
+        self._touched: Dict[str, float] = {}
+        self._touched_at = time.time()
+        self._purged_at = 0.0
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+
+    # ------------------------------------------
+    # Public API
+    # ------------------------------------------
+
+    async def open(self) -> None:
+        """Create the database and schema now instead of on the first lookup"""
+        def connect() -> None:
+            with self._lock:
+                self._connection()
+
+        await asyncio.to_thread(connect)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None (memory first, then disk)"""
+        now = time.time()
+        if self.shared and now - self._synced_at >= self.SYNC_SECONDS:
+            self._synced_at = now
+            self._forget(await asyncio.to_thread(self._disk_invalidations))
+        cached = self._memory.get(key)
+        if cached is not None:
+            value, created_at = cached
+            if now - created_at <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                self._touched[key] = now
+                if now - self._touched_at >= self.TOUCH_SECONDS:
+                    await asyncio.to_thread(self._disk_touch, self._take_touched(now))
+                return value
+            self._memory.pop(key, None)
+
+        row = await asyncio.to_thread(self._disk_get, key, now)
+        if row is None:
+            self._counters["misses"] += 1
+            return None
+
+        value, created_at = row
+        self._remember(key, value, created_at)
+        self._counters["disk_hits"] += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value in both tiers"""
+        created_at = time.time()
+        self._remember(key, value, created_at)
+        evicted = await asyncio.to_thread(
+            self._disk_set, key, json.dumps(value), created_at, self._take_touched(created_at)
+        )
+        for evicted_key in evicted:
+            self._memory.pop(evicted_key, None)
+        self._counters["writes"] += 1
+        self._counters["evictions"] += len(evicted)
+
+    async def invalidate(self, key: Optional[str] = None) -> int:
+        """Drop one key, or the whole namespace when key is None; returns rows removed"""
+        if key is None:
+            self._memory.clear()
+        else:
+            self._memory.pop(key, None)
+        return await asyncio.to_thread(self._disk_delete, key)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+        lookups = hits + self._counters["misses"]
+        return {
+            "namespace": self.namespace,
+            **self._counters,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_size": len(self._memory),
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._disk_touch(self._take_touched(time.time()))
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------
+    # Internals
+    # ------------------------------------------
+
+    def _forget(self, keys: List[Optional[str]]) -> None:
+        """Drop keys invalidated by other processes (None = whole namespace)"""
+        for key in keys:
+            if key is None:
+                self._memory.clear()
+            else:
+                self._memory.pop(key, None)
+
+    def _take_touched(self, now: float) -> Dict[str, float]:
+        """Hand the pending memory-hit timestamps to a disk write"""
+        touched, self._touched = self._touched, {}
+        self._touched_at = now
+        return touched
+
+    def _remember(self, key: str, value: Any, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL: readers in other workers are not blocked by a writer;
+            # busy_timeout: writers wait for each other instead of failing
+            conn.execute(f"PRAGMA busy_timeout = {self.BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache_entries (namespace, accessed_at)"
+            )
+            self._create_size_triggers(conn)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_invalidations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    namespace TEXT NOT NULL,
+                    key TEXT,
+                    invalidated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.commit()
+            # Only invalidations made after this process started concern it
+            (self._invalidation_id,) = conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM cache_invalidations"
+            ).fetchone()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _create_size_triggers(conn: sqlite3.Connection) -> None:
+        """Byte total per namespace, kept up to date by every write to cache_entries"""
+        # One process creates the table and counts rows written before it existed
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (exists,) = conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'cache_sizes'"
+            ).fetchone()
+            if not exists:
+                conn.execute(
+                    "CREATE TABLE cache_sizes (namespace TEXT PRIMARY KEY, bytes INTEGER NOT NULL)"
+                )
+                conn.execute(
+                    """
+                    INSERT INTO cache_sizes (namespace, bytes)
+                    SELECT namespace, SUM(size) FROM cache_entries GROUP BY namespace
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER cache_size_insert AFTER INSERT ON cache_entries BEGIN
+                        INSERT INTO cache_sizes (namespace, bytes) VALUES (NEW.namespace, NEW.size)
+                        ON CONFLICT (namespace) DO UPDATE SET bytes = bytes + NEW.size;
+                    END
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER cache_size_update AFTER UPDATE OF size ON cache_entries BEGIN
+                        UPDATE cache_sizes SET bytes = bytes + NEW.size - OLD.size
+                        WHERE namespace = NEW.namespace;
+                    END
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER cache_size_delete AFTER DELETE ON cache_entries BEGIN
+                        UPDATE cache_sizes SET bytes = bytes - OLD.size
+                        WHERE namespace = OLD.namespace;
+                    END
+                    """
+                )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                conn.commit()
+                self._counters["expired"] += 1
+                return None
+            conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+            conn.commit()
+        try:
+            return json.loads(value), created_at
+        except json.JSONDecodeError:
+            logger.warning(f"Corrupt cache entry dropped ({self.namespace}:{key[:12]})")
+            self._disk_delete(key)
+            return None
+
+    def _disk_set(
+        self, key: str, payload: str, created_at: float, touched: Dict[str, float]
+    ) -> List[str]:
+        with self._lock:
+            conn = self._connection()
+            self._write_touched(conn, touched)
+            if self.shared and conn.execute(
+                "SELECT 1 FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone():
+                # Other workers may hold the previous value in memory
+                self._log_invalidation(conn, key)
+            # Upsert rather than INSERT OR REPLACE: REPLACE's implicit delete
+            # would bypass the size trigger
+            conn.execute(
+                """
+                INSERT INTO cache_entries
+                    (namespace, key, value, size, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (namespace, key) DO UPDATE SET
+                    value = excluded.value, size = excluded.size,
+                    created_at = excluded.created_at, accessed_at = excluded.accessed_at
+                """,
+                (self.namespace, key, payload, len(payload), created_at, created_at),
+            )
+            evicted = self._evict(conn, created_at)
+            conn.commit()
+            return evicted
+
+    def _disk_touch(self, touched: Dict[str, float]) -> None:
+        if not touched:
+            return
+        with self._lock:
+            self._write_touched(self._connection(), touched)
+            self._conn.commit()
+
+    def _write_touched(self, conn: sqlite3.Connection, touched: Dict[str, float]) -> None:
+        conn.executemany(
+            "UPDATE cache_entries SET accessed_at = MAX(accessed_at, ?) WHERE namespace = ? AND key = ?",
+            [(accessed_at, self.namespace, key) for key, accessed_at in touched.items()],
+        )
+
+    def _disk_delete(self, key: Optional[str]) -> int:
+        with self._lock:
+            conn = self._connection()
+            if key is None:
+                cursor = conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+                )
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+            if self.shared:
+                self._log_invalidation(conn, key)
+            conn.commit()
+            return cursor.rowcount
+
+    def _log_invalidation(self, conn: sqlite3.Connection, key: Optional[str]) -> None:
+        """Record a changed key (None = whole namespace) for the other processes"""
+        now = time.time()
+        cursor = conn.execute(
+            "INSERT INTO cache_invalidations (namespace, key, invalidated_at) VALUES (?, ?, ?)",
+            (self.namespace, key, now),
+        )
+        self._own_invalidations.add(cursor.lastrowid)
+        conn.execute(
+            "DELETE FROM cache_invalidations WHERE invalidated_at < ?",
+            (now - 24 * 3600,),
+        )
+
+    def _disk_invalidations(self) -> List[Optional[str]]:
+        """Keys invalidated in this namespace since the last check (None = all)"""
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT id, namespace, key FROM cache_invalidations WHERE id > ? ORDER BY id",
+                (self._invalidation_id,),
+            ).fetchall()
+            if rows:
+                self._invalidation_id = rows[-1][0]
+            own = self._own_invalidations
+            self._own_invalidations = {row_id for row_id in own if row_id > self._invalidation_id}
+        return [
+            key for row_id, namespace, key in rows
+            if namespace == self.namespace and row_id not in own
+        ]
+
+    def _namespace_bytes(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute(
+            "SELECT bytes FROM cache_sizes WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> List[str]:
+        """Drop least recently used rows until under max_bytes"""
+        total = self._namespace_bytes(conn)
+        if total > self.max_bytes or now - self._purged_at >= self.PURGE_SECONDS:
+            # Expired rows are dropped on lookup; this sweep (a table scan)
+            # only reclaims the ones nobody asks for again
+            self._purged_at = now
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+                (self.namespace, now - self.ttl_seconds),
+            )
+            total = self._namespace_bytes(conn)
+        if total <= self.max_bytes:
+            return []
+
+        overflow = total - self.max_bytes
+        rows = conn.execute(
+            "SELECT key, size FROM cache_entries WHERE namespace = ? ORDER BY accessed_at ASC",
+            (self.namespace,),
+        )
+        doomed = []
+        for key, size in rows:
+            if overflow <= 0:
+                break
+            doomed.append((self.namespace, key))
+            overflow -= size
+        conn.executemany(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", doomed
+        )
+        return [key for _, key in doomed]
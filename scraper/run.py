@@ -16,16 +16,25 @@ if __name__ == "__main__":
     import uvicorn
     import os
     
+    from multiworker import prepare_metrics_dir, worker_count
+    
     port = int(os.getenv("PORT", 8000))
     host = os.getenv("HOST", "0.0.0.0")
+    workers = worker_count()
+    
+    if workers > 1:
+        # Métricas Prometheus compartidas: cada worker escribe en este directorio
+        # y /metrics suma todos (debe existir antes de que arranquen los workers)
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = prepare_metrics_dir(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
     
-    print(f"🚀 Starting ResuMate Scraper on {host}:{port}")
+    print(f"🚀 Starting ResuMate Scraper on {host}:{port} ({workers} worker{'s' if workers > 1 else ''})")
     
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
         reload=False,
+        workers=workers,  # WEB_CONCURRENCY; los presupuestos por contenedor se reparten (ver multiworker.py)
         log_level="info",
         loop="asyncio"  # Usar event loop de asyncio (con nuestra política)
     )
@@ -0,0 +1,81 @@
+"""
+Single-flight - coalesce concurrent calls for the same key
+The first caller runs the work; callers arriving while it is in flight
+await the same result instead of repeating the crawl and LLM call. The work
+is cancelled once every caller waiting on it has been cancelled (e.g. a
+closed stream), and keeps running while any caller still waits.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicates in-flight async work by key"""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self._leaders = 0
+        self._coalesced = 0
+        self._abandoned = 0
+
+    async def do(self, key: str, work: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Run `work` once per key at a time.
+
+        Returns:
+            (result, shared) - shared is True when this caller reused
+            another caller's in-flight result
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalesced += 1
+            logger.info(f"🔗 Coalesced with in-flight request ({self._coalesced} total)")
+            return await self._wait(key, task), True
+
+        task = asyncio.create_task(work())
+        self._inflight[key] = task
+        self._leaders += 1
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await self._wait(key, task), False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "executed": self._leaders,
+            "coalesced": self._coalesced,
+            "abandoned": self._abandoned,
+        }
+
+    async def _wait(self, key: str, task: asyncio.Task) -> Any:
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Shielded so a cancelled caller doesn't cancel the work that
+            # other callers are still waiting on
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters[task] == 1:
+                # Last caller gone: nobody will read the result
+                task.cancel()
+                self._abandoned += 1
+                if self._inflight.get(key) is task:
+                    # New callers start over instead of joining a cancelled task
+                    del self._inflight[key]
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
@@ -0,0 +1,64 @@
+"""
+Startup - timed background warm-up
+The app starts serving (and /health passes) as soon as the cheap parts are
+up; heavy imports, cache databases and the browser pool are prepared in the
+background. Each step's duration is recorded so the startup log and
+GET /ready show where cold-start time goes.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Progress of the background warm-up
+
+    - imports_ready: heavy modules are loaded (requests may use them without
+      blocking the event loop on an import)
+    - ready: a warm browser crawl succeeded (GET /ready passes)
+    - done: the first warm-up pass is over, ready or not
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.steps_ms: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.elapsed_ms: float = 0.0
+        self.imports_ready = asyncio.Event()
+        self.ready = asyncio.Event()
+        self.done = asyncio.Event()
+
+    async def step(self, name: str, work: Awaitable[Any]) -> bool:
+        """Run and time one step; failures are recorded, never raised"""
+        started = time.perf_counter()
+        try:
+            await work
+            return True
+        except Exception as e:
+            self.errors[name] = f"{type(e).__name__}: {e}"
+            logger.error(f"Warm-up step '{name}' failed: {e}")
+            return False
+        finally:
+            self.steps_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    def finish(self) -> None:
+        self.elapsed_ms = round((time.perf_counter() - self.started) * 1000, 1)
+        self.imports_ready.set()
+        self.done.set()
+        breakdown = ", ".join(f"{name}={ms:.0f}ms" for name, ms in self.steps_ms.items())
+        status = "ready" if self.ready.is_set() else "NOT ready"
+        logger.info(f"🔥 Warm-up finished in {self.elapsed_ms:.0f}ms ({status}): {breakdown}")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready.is_set(),
+            "warming_up": not self.elapsed_ms,
+            "steps_ms": dict(self.steps_ms),
+            "errors": dict(self.errors),
+            "elapsed_ms": self.elapsed_ms or round((time.perf_counter() - self.started) * 1000, 1),
+        }
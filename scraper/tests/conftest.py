@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_DIR = os.path.join(SCRAPER_DIR, "benchmarks", "corpus")
+
+# Modules live flat in scraper/ (imported as `main`, `url_utils`, ...)
+sys.path.insert(0, SCRAPER_DIR)
+
+# Manual scripts against a running server, not unit tests
+collect_ignore = ["quick_test.py", "test_openrouter.py", "test_scraper.py"]
+
+
+@pytest.fixture(scope="session")
+def corpus_html():
+    """HTML of a benchmark corpus page by file name"""
+    def read(name: str) -> str:
+        with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as f:
+            return f.read()
+    return read
+
+
+@pytest.fixture(scope="session")
+def corpus_markdown(corpus_html):
+    """Markdown of a corpus page, converted like the fast path does"""
+    from content import html_to_markdown
+
+    def convert(name: str) -> str:
+        return html_to_markdown(f"https://example.com/{name}", corpus_html(name))
+    return convert
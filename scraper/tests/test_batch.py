@@ -0,0 +1,44 @@
+"""Unit tests for the batch endpoints (per-URL failures)"""
+
+import asyncio
+
+import main
+
+
+def fail_on(bad_url, response_type, payload):
+    async def pipeline(request, crawl_limit=None, llm_limit=None):
+        if request.url == bad_url:
+            raise RuntimeError("browser crashed")
+        return response_type(url=request.url, success=True, **payload)
+    return pipeline
+
+
+def test_cv_batch_reports_a_failing_url(monkeypatch):
+    monkeypatch.setattr(main, "run_pipeline", fail_on(
+        "https://b.example/cv", main.CVExtractionResponse, {"markdown": "# CV"}
+    ))
+    request = main.CVBatchExtractionRequest(urls=[
+        "https://a.example/cv", "https://b.example/cv", "https://c.example/cv"
+    ])
+
+    response = asyncio.run(main.extract_cv_batch(request))
+
+    assert [result.url for result in response.results] == request.urls
+    assert [result.success for result in response.results] == [True, False, True]
+    assert response.results[1].error == "Extraction error: browser crashed"
+    assert response.metadata["succeeded"] == 2
+    assert response.metadata["failed"] == 1
+
+
+def test_job_batch_reports_a_failing_url(monkeypatch):
+    monkeypatch.setattr(main, "run_job_posting_pipeline", fail_on(
+        "https://a.example/job", main.ExtractJobResponse, {"raw_content": "# Job"}
+    ))
+    request = main.ExtractJobBatchRequest(urls=["https://a.example/job", "https://b.example/job"])
+
+    response = asyncio.run(main.extract_job_batch(request))
+
+    assert [result.success for result in response.results] == [False, True]
+    assert response.results[0].url == "https://a.example/job"
+    assert response.results[0].error == "Extraction error: browser crashed"
+    assert response.metadata["failed"] == 1
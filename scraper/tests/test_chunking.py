@@ -0,0 +1,28 @@
+"""Unit tests for chunking (section units and packing)"""
+
+from chunking import estimate_tokens, pack_chunks, pack_units
+
+
+def test_pack_units_groups_consecutive_units_within_the_budget():
+    units = ["a" * 400, "b" * 400, "c" * 400, "d" * 1200, "e" * 40]
+    budget = estimate_tokens("x" * 800)
+    assert pack_units(units, budget) == [[0, 1], [2], [3], [4]]
+
+
+def test_pack_units_keeps_an_oversized_unit_on_its_own():
+    assert pack_units(["x" * 10_000, "y"], 100) == [[0], [1]]
+    assert pack_units([], 100) == []
+
+
+def test_pack_chunks_keeps_whole_sections_within_max_chunks():
+    body = " ".join(["Built payment services in Python and Go for large teams."] * 4)
+    sections = [f"## {title}\n{body}" for title in ("Education", "Skills", "Experience")]
+    markdown = "\n\n".join(sections)
+    # Three sections of ~60 tokens fit the token capacity (2 x 100) but not two chunks
+    assert sum(estimate_tokens(section) for section in sections) <= 200
+
+    chunks = pack_chunks(markdown, 100, 2)
+
+    assert len(chunks) == 2
+    # The lowest ranked section (Skills) is left out, not the last chunk (Experience)
+    assert chunks == [sections[0], sections[2]]
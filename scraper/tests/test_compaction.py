@@ -0,0 +1,35 @@
+"""Unit tests for compaction (prompt markdown cleanup)"""
+
+from compaction import compact_markdown
+
+TWO_JOBS = """\
+## Experience
+
+### Backend Engineer - Acme
+### Responsibilities
+- Designed the billing service and its public API
+
+### Data Engineer - Globex
+### Responsibilities
+- Maintained the nightly ETL pipelines for reporting
+"""
+
+
+def test_repeated_section_headings_are_kept():
+    compacted, stats = compact_markdown(TWO_JOBS)
+    assert compacted.count("### Responsibilities") == 2
+    assert stats["duplicate_lines"] == 0
+
+
+def test_heading_repeated_back_to_back_is_dropped():
+    compacted, stats = compact_markdown("# Jane Doe\n\n# Jane Doe\n\nSoftware engineer in Berlin")
+    assert compacted.count("# Jane Doe") == 1
+    assert stats["duplicate_lines"] == 1
+
+
+def test_navigation_repeated_in_header_and_footer_is_dropped():
+    nav = "[Home](/) [Projects](/projects) [Contact](/contact)"
+    markdown = f"{nav}\n\n## About\n\nBuilding data tools since 2015.\n\n{nav}"
+    compacted, stats = compact_markdown(markdown, "https://jane.example/")
+    assert compacted.count("Home Projects Contact") == 1
+    assert stats["duplicate_lines"] == 1
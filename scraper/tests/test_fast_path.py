@@ -0,0 +1,120 @@
+"""Unit tests for fast_path (quality thresholds and bounded downloads)"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from fast_path import assess_markdown, fetch_html
+
+CORPUS_PAGES = [
+    "cv_developer.html",
+    "cv_long_academic.html",
+    "job_listing.html",
+    "job_posting.html",
+    "portfolio_designer.html",
+]
+
+
+@pytest.mark.parametrize("name", CORPUS_PAGES)
+def test_static_corpus_pages_skip_the_browser(name, corpus_html, corpus_markdown):
+    acceptable, reason, stats = assess_markdown(corpus_html(name), corpus_markdown(name), 80)
+    assert (acceptable, reason) == (True, "ok")
+    assert stats["words"] >= 80
+
+
+def test_spa_shell_needs_the_browser(corpus_html, corpus_markdown):
+    acceptable, reason, stats = assess_markdown(
+        corpus_html("spa_shell.html"), corpus_markdown("spa_shell.html"), 80
+    )
+    assert (acceptable, reason) == (False, "js_shell")
+    assert stats["words"] == 0
+
+
+def test_min_words_threshold(corpus_html, corpus_markdown):
+    html, markdown = corpus_html("cv_developer.html"), corpus_markdown("cv_developer.html")
+    words = len(markdown.split())
+
+    assert assess_markdown(html, markdown, words)[:2] == (True, "ok")
+    assert assess_markdown(html, markdown, words + 1)[:2] == (False, "too_few_words")
+
+
+def test_shell_marker_is_ignored_on_pages_with_enough_text(corpus_html, corpus_markdown):
+    shell = corpus_html("spa_shell.html")
+    markdown = corpus_markdown("cv_developer.html")
+    words = len(markdown.split())
+
+    # Marker only counts below three times min_words
+    assert assess_markdown(shell, markdown, words // 3)[:2] == (True, "ok")
+    assert assess_markdown(shell, markdown, words // 3 + 1)[:2] == (False, "js_shell")
+
+
+def test_pages_without_headings_need_a_list():
+    text = " ".join(["experience"] * 100)
+    html = "<html><body><p>...</p></body></html>"
+
+    assert assess_markdown(html, text, 80)[:2] == (False, "no_structure")
+    assert assess_markdown(html, text + "\n\n- a\n- b", 80)[:2] == (False, "no_structure")
+    assert assess_markdown(html, text + "\n\n- a\n- b\n1. c", 80)[:2] == (True, "ok")
+    assert assess_markdown(html, "# Ana\n\n" + text, 80)[:2] == (True, "ok")
+
+
+def fetch(handler, max_bytes):
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_html(client, "https://example.com/cv", max_bytes=max_bytes)
+    return asyncio.run(scenario())
+
+
+def test_fetch_html_returns_pages_up_to_max_bytes(corpus_html):
+    body = corpus_html("cv_developer.html").encode("utf-8")
+
+    def handler(request):
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=body)
+
+    html, reason, stats = fetch(handler, max_bytes=len(body))
+    assert reason == "ok"
+    assert html == corpus_html("cv_developer.html")
+    assert stats["bytes"] == len(body)
+    assert stats["url"] == "https://example.com/cv"
+
+
+def test_fetch_html_rejects_a_large_content_length(corpus_html):
+    body = corpus_html("cv_long_academic.html").encode("utf-8")
+
+    def handler(request):
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, content=body)
+
+    html, reason, stats = fetch(handler, max_bytes=len(body) - 1)
+    assert (html, reason) == (None, "too_large")
+    assert stats["bytes"] == len(body)
+
+
+def test_fetch_html_stops_streaming_past_max_bytes(corpus_html):
+    body = corpus_html("cv_long_academic.html").encode("utf-8")
+    sent = []
+
+    async def chunks():
+        for start in range(0, len(body), 1024):
+            sent.append(start)
+            yield body[start:start + 1024]
+
+    def handler(request):
+        # Chunked: no Content-Length to reject up front
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, content=chunks())
+
+    html, reason, stats = fetch(handler, max_bytes=4096)
+    assert (html, reason) == (None, "too_large")
+    assert 4096 < stats["bytes"] <= 4096 + 1024
+    assert len(sent) < len(range(0, len(body), 1024))
+
+
+@pytest.mark.parametrize("status, content_type, reason", [
+    (404, "text/html", "http_404"),
+    (200, "application/pdf", "not_html"),
+])
+def test_fetch_html_rejects_non_html(status, content_type, reason):
+    def handler(request):
+        return httpx.Response(status, headers={"Content-Type": content_type}, content=b"%PDF-1.7")
+
+    assert fetch(handler, max_bytes=1024)[:2] == (None, reason)
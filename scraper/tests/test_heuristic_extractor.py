@@ -0,0 +1,79 @@
+"""Unit tests for heuristic_extractor (LLM-free CVData extraction)"""
+
+import asyncio
+
+import pytest
+
+from heuristic_extractor import extract_heuristic
+
+
+@pytest.mark.parametrize("title, name", [
+    ("Laura Méndez", "Laura Méndez"),
+    ("Carolina Rodríguez, Ph.D.", "Carolina Rodríguez"),
+    ("Dr. Ana Gil", "Ana Gil"),
+    ("Jorge de la Fuente MSc", "Jorge de la Fuente"),
+    ("Senior Python Engineer", None),
+    ("Selected Publications", None),
+    ("Experience", None),
+])
+def test_name_from_the_first_h1(title, name):
+    result = extract_heuristic(f"# {title}\n\nSome introduction about the page.")
+    assert result.data["full_name"] == name
+    assert result.confidence.get("full_name", 0.0) == (0.9 if name else 0.0)
+
+
+def test_later_headings_are_never_the_name():
+    markdown = "# Home\n\n## Invited Talks\n\n- Keynote at PyCon\n\n## Maria Lopez\n\nText."
+    result = extract_heuristic(markdown)
+    assert result.data["full_name"] is None
+    assert "full_name" not in result.confidence
+
+
+def test_academic_cv_keeps_the_real_name(corpus_markdown):
+    result = extract_heuristic(corpus_markdown("cv_long_academic.html"))
+    assert result.data["full_name"] == "Carolina Rodríguez"
+
+
+def test_developer_cv_fields(corpus_markdown):
+    result = extract_heuristic(corpus_markdown("cv_developer.html"))
+    assert result.data["full_name"] == "Laura Méndez"
+    assert "Staff Software Engineer" in result.data["job_titles"]
+    assert "Python" in result.data["technical_skills"]
+    assert result.overall >= 0.75
+
+
+def test_job_posting_is_not_a_cv(corpus_markdown):
+    result = extract_heuristic(corpus_markdown("job_posting.html"))
+    assert result.data["full_name"] is None
+    assert result.overall < 0.75
+
+
+def test_empty_input_does_not_raise():
+    result = extract_heuristic("")
+    assert result.data["full_name"] is None
+    assert result.overall == 0.0
+
+
+def test_auto_mode_calls_the_llm_without_a_confident_name(monkeypatch, corpus_markdown):
+    import main
+
+    calls = []
+
+    async def fake_llm(markdown, url, bypass_cache=False, *args):
+        calls.append(url)
+        return None, "stub LLM", {}
+
+    monkeypatch.setattr(main, "extract_with_llm_cached", fake_llm)
+    options = main.CVExtractionOptions(llm_mode="truncate")
+
+    markdown = corpus_markdown("cv_long_academic.html")
+    cv_data, error, info = asyncio.run(main.extract_structured(markdown, "https://a.example/cv", options))
+    assert (info["extractor"], error, cv_data.full_name) == ("heuristic", None, "Carolina Rodríguez")
+    assert calls == []
+
+    # Same CV without its H1: still a confident CV overall, but no name
+    headless = markdown.replace("# Carolina Rodríguez, Ph.D.", "")
+    assert extract_heuristic(headless).overall >= main.HEURISTIC_CONFIDENCE_THRESHOLD
+    cv_data, error, info = asyncio.run(main.extract_structured(headless, "https://a.example/cv", options))
+    assert calls == ["https://a.example/cv"]
+    assert error == "stub LLM"
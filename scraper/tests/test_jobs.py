@@ -0,0 +1,58 @@
+"""Unit tests for jobs (asynchronous job queue)"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from jobs import JobQueue
+
+
+def test_store_errors_do_not_stop_the_worker(tmp_path):
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def runner(job):
+            await gate.wait()
+            return {"echo": job.request["n"]}
+
+        queue = JobQueue(runner, workers=1, store_path=str(tmp_path / "jobs.db"))
+        await queue.start()
+        first = await queue.submit({"n": 1})
+        second = await queue.submit({"n": 2})
+
+        def locked(job):
+            raise sqlite3.OperationalError("database is locked")
+
+        # Every write from the worker fails from here on
+        queue._disk_save = locked
+        gate.set()
+        results = [await queue.wait(job.id, timeout=2) for job in (first, second)]
+        await queue.close()
+        return results
+
+    first, second = asyncio.run(scenario())
+    assert (first.status, first.result) == ("succeeded", {"echo": 1})
+    assert (second.status, second.result) == ("succeeded", {"echo": 2})
+
+
+def test_submit_does_not_track_a_job_the_store_refused(tmp_path):
+    async def runner(job):
+        return {}
+
+    async def scenario():
+        queue = JobQueue(runner, workers=1, store_path=str(tmp_path / "jobs.db"))
+        await queue.start()
+
+        def locked(job):
+            raise sqlite3.OperationalError("database is locked")
+
+        queue._disk_save = locked
+        with pytest.raises(sqlite3.OperationalError):
+            await queue.submit({"n": 1})
+        stats = queue.stats()
+        await queue.close()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats["submitted"] == stats["queued"] == 0
@@ -0,0 +1,76 @@
+"""Unit tests for the cached LLM extraction (routing, escalation and cache hits)"""
+
+import asyncio
+
+import main
+from model_routing import ModelRoute
+from result_cache import ResultCache
+
+ROUTES = [
+    ModelRoute(name="small", model="small/model", max_tokens=1000),
+    ModelRoute(name="default", model="default/model", max_tokens=2000),
+]
+
+
+def fake_llm(failing_models, calls):
+    async def extract(markdown, url, route=None, task=main.CV_TASK, on_field=None):
+        calls.append(route.model)
+        if route.model in failing_models:
+            return None, "LLM returned invalid JSON", {"llm_error": "invalid_json"}
+        return main.CVData(full_name=route.model), None, {}
+    return extract
+
+
+def run_twice(monkeypatch, tmp_path, failing_models):
+    calls = []
+    monkeypatch.setattr(main, "LLM_ROUTES", ROUTES)
+    monkeypatch.setattr(main, "llm_cache", ResultCache(str(tmp_path / "cache.db"), "llm"))
+    monkeypatch.setattr(main, "extract_with_llm", fake_llm(failing_models, calls))
+
+    async def scenario():
+        first = await main.extract_with_llm_cached("# Ana\n\nEngineer", "https://example.com/cv")
+        second = await main.extract_with_llm_cached("# Ana\n\nEngineer", "https://example.com/cv")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    return first, second, calls
+
+
+def test_hit_reports_the_routed_model(monkeypatch, tmp_path):
+    (data, _, info), (cached, _, hit), calls = run_twice(monkeypatch, tmp_path, set())
+
+    assert calls == ["small/model"]
+    assert hit["llm_cache"] == "hit"
+    assert hit["llm_model"] == info["llm_model"] == "small/model"
+    assert "llm_escalated_from" not in hit
+    assert cached == data
+
+
+def test_hit_after_escalation_reports_the_catch_all_model(monkeypatch, tmp_path):
+    (data, _, info), (cached, _, hit), calls = run_twice(monkeypatch, tmp_path, {"small/model"})
+
+    assert calls == ["small/model", "default/model"]
+    assert info["llm_model"] == "default/model"
+    assert hit["llm_cache"] == "hit"
+    assert hit["llm_model"] == "default/model"
+    assert hit["llm_route"] == "default"
+    assert hit["llm_max_tokens"] == 2000
+    assert hit["llm_escalated_from"] == "small"
+    assert cached.full_name == "default/model"
+
+
+def test_entries_without_a_model_are_still_hits(monkeypatch, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.db"), "llm")
+    monkeypatch.setattr(main, "LLM_ROUTES", ROUTES)
+    monkeypatch.setattr(main, "llm_cache", cache)
+    monkeypatch.setattr(main, "extract_with_llm", fake_llm(set(), []))
+    markdown = "# Ana\n\nEngineer"
+    key = main.content_key(markdown, main.CV_TASK.prompt_version, "small/model")
+
+    async def scenario():
+        await cache.set(key, {"full_name": "Ana"})
+        return await main.extract_with_llm_cached(markdown, "https://example.com/cv")
+
+    data, _, info = asyncio.run(scenario())
+    assert info["llm_cache"] == "hit"
+    assert data.full_name == "Ana"
@@ -0,0 +1,101 @@
+"""Unit tests for llm_stream (incremental JSON parsing of SSE completions)"""
+
+import json
+
+import pytest
+
+from llm_stream import IncrementalJSONParser, MalformedStreamError, parse_sse_delta
+
+
+def sse(content, finish_reason=None):
+    return "data: " + json.dumps({"choices": [{"delta": {"content": content}, "finish_reason": finish_reason}]})
+
+
+def feed_lines(lines):
+    parser = IncrementalJSONParser()
+    completed = []
+    for line in lines:
+        delta, finished = parse_sse_delta(line)
+        if delta:
+            completed.extend(parser.feed(delta))
+        if parser.done or finished:
+            break
+    return parser, completed
+
+
+def test_members_split_across_chunks():
+    text = '```json\n{"full_name": "Ana Pérez", "skills": ["Go", "SQL"], "links": {"github": "ana"}}\n```'
+    lines = [sse(text[i:i + 3]) for i in range(0, len(text), 3)]
+
+    parser, completed = feed_lines(lines)
+
+    assert completed == [
+        ("full_name", "Ana Pérez"),
+        ("skills", ["Go", "SQL"]),
+        ("links", {"github": "ana"}),
+    ]
+    assert parser.result() == dict(completed)
+
+
+def test_members_are_emitted_as_soon_as_they_complete():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"full_name": "Ana"') == []
+    assert parser.feed(', "title"') == [("full_name", "Ana")]
+    assert parser.feed(': "Engineer"}') == [("title", "Engineer")]
+    assert parser.done
+
+
+def test_quotes_and_brackets_inside_strings():
+    value = 'Said "hi" {not: an object}, [1, 2] and a backslash \\'
+    text = json.dumps({"summary": value, "title": "x"})
+    parser = IncrementalJSONParser()
+    # One character at a time so escapes straddle chunk boundaries
+    completed = [member for char in text for member in parser.feed(char)]
+    assert completed == [("summary", value), ("title", "x")]
+
+
+def test_text_after_the_object_is_ignored():
+    parser = IncrementalJSONParser()
+    parser.feed('{"a": 1}\n```\nSome trailing chatter {')
+    assert parser.result() == {"a": 1}
+
+
+def test_done_and_keep_alive_lines():
+    assert parse_sse_delta(": OPENROUTER PROCESSING") == (None, False)
+    assert parse_sse_delta("") == (None, False)
+    assert parse_sse_delta("data: [DONE]") == (None, True)
+    assert parse_sse_delta(sse("{", finish_reason="stop")) == ("{", True)
+
+    lines = [": OPENROUTER PROCESSING", "", sse('{"a": '), ": OPENROUTER PROCESSING", sse("1}"), "data: [DONE]"]
+    parser, completed = feed_lines(lines)
+    assert completed == [("a", 1)]
+    assert parser.done
+
+
+def test_done_before_the_object_closes():
+    parser, completed = feed_lines([sse('{"a": 1, "b": '), "data: [DONE]"])
+    assert completed == [("a", 1)]
+    with pytest.raises(MalformedStreamError, match="not closed"):
+        parser.result()
+
+
+def test_malformed_deltas():
+    # Unparseable events are skipped, error events abort the stream
+    assert parse_sse_delta("data: {not json") == (None, False)
+    assert parse_sse_delta('data: {"choices": []}') == (None, False)
+    with pytest.raises(MalformedStreamError, match="rate limited"):
+        parse_sse_delta('data: {"error": {"message": "rate limited"}}')
+    with pytest.raises(MalformedStreamError, match="overloaded"):
+        parse_sse_delta('data: {"error": "overloaded"}')
+
+
+@pytest.mark.parametrize("text", [
+    "I'm sorry, I cannot help with that.",
+    "```python\nprint(1)",
+    '{"a": [1}, "b": 2}',
+    '{"a": tru, "b": 2}',
+])
+def test_malformed_output_is_rejected_early(text):
+    parser = IncrementalJSONParser()
+    with pytest.raises(MalformedStreamError):
+        parser.feed(text)
@@ -0,0 +1,72 @@
+"""Unit tests for markdown_pool (fallback when worker processes cannot start)"""
+
+import asyncio
+
+from content import html_to_markdown
+from markdown_pool import MarkdownPool
+
+URL = "https://example.com/cv_developer.html"
+
+
+class UnstartableExecutor:
+    """Executor whose submit fails like forkserver during bootstrapping"""
+
+    def __init__(self):
+        self.shutdowns = []
+
+    def submit(self, fn, *args):
+        raise RuntimeError("An attempt has been made to start a new process before the current process has finished its bootstrapping phase")
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.shutdowns.append((wait, cancel_futures))
+
+
+def test_start_failure_falls_back_to_threads(monkeypatch, corpus_html):
+    executor = UnstartableExecutor()
+    pool = MarkdownPool(workers=2, min_chars=100)
+    monkeypatch.setattr(pool, "_create_executor", lambda: executor)
+    html = corpus_html("cv_developer.html")
+
+    async def scenario():
+        await pool.start()
+        return await pool.convert(URL, html)
+
+    assert asyncio.run(scenario()) == html_to_markdown(URL, html)
+    assert executor.shutdowns == [(False, True)]
+    assert not pool.pooled(html)
+    stats = pool.stats()
+    assert stats["mode"] == "thread"
+    assert stats["threaded"] == 1 and stats["pooled"] == 0
+    assert stats["error"].startswith("RuntimeError")
+
+
+def test_submit_failure_disables_the_pool(corpus_html):
+    executor = UnstartableExecutor()
+    pool = MarkdownPool(workers=2, min_chars=100)
+    pool._executor = executor
+    html = corpus_html("cv_developer.html")
+
+    async def scenario():
+        first = await pool.convert(URL, html)
+        second = await pool.convert(URL, html)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second == html_to_markdown(URL, html)
+    # The broken executor is shut down once; the second page goes straight to a thread
+    assert executor.shutdowns == [(False, True)]
+    assert pool._executor is None
+    assert pool.stats()["threaded"] == 2
+
+
+def test_small_pages_stay_inline_after_a_failure(monkeypatch):
+    pool = MarkdownPool(workers=1, min_chars=10_000)
+    monkeypatch.setattr(pool, "_create_executor", UnstartableExecutor)
+    html = "<html><body><main><h1>Small</h1><p>Short page.</p></main></body></html>"
+
+    async def scenario():
+        await pool.start()
+        return await pool.convert(URL, html)
+
+    assert asyncio.run(scenario()) == html_to_markdown(URL, html)
+    assert pool.stats()["inline"] == 1
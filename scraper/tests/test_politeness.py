@@ -0,0 +1,147 @@
+"""Unit tests for politeness (token buckets, Crawl-delay, 429 backoff, interleaving)"""
+
+import asyncio
+import types
+
+import httpx
+import pytest
+
+import politeness
+from politeness import DomainScheduler, TokenBucket, interleave_by_domain
+
+real_sleep = asyncio.sleep
+
+
+class FakeClock:
+    """Monotonic clock that only moves when politeness sleeps"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+        await real_sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(politeness, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(politeness.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def waits(scheduler, urls):
+    async def scenario():
+        timings = []
+        for url in urls:
+            async with scheduler.slot(url) as info:
+                timings.append(info["politeness_wait_ms"])
+        return timings
+    return asyncio.run(scenario())
+
+
+def test_token_bucket_spends_the_burst_then_waits(clock):
+    bucket = TokenBucket(rate=2.0, burst=2)
+
+    async def scenario():
+        return [await bucket.acquire() for _ in range(4)]
+
+    assert asyncio.run(scenario()) == [0.0, 0.0, 0.5, 0.5]
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_token_bucket_refills_while_idle(clock):
+    bucket = TokenBucket(rate=1.0, burst=2)
+
+    async def scenario():
+        await bucket.acquire()
+        await bucket.acquire()
+        clock.now += 10
+        return [await bucket.acquire() for _ in range(3)]
+
+    # The idle time refills the burst, not more
+    assert asyncio.run(scenario()) == [0.0, 0.0, 1.0]
+
+
+def test_domains_are_rate_limited_separately(clock):
+    scheduler = DomainScheduler(rate=1.0, burst=1, respect_crawl_delay=False)
+    urls = [
+        "https://a.example.com/1",
+        "https://b.example.org/1",
+        "https://www.a.example.com/2",
+        "https://a.example.com/3",
+    ]
+
+    assert waits(scheduler, urls) == [0, 0, 1000, 1000]
+    assert scheduler.stats()["scheduled"] == 4
+
+
+def test_crawl_delay_slows_the_domain_down(clock):
+    def robots(request):
+        assert request.url.path == "/robots.txt"
+        return httpx.Response(200, text="User-agent: *\nCrawl-delay: 5\n")
+
+    scheduler = DomainScheduler(
+        rate=1.0, burst=2,
+        client_factory=lambda: httpx.AsyncClient(transport=httpx.MockTransport(robots)),
+    )
+
+    assert waits(scheduler, ["https://slow.example/1", "https://slow.example/2"]) == [0, 5000]
+
+
+def test_crawl_delay_is_ignored_when_disabled(clock):
+    def robots(request):
+        raise AssertionError("robots.txt must not be fetched")
+
+    scheduler = DomainScheduler(
+        rate=1.0, burst=2, respect_crawl_delay=False,
+        client_factory=lambda: httpx.AsyncClient(transport=httpx.MockTransport(robots)),
+    )
+
+    assert waits(scheduler, ["https://slow.example/1", "https://slow.example/2"]) == [0, 0]
+
+
+def test_backoff_pauses_only_that_domain(clock):
+    scheduler = DomainScheduler(rate=1.0, burst=2, respect_crawl_delay=False, backoff_seconds=30)
+    scheduler.backoff("https://busy.example/jobs", retry_after="7")
+
+    assert waits(scheduler, ["https://other.example/", "https://busy.example/"]) == [0, 7000]
+    assert scheduler.stats()["backoffs"] == 1
+
+
+@pytest.mark.parametrize("retry_after, seconds", [
+    (None, 30),
+    ("Wed, 21 Oct 2026 07:28:00 GMT", 30),
+    ("1000", 300),
+])
+def test_backoff_duration(clock, retry_after, seconds):
+    scheduler = DomainScheduler(rate=1.0, burst=2, respect_crawl_delay=False, backoff_seconds=30)
+    scheduler.backoff("https://busy.example/", retry_after=retry_after)
+
+    assert waits(scheduler, ["https://busy.example/"]) == [seconds * 1000]
+
+
+def test_interleave_round_robins_registrable_domains():
+    urls = [
+        "https://a.example.com/1",
+        "https://a.example.com/2",
+        "https://jobs.a.example.com/3",
+        "https://b.example.org/1",
+        "https://c.example.net/1",
+        "https://b.example.org/2",
+    ]
+
+    assert interleave_by_domain(urls, key=lambda url: url) == [
+        "https://a.example.com/1",
+        "https://b.example.org/1",
+        "https://c.example.net/1",
+        "https://a.example.com/2",
+        "https://b.example.org/2",
+        "https://jobs.a.example.com/3",
+    ]
@@ -0,0 +1,38 @@
+"""Unit tests for profiling (report files and pruning)"""
+
+import asyncio
+import os
+
+from profiling import profile_path, profile_request, prune_profiles
+
+
+def write_reports(directory, names):
+    for age, name in enumerate(reversed(names)):
+        path = directory / name
+        path.write_text("<html></html>")
+        # Later names are newer
+        os.utime(path, (1_000_000 - age, 1_000_000 - age))
+
+
+def test_prune_keeps_the_newest_reports(tmp_path):
+    write_reports(tmp_path, ["a.html", "b.html", "c.html", "d.html"])
+    (tmp_path / "notes.txt").write_text("not a report")
+
+    assert sorted(prune_profiles(str(tmp_path), 2)) == ["a.html", "b.html"]
+    assert sorted(os.listdir(tmp_path)) == ["c.html", "d.html", "notes.txt"]
+    assert prune_profiles(str(tmp_path), 2) == []
+
+
+def test_profile_request_saves_and_prunes(tmp_path):
+    write_reports(tmp_path, ["old-1.html", "old-2.html"])
+
+    async def scenario():
+        async with profile_request(str(tmp_path), "https://example.com/cv", max_reports=2) as info:
+            await asyncio.sleep(0.01)
+        return info
+
+    info = asyncio.run(scenario())
+    name = info["profile"]["name"]
+    assert "example.com-cv" in name
+    assert profile_path(str(tmp_path), name) is not None
+    assert sorted(os.listdir(tmp_path)) == sorted(["old-2.html", name])
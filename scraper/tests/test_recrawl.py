@@ -0,0 +1,177 @@
+"""Unit tests for recrawl (change detection and the unchanged response path)"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from recrawl import conditional_headers, crawl_state, markdown_hash, validators_from_headers
+from result_cache import ResultCache
+
+URL = "https://ana.example/cv"
+
+
+def test_validators_round_trip_to_conditional_headers():
+    headers = httpx.Headers({"ETag": '"v1"', "Last-Modified": "Tue, 13 Oct 2026 10:00:00 GMT", "Server": "x"})
+
+    validators = validators_from_headers(headers)
+
+    assert validators == {"etag": '"v1"', "last-modified": "Tue, 13 Oct 2026 10:00:00 GMT"}
+    assert conditional_headers(validators) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Tue, 13 Oct 2026 10:00:00 GMT",
+    }
+    assert validators_from_headers({"etag": ""}) == {}
+    assert conditional_headers(None) == {}
+
+
+def test_markdown_hash_ignores_trailing_whitespace_only():
+    markdown = "# Ana\n\nEngineer at Acme"
+
+    assert markdown_hash(markdown) == markdown_hash("\n# Ana  \n\nEngineer at Acme\t\n\n")
+    assert markdown_hash(markdown) != markdown_hash("# Ana\n\nEngineer at Initech")
+    assert markdown_hash(markdown) != markdown_hash("#  Ana\n\nEngineer at Acme")
+
+
+def test_crawl_state_records_the_content_hash():
+    state = crawl_state({"etag": '"v1"'}, "fast", "# Ana", {"success": True}, 123.0)
+    assert state["content_hash"] == markdown_hash("# Ana")
+    assert state["validators"] == {"etag": '"v1"'}
+
+
+class FakePipeline:
+    """crawl_stage / extract_structured stand-ins: scripted crawls, counted extractions"""
+
+    def __init__(self, monkeypatch, tmp_path):
+        self.crawls = []
+        self.sent_validators = []
+        self.extractions = 0
+        monkeypatch.setattr(main, "recrawl_state", ResultCache(str(tmp_path / "results.db"), "recrawl"))
+        monkeypatch.setattr(main, "crawl_stage", self.crawl_stage)
+        monkeypatch.setattr(main, "extract_structured", self.extract_structured)
+
+    async def crawl_stage(self, url, bypass_cache, timer, crawl_limit=None, validators=None):
+        self.sent_validators.append(validators)
+        crawl_path, markdown, etag = self.crawls.pop(0)
+        if markdown is None:
+            return True, "", "", {"crawl_path": "fast", "not_modified": True}
+        info = {"crawl_path": crawl_path}
+        if crawl_path == "fast":
+            info["validators"] = {"etag": etag}
+        return True, markdown, "", info
+
+    async def extract_structured(self, markdown, url, options, llm_limit=None, timer=None):
+        self.extractions += 1
+        return main.CVData(full_name=markdown.splitlines()[0].lstrip("# ")), None, {"extractor": "llm"}
+
+    def run(self, crawl_path, markdown, etag=None, **options):
+        self.crawls.append((crawl_path, markdown, etag))
+        request = main.CVExtractionRequest(url=URL, **options)
+        return asyncio.run(main.run_pipeline(request))
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    return FakePipeline(monkeypatch, tmp_path)
+
+
+def test_not_modified_returns_the_previous_result(pipeline):
+    first = pipeline.run("fast", "# Ana\n\nEngineer", etag='"v1"')
+    second = pipeline.run("fast", None)
+
+    assert pipeline.sent_validators == [None, {"etag": '"v1"'}]
+    assert first.metadata["recrawl"] == "miss" and not first.unchanged
+    assert second.unchanged
+    assert second.metadata["recrawl"] == "not_modified"
+    assert second.metadata["previous_crawled_at"] > 0
+    assert second.markdown == first.markdown
+    assert second.structured_data == first.structured_data
+    assert pipeline.extractions == 1
+
+
+def test_same_markdown_is_unchanged_and_keeps_the_new_etag(pipeline):
+    pipeline.run("fast", "# Ana\n\nEngineer", etag='"v1"')
+    second = pipeline.run("fast", "# Ana  \n\nEngineer\n", etag='"v2"')
+    pipeline.run("fast", None)
+
+    assert second.unchanged
+    assert second.metadata["recrawl"] == "content_hash"
+    # The next conditional GET sends the ETag of the unchanged response
+    assert pipeline.sent_validators[-1] == {"etag": '"v2"'}
+    assert pipeline.extractions == 1
+
+
+def test_browser_crawls_compare_hashes_without_validators(pipeline):
+    pipeline.run("browser", "# Ana\n\nEngineer")
+    second = pipeline.run("browser", "# Ana\n\nEngineer")
+
+    assert pipeline.sent_validators == [None, None]
+    assert second.unchanged and second.metadata["recrawl"] == "content_hash"
+    assert pipeline.extractions == 1
+
+
+def test_changed_and_bypassed_pages_are_extracted_again(pipeline):
+    pipeline.run("fast", "# Ana\n\nEngineer", etag='"v1"')
+    changed = pipeline.run("fast", "# Ana Pérez\n\nEngineer", etag='"v2"')
+    bypassed = pipeline.run("fast", "# Ana Pérez\n\nEngineer", etag='"v2"', bypass_llm_cache=True)
+
+    assert not changed.unchanged and changed.metadata["recrawl"] == "changed"
+    assert changed.structured_data.full_name == "Ana Pérez"
+    assert not bypassed.unchanged and bypassed.metadata["recrawl"] == "bypass"
+    assert pipeline.sent_validators[-1] is None
+    assert pipeline.extractions == 3
+
+
+class FakeBrowserPool:
+    def __init__(self, **kwargs):
+        pass
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    def stats(self):
+        return {}
+
+
+def test_extract_cv_reports_unchanged_pages(monkeypatch, tmp_path, corpus_html):
+    page = corpus_html("cv_developer.html")
+    requests = []
+
+    def site(request):
+        requests.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"Content-Type": "text/html", "ETag": '"v1"'}, text=page)
+
+    extractions = []
+
+    async def extract_structured(markdown, url, options, llm_limit=None, timer=None):
+        extractions.append(url)
+        return main.CVData(full_name="Laura Méndez"), None, {"extractor": "llm"}
+
+    monkeypatch.setattr(main, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "RECRAWL_STATE_ENABLED", True)
+    monkeypatch.setattr(main, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(main, "MARKDOWN_PROCESS_POOL_ENABLED", False)
+    monkeypatch.setattr(main, "FAST_PATH_ENABLED", True)
+    monkeypatch.setattr(main, "politeness", None)
+    monkeypatch.setattr(main, "BrowserPool", FakeBrowserPool)
+    monkeypatch.setattr(main, "create_fetch_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(site)))
+    monkeypatch.setattr(main, "extract_structured", extract_structured)
+
+    with TestClient(main.app) as client:
+        first = client.post("/extract-cv", json={"url": URL}).json()
+        second = client.post("/extract-cv", json={"url": URL}).json()
+
+    assert requests == [None, '"v1"']
+    assert extractions == [URL]
+    assert first["unchanged"] is False and first["metadata"]["recrawl"] == "miss"
+    assert second["unchanged"] is True
+    assert second["metadata"]["recrawl"] == "not_modified"
+    assert second["markdown"] == first["markdown"]
+    assert second["structured_data"]["full_name"] == "Laura Méndez"
@@ -0,0 +1,84 @@
+"""Unit tests for resource_blocking (request policy and per-crawl stats)"""
+
+import asyncio
+import types
+
+import pytest
+
+from resource_blocking import ResourcePolicy, parse_list, track_blocking
+
+
+@pytest.mark.parametrize("resource_type, url, reason", [
+    ("image", "https://example.com/photo.jpg", "type"),
+    ("font", "https://fonts.gstatic.com/inter.woff2", "type"),
+    ("media", "https://example.com/intro.mp4", "type"),
+    ("script", "https://www.googletagmanager.com/gtm.js", "domain"),
+    ("xhr", "https://region1.google-analytics.com/g/collect", "domain"),
+    ("script", "https://static.hotjar.com/c/hotjar.js", "domain"),
+    ("script", "https://snap.licdn.com/li.lms-analytics/insight.min.js", "domain"),
+    ("script", "https://example.com/app.js", None),
+    ("stylesheet", "https://example.com/site.css", None),
+    # Suffix matching is per label, not per character
+    ("script", "https://nothotjar.com/app.js", None),
+    ("script", "https://www.linkedin.com/in/ana", None),
+])
+def test_default_policy(resource_type, url, reason):
+    assert ResourcePolicy().match(resource_type, url) == reason
+
+
+def test_documents_are_never_blocked():
+    policy = ResourcePolicy(resource_types={"document", "image"}, blocked_domains={"example.com"})
+    assert policy.match("document", "https://example.com/") is None
+    assert policy.match("image", "https://example.com/a.png") == "type"
+
+
+def test_custom_policy():
+    policy = ResourcePolicy(resource_types=parse_list(" Image, ,font "), blocked_domains={".Ads.Example"})
+
+    assert policy.resource_types == {"image", "font"}
+    assert policy.match("media", "https://cdn.example/v.mp4") is None
+    assert policy.match("script", "https://x.ADS.example/t.js") == "domain"
+    assert not ResourcePolicy(resource_types=(), blocked_domains=()).enabled
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = types.SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+
+class FakePage:
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+def test_page_routes_abort_blocked_requests_and_count_them():
+    routes = [
+        FakeRoute("image", "https://example.com/photo.jpg"),
+        FakeRoute("script", "https://www.google-analytics.com/analytics.js"),
+        FakeRoute("document", "https://example.com/"),
+    ]
+
+    async def scenario():
+        page = FakePage()
+        with track_blocking() as stats:
+            await ResourcePolicy()._on_page_created(page)
+        # Routes fire after the crawl task set up the page
+        for route in routes:
+            await page.handler(route)
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert [route.outcome for route in routes] == ["abort", "abort", "fallback"]
+    assert stats.as_metadata() == {
+        "blocked_requests": 2,
+        "blocked_by_type": {"image": 1, "script": 1},
+        "blocked_tracker_requests": 1,
+        "blocked_bytes_estimate": 100_000,
+    }
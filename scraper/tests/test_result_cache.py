@@ -0,0 +1,132 @@
+"""Unit tests for result_cache (two-tier SQLite cache)"""
+
+import asyncio
+import sqlite3
+
+from result_cache import ResultCache
+
+
+def disk_rows(path, namespace):
+    with sqlite3.connect(path) as conn:
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?", (namespace,)
+        ).fetchone()[0]
+        tracked = conn.execute(
+            "SELECT bytes FROM cache_sizes WHERE namespace = ?", (namespace,)
+        ).fetchone()
+        accessed = dict(conn.execute(
+            "SELECT key, accessed_at FROM cache_entries WHERE namespace = ?", (namespace,)
+        ).fetchall())
+    return total, tracked[0] if tracked else 0, accessed
+
+
+def test_byte_total_follows_writes_overwrites_and_deletes(tmp_path):
+    path = str(tmp_path / "results.db")
+
+    async def scenario():
+        cache = ResultCache(path, "llm", max_bytes=10_000)
+        other = ResultCache(path, "recrawl")
+        await cache.set("a", {"text": "x" * 100})
+        await cache.set("b", {"text": "y" * 200})
+        await cache.set("a", {"text": "short"})
+        await other.set("a", {"text": "z" * 50})
+        await cache.invalidate("b")
+        cache.close()
+        other.close()
+
+    asyncio.run(scenario())
+    total, tracked, _ = disk_rows(path, "llm")
+    assert tracked == total == len('{"text": "short"}')
+    total, tracked, _ = disk_rows(path, "recrawl")
+    assert tracked == total
+
+
+def test_memory_hits_refresh_disk_access_time(tmp_path):
+    path = str(tmp_path / "results.db")
+
+    async def scenario():
+        cache = ResultCache(path, "llm")
+        cache.TOUCH_SECONDS = 0
+        await cache.set("a", {"n": 1})
+        _, _, before = disk_rows(path, "llm")
+        await asyncio.sleep(0.01)
+        assert await cache.get("a") == {"n": 1}
+        assert cache.stats()["memory_hits"] == 1
+        cache.close()
+        return before
+
+    before = asyncio.run(scenario())
+    _, _, after = disk_rows(path, "llm")
+    assert after["a"] > before["a"]
+
+
+def test_eviction_keeps_entries_served_from_memory(tmp_path):
+    path = str(tmp_path / "results.db")
+    payload = {"text": "x" * 90}
+    entry_bytes = len('{"text": "' + "x" * 90 + '"}')
+
+    async def scenario():
+        cache = ResultCache(path, "llm", max_bytes=entry_bytes * 2)
+        cache.TOUCH_SECONDS = 0
+        await cache.set("old", payload)
+        await asyncio.sleep(0.01)
+        await cache.set("newer", payload)
+        await asyncio.sleep(0.01)
+        await cache.get("old")
+        await asyncio.sleep(0.01)
+        await cache.set("newest", payload)
+        cache.close()
+
+    asyncio.run(scenario())
+    total, tracked, accessed = disk_rows(path, "llm")
+    assert sorted(accessed) == ["newest", "old"]
+    assert tracked == total == entry_bytes * 2
+
+
+def test_existing_database_is_counted_on_upgrade(tmp_path):
+    path = str(tmp_path / "results.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE cache_entries (
+                namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,
+                size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        conn.execute("INSERT INTO cache_entries VALUES ('llm', 'a', '[1]', 3, 1e12, 1e12)")
+
+    async def scenario():
+        cache = ResultCache(path, "llm")
+        await cache.set("b", [2])
+        cache.close()
+
+    asyncio.run(scenario())
+    total, tracked, _ = disk_rows(path, "llm")
+    assert tracked == total == 6
+
+
+def test_shared_overwrite_replaces_stale_memory_copy_in_other_workers(tmp_path):
+    path = str(tmp_path / "results.db")
+
+    async def scenario():
+        first = ResultCache(path, "recrawl", shared=True)
+        second = ResultCache(path, "recrawl", shared=True)
+        first.SYNC_SECONDS = second.SYNC_SECONDS = 0
+        await first.set("page", {"version": 1})
+        assert await second.get("page") == {"version": 1}
+        assert await second.get("page") == {"version": 1}
+        await first.set("page", {"version": 2})
+        seen = await second.get("page")
+        # The writer keeps its own fresh copy in memory
+        assert await first.get("page") == {"version": 2}
+        stats = first.stats(), second.stats()
+        first.close()
+        second.close()
+        return seen, stats
+
+    seen, (first_stats, second_stats) = asyncio.run(scenario())
+    assert seen == {"version": 2}
+    assert first_stats["memory_hits"] == 1
+    assert second_stats["disk_hits"] == 2
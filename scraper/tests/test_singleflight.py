@@ -0,0 +1,76 @@
+"""Unit tests for singleflight (request coalescing)"""
+
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_callers_share_one_run():
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def scenario():
+        flight = SingleFlight()
+        return await asyncio.gather(flight.do("k", work), flight.do("k", work))
+
+    assert asyncio.run(scenario()) == [("result", False), ("result", True)]
+    assert len(runs) == 1
+
+
+def test_work_continues_while_another_caller_waits():
+    async def scenario():
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def work():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "result"
+
+        leader = asyncio.create_task(flight.do("k", work))
+        await started.wait()
+        follower = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower, flight.stats()
+
+    (result, shared), stats = asyncio.run(scenario())
+    assert (result, shared) == ("result", True)
+    assert stats["abandoned"] == 0
+
+
+def test_work_is_cancelled_when_the_last_caller_leaves():
+    cancelled = []
+
+    async def scenario():
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        callers = [asyncio.create_task(flight.do("k", work)) for _ in range(2)]
+        await started.wait()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return flight.stats()
+
+    stats = asyncio.run(scenario())
+    assert cancelled == [True]
+    assert stats["abandoned"] == 1
+    assert stats["in_flight"] == 0
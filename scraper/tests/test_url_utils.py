@@ -0,0 +1,40 @@
+"""Unit tests for url_utils (registrable domains and link discovery)"""
+
+import pytest
+
+from url_utils import internal_links, registrable_domain
+
+
+@pytest.mark.parametrize("url, domain", [
+    ("https://jobs.ycombinator.com/companies", "ycombinator.com"),
+    ("https://www.bbc.co.uk/news", "bbc.co.uk"),
+    ("https://alice.github.io/", "alice.github.io"),
+    ("https://docs.alice.github.io/guide", "alice.github.io"),
+    ("https://github.io/", "github.io"),
+    ("https://my-portfolio.vercel.app", "my-portfolio.vercel.app"),
+    ("https://preview.site.pages.dev", "site.pages.dev"),
+    ("https://192.168.1.10/cv", "192.168.1.10"),
+    ("raw:<html></html>", None),
+])
+def test_registrable_domain(url, domain):
+    assert registrable_domain(url) == domain
+
+
+def test_github_pages_users_are_different_sites():
+    assert registrable_domain("https://alice.github.io") != registrable_domain("https://bob.github.io")
+
+
+def test_internal_links_stay_on_the_same_github_pages_site():
+    hrefs = [
+        "/projects",
+        "https://alice.github.io/blog/",
+        "https://docs.alice.github.io/",
+        "https://bob.github.io/",
+        "https://github.io/",
+        "https://github.com/alice",
+    ]
+    assert internal_links(hrefs, "https://alice.github.io/") == [
+        "https://alice.github.io/projects",
+        "https://alice.github.io/blog",
+        "https://docs.alice.github.io/",
+    ]
@@ -0,0 +1,45 @@
+"""
+Timings - per-request phase breakdown
+A pipeline records how long it waited (job queue, domain slot, crawl and
+LLM semaphores), crawled, ran the heuristic extractor, compacted the
+prompt markdown, called the LLM and parsed its output. Totals go into metadata as `<phase>_ms` fields and into
+a Server-Timing header.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+# Order of the Server-Timing entries (parse time is part of llm time)
+PHASES = ("queue", "crawl", "heuristic", "compact", "llm", "parse", "total")
+
+
+class PhaseTimer:
+    """Accumulates seconds per named phase"""
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def as_metadata(self) -> Dict[str, float]:
+        return {f"{name}_ms": round(seconds * 1000, 1) for name, seconds in self.seconds.items()}
+
+
+def server_timing(metadata: Dict[str, Any]) -> str:
+    """Server-Timing header value from the `<phase>_ms` metadata fields"""
+    entries = []
+    for name in PHASES:
+        value = metadata.get(f"{name}_ms")
+        if isinstance(value, (int, float)):
+            entries.append(f"{name};dur={value}")
+    return ", ".join(entries)
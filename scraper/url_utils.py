@@ -0,0 +1,109 @@
+"""
+URL helpers shared by coalescing, caching and link discovery
+"""
+
+from typing import Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Second-level labels under which registrations happen one level deeper
+# (example.co.uk, example.com.ar); a small stand-in for the public suffix list
+MULTI_LABEL_SUFFIXES = {"ac", "co", "com", "edu", "gob", "gov", "net", "org", "ne", "or"}
+
+# Hosting platforms where every subdomain belongs to a different owner
+# (the "private" part of the public suffix list): alice.github.io and
+# bob.github.io are different sites
+HOSTING_SUFFIXES = {
+    "github.io", "gitlab.io", "pages.dev", "workers.dev", "vercel.app",
+    "netlify.app", "netlify.com", "herokuapp.com", "onrender.com", "fly.dev",
+    "railway.app", "web.app", "firebaseapp.com", "azurewebsites.net",
+    "azurestaticapps.net", "cloudfront.net", "appspot.com", "surge.sh",
+    "glitch.me", "replit.app", "repl.co", "readthedocs.io", "notion.site",
+    "webflow.io", "wixsite.com", "wordpress.com", "blogspot.com",
+    "carrd.co", "framer.website", "super.site", "bitbucket.io",
+}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for identity checks.
+
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    parameters and trailing slashes, and sorts the query string.
+    Non-HTTP inputs (raw:, file://) are returned unchanged.
+    """
+    url = url.strip()
+    if not url.lower().startswith(("http://", "https://")):
+        if "://" in url or url.startswith("raw:"):
+            # file://, raw: HTML and other non-web inputs are left as-is
+            return url
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    ]
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+def registrable_domain(url: str) -> Optional[str]:
+    """
+    Approximate registrable domain (eTLD+1) of a URL
+
+    jobs.ycombinator.com -> ycombinator.com, www.bbc.co.uk -> bbc.co.uk,
+    docs.alice.github.io -> alice.github.io.
+    Returns None for non-HTTP inputs (raw:, file://).
+    """
+    normalized = normalize_url(url)
+    if not normalized.startswith(("http://", "https://")):
+        return None
+    host = (urlsplit(normalized).hostname or "").rstrip(".")
+    labels = host.split(".")
+    if not host or host.replace(".", "").isdigit() or len(labels) <= 2:
+        return host or None
+    for start in range(1, len(labels) - 1):
+        if ".".join(labels[start:]) in HOSTING_SUFFIXES:
+            return ".".join(labels[start - 1:])
+    if labels[-2] in MULTI_LABEL_SUFFIXES and len(labels[-1]) == 2:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def internal_links(hrefs: Iterable[str], page_url: str) -> List[str]:
+    """
+    Normalized, deduplicated links on the same registrable domain as the page
+
+    Relative hrefs are resolved against `page_url`; anchors, mailto:,
+    javascript: and the page itself are dropped. Document order is kept.
+    """
+    page = normalize_url(page_url)
+    domain = registrable_domain(page_url)
+    seen = {page}
+    links = []
+    for href in hrefs:
+        href = (href or "").strip()
+        if not href or href.startswith("#"):
+            continue
+        absolute = urljoin(page_url, href)
+        if not absolute.lower().startswith(("http://", "https://")):
+            continue
+        link = normalize_url(absolute)
+        if link in seen or registrable_domain(link) != domain:
+            continue
+        seen.add(link)
+        links.append(link)
+    return links
@@ -77,9 +77,9 @@ export class CronJobService {
       return;
     }
 
-    // Paso 2: Extraer datos de cada oferta (en lotes)
+    // Paso 2: Extraer datos de cada oferta (endpoint batch; la concurrencia la fija el scraper)
     console.log('\n🔍 Extrayendo datos de ofertas...');
-    const results = await scraperService.extractMultipleJobs(allJobUrls, true, 3);
+    const results = await scraperService.extractMultipleJobs(allJobUrls, true);
 
     // Paso 3: Procesar resultados
     const successful = results.filter(r => r.success);
@@ -101,12 +101,12 @@ router.post('/extract-cv', async (req, res) => {
  * Body: {
  *   urls: string[],
  *   use_llm?: boolean (default: true),
- *   concurrent?: number (default: 3)
+ *   concurrent?: number (crawls concurrentes; default: BATCH_CRAWL_CONCURRENCY del scraper)
  * }
  */
 router.post('/extract-multiple', async (req, res) => {
   try {
-    const { urls, use_llm = true, concurrent = 3 } = req.body;
+    const { urls, use_llm = true, concurrent } = req.body;
     
     if (!urls || !Array.isArray(urls) || urls.length === 0) {
       return res.status(400).json({ error: 'URLs array is required' });
@@ -1,6 +1,8 @@
 import axios from 'axios';
 
 const SCRAPER_URL = process.env.SCRAPER_URL || 'http://localhost:8000';
+// Máximo de URLs por petición batch (BATCH_MAX_URLS del scraper)
+const SCRAPER_BATCH_MAX_URLS = parseInt(process.env.SCRAPER_BATCH_MAX_URLS || '100', 10);
 
 export interface ScraperHealthResponse {
   status: string;
@@ -74,6 +76,48 @@ export interface CVExtractionResponse {
   };
   error?: string;
   warnings: string[];
+  // true: la página no cambió desde el último crawl (resultado anterior, sin LLM)
+  unchanged?: boolean;
+}
+
+export interface CVBatchExtractionResponse {
+  results: CVExtractionResponse[];
+  metadata: {
+    total: number;
+    succeeded: number;
+    failed: number;
+    with_structured_data: number;
+    crawl_concurrency: number;
+    llm_concurrency: number;
+    elapsed_ms: number;
+  };
+}
+
+export interface ExtractJobBatchResponse {
+  results: ExtractJobResponse[];
+  metadata: CVBatchExtractionResponse['metadata'];
+}
+
+export interface CVExtractionJob {
+  job_id: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  status_url: string;
+  created_at: number;
+  started_at?: number;
+  finished_at?: number;
+  result?: CVExtractionResponse;
+  error?: string;
+}
+
+/**
+ * Divide las URLs en lotes que el endpoint batch acepta (BATCH_MAX_URLS)
+ */
+function chunkUrls(urls: string[]): string[][] {
+  const chunks: string[][] = [];
+  for (let i = 0; i < urls.length; i += SCRAPER_BATCH_MAX_URLS) {
+    chunks.push(urls.slice(i, i + SCRAPER_BATCH_MAX_URLS));
+  }
+  return chunks;
 }
 
 /**
@@ -136,32 +180,41 @@ export class ScraperService {
   }
 
   /**
-   * Extrae datos de múltiples ofertas de empleo
+   * Extrae datos de múltiples ofertas de empleo con el endpoint batch del
+   * scraper, en lotes de hasta SCRAPER_BATCH_MAX_URLS URLs.
+   * La concurrencia (crawl y LLM) la gestiona el propio scraper.
    * @param urls - Array de URLs de ofertas
    * @param use_llm - Si usar LLM para extracción
-   * @param concurrent - Número de scrapes concurrentes (default: 3)
+   * @param concurrent - Crawls concurrentes (default: BATCH_CRAWL_CONCURRENCY del scraper)
    */
   async extractMultipleJobs(
     urls: string[],
     use_llm: boolean = true,
-    concurrent: number = 3
+    concurrent?: number
   ): Promise<ExtractJobResponse[]> {
     const results: ExtractJobResponse[] = [];
-    
-    // Procesar en lotes para no sobrecargar el scraper
-    for (let i = 0; i < urls.length; i += concurrent) {
-      const batch = urls.slice(i, i + concurrent);
-      const batchResults = await Promise.all(
-        batch.map(url => this.extractJobData(url, use_llm))
-      );
-      results.push(...batchResults);
-      
-      // Pequeña pausa entre lotes
-      if (i + concurrent < urls.length) {
-        await new Promise(resolve => setTimeout(resolve, 1000));
+
+    for (const chunk of chunkUrls(urls)) {
+      try {
+        console.log(`📦 Extracting ${chunk.length} job postings in batch`);
+
+        const response = await axios.post<ExtractJobBatchResponse>(
+          `${this.baseUrl}/extract-job/batch`,
+          { urls: chunk, use_llm, crawl_concurrency: concurrent },
+          { timeout: 60000 + chunk.length * 10000 } // El lote completo puede tardar más
+        );
+
+        const { metadata } = response.data;
+        console.log(`✅ Batch done: ${metadata.succeeded}/${metadata.total} OK in ${metadata.elapsed_ms}ms`);
+        results.push(...response.data.results);
+      } catch (error: any) {
+        console.error(`Failed to extract job batch:`, error.message);
+
+        const message = error.response?.data?.detail || error.message;
+        results.push(...chunk.map(url => ({ url, success: false, error: message })));
       }
     }
-    
+
     return results;
   }
 
@@ -215,6 +268,117 @@ export class ScraperService {
     }
   }
 
+  /**
+   * Extrae un perfil mediante la cola de jobs del scraper.
+   * El envío responde al instante y el resultado se obtiene con long-polling,
+   * así ninguna petición HTTP queda abierta durante todo el crawl + LLM.
+   * @param url - URL del perfil profesional
+   * @param use_llm - Si usar LLM para extracción estructurada (default: true)
+   * @param bypass_cache - Forzar scraping fresco (default: false)
+   * @param maxWaitMs - Tiempo máximo total de espera (default: 5 min)
+   */
+  async extractCVProfileAsJob(
+    url: string,
+    use_llm: boolean = true,
+    bypass_cache: boolean = false,
+    maxWaitMs: number = 300000
+  ): Promise<CVExtractionResponse> {
+    const failed = (error: string): CVExtractionResponse => ({
+      success: false,
+      url,
+      markdown: '',
+      metadata: {
+        markdown_length: 0,
+        has_structured_data: false,
+        llm_attempted: use_llm,
+        warnings_count: 0
+      },
+      error,
+      warnings: []
+    });
+
+    try {
+      const submitted = await axios.post<CVExtractionJob>(
+        `${this.baseUrl}/jobs`,
+        { url, use_llm, bypass_cache },
+        { timeout: 10000 }
+      );
+      let job = submitted.data;
+      const deadline = Date.now() + maxWaitMs;
+
+      // Long-polling: el scraper responde en cuanto termina el job (o a los 25s)
+      while (job.status === 'queued' || job.status === 'running') {
+        if (Date.now() > deadline) {
+          return failed(`Job ${job.job_id} still ${job.status} after ${maxWaitMs}ms`);
+        }
+        const polled = await axios.get<CVExtractionJob>(
+          `${this.baseUrl}${job.status_url}`,
+          { params: { wait: 25 }, timeout: 35000 }
+        );
+        job = polled.data;
+      }
+
+      if (job.status === 'failed' || !job.result) {
+        return failed(job.error || 'Job failed');
+      }
+      return job.result;
+    } catch (error: any) {
+      console.error(`Failed to extract CV (job) from ${url}:`, error.message);
+      return failed(error.response?.data?.detail || error.message);
+    }
+  }
+
+  /**
+   * Extrae varios perfiles con el endpoint batch del scraper, en lotes de
+   * hasta SCRAPER_BATCH_MAX_URLS URLs.
+   * La concurrencia (crawl y LLM) la gestiona el propio scraper.
+   * @param urls - URLs de perfiles profesionales
+   * @param use_llm - Si usar LLM para extracción estructurada (default: true)
+   * @param bypass_cache - Forzar scraping fresco (default: false)
+   */
+  async extractCVProfilesBatch(
+    urls: string[],
+    use_llm: boolean = true,
+    bypass_cache: boolean = false
+  ): Promise<CVExtractionResponse[]> {
+    const results: CVExtractionResponse[] = [];
+
+    for (const chunk of chunkUrls(urls)) {
+      try {
+        console.log(`📦 Extracting ${chunk.length} CV profiles in batch`);
+
+        const response = await axios.post<CVBatchExtractionResponse>(
+          `${this.baseUrl}/extract-cv/batch`,
+          { urls: chunk, use_llm, bypass_cache },
+          { timeout: 60000 + chunk.length * 10000 } // El lote completo puede tardar más
+        );
+
+        const { metadata } = response.data;
+        console.log(`✅ Batch done: ${metadata.succeeded}/${metadata.total} OK in ${metadata.elapsed_ms}ms`);
+        results.push(...response.data.results);
+      } catch (error: any) {
+        console.error(`Failed to extract CV batch:`, error.message);
+
+        const message = error.response?.data?.detail || error.message;
+        results.push(...chunk.map(url => ({
+          success: false,
+          url,
+          markdown: '',
+          metadata: {
+            markdown_length: 0,
+            has_structured_data: false,
+            llm_attempted: use_llm,
+            warnings_count: 0
+          },
+          error: message,
+          warnings: []
+        })));
+      }
+    }
+
+    return results;
+  }
+
   /**
    * Extrae ofertas de una página de listado usando el motor de Crawl4AI
    * Mucho más robusto que Regex puro.